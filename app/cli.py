@@ -1,6 +1,14 @@
 """Gestion des arguments de ligne de commande."""
 
 import argparse
+import os
+
+from config.settings import (ANKI_BATCH_SIZE, LLM_BATCH_SIZE,
+                             PIPELINE_ANKI_WORKERS, PIPELINE_LLM_WORKERS,
+                             PIPELINE_QUEUE_SIZE, PIPELINE_TTS_WORKERS,
+                             PREFETCH_WINDOW, TTS_BATCH_SIZE, TTS_PROCESSES,
+                             TTS_THREADS_PER_WORKER)
+from core.word_source import INPUT_FORMATS
 
 
 def parse_arguments():
@@ -15,16 +23,88 @@ def parse_arguments():
             python -m app.main "hola" "espagnol"                 # Crée une carte pour le mot espagnol "hola"
             python -m app.main "こんにちは" "japonais"              # Crée une carte pour le mot japonais "こんにちは"
             python -m app.main "hello; goodbye" -y               # Accepte automatiquement la réponse du LLM
+            python -m app.main "a; b; c" --prefetch 3            # Prépare les 3 réponses suivantes pendant la relecture
             python -m app.main "hello" --lite                    # Utilise le modèle LLM léger (gemma3:4b)
+            python -m app.main --daemon                          # Démarre le démon résident (modèles gardés en mémoire)
+            python -m app.main "hello" --refresh                 # Régénère la réponse même si elle est en cache
+            python -m app.main "a; b; c" -y --tts-workers 2      # Mode lot : LLM, TTS et Anki en parallèle
+            python -m app.main --input vocab.csv espagnol -y     # Importe les mots d'un fichier (txt, csv, tsv)
+            cat mots.txt | python -m app.main --input - -y       # Lit les mots sur l'entrée standard
+            python -m app.main --resume -y                       # Termine les mots d'une exécution interrompue
+            python -m app.main "a; b" -y --metrics run.json      # Enregistre la durée de chaque étape
+            python -m app.main --input vocab.txt -y --ollama http://gpu1:11434 --ollama http://gpu2:11434
         """)
 
     parser.add_argument(
         "words", nargs="?", help="Le(s) mot(s) étranger(s) pour lesquel(s) créer une carte Anki (séparés par des points-virgules)")
     parser.add_argument("language", nargs="?", default="Anglais",
                         help="La langue du mot fourni et nom du deck Anki (défaut: Anglais)")
+    parser.add_argument("-i", "--input", metavar="FICHIER",
+                        help="Lit les mots depuis un fichier texte, CSV ou TSV (colonnes mot, langue, tags) ou '-' pour l'entrée standard")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, default="auto",
+                        help="Format du fichier d'entrée (défaut: d'après l'extension)")
     parser.add_argument("-y", "--yes", action="store_true",
                         help="Accepte automatiquement la réponse du LLM sans demander confirmation")
+    parser.add_argument("--prefetch", type=int, default=PREFETCH_WINDOW, metavar="N",
+                        help=f"Mode interactif : génère les réponses des N mots suivants pendant la relecture du mot courant, 0 pour désactiver (défaut: {PREFETCH_WINDOW})")
+    parser.add_argument("--ollama", dest="ollama_endpoints", action="append", metavar="URL",
+                        help="Serveur Ollama à utiliser, répétable pour répartir les requêtes entre plusieurs serveurs (défaut: serveur local, ou ANKI_CREATE_OLLAMA_ENDPOINTS)")
     parser.add_argument("--lite", action="store_true",
                         help="Utilise le modèle LLM léger gemma3:4b au lieu de gemma3:12b (recommandé pour les systèmes avec moins de VRAM)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reprend chaque mot à sa première étape non terminée lors d'une exécution interrompue (sans mots : reprend tous les mots inachevés)")
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--no-cache", action="store_true",
+                       help="Désactive les caches locaux (réponses du LLM et clips audio)")
+    cache.add_argument("--refresh", action="store_true",
+                       help="Ignore les réponses en cache et les remplace par de nouvelles générations")
+
+    daemon = parser.add_mutually_exclusive_group()
+    daemon.add_argument("--daemon", action="store_true",
+                        help="Démarre le démon résident qui garde modèles et clients chargés entre les appels")
+    daemon.add_argument("--no-daemon", action="store_true",
+                        help="Traite les mots dans ce processus même si un démon est en cours d'exécution")
+    parser.add_argument("--metrics", metavar="FICHIER",
+                        help="Écrit la durée de chaque étape (p50/p95/max) en fin d'exécution : JSON, ou texte Prometheus si le fichier finit par .prom")
+    parser.add_argument("--profile-imports", action="store_true",
+                        help="Mesure le coût d'import de chaque module (démarrage à froid) et affiche les plus lents")
+    parser.add_argument("--tts-processes", type=int, default=TTS_PROCESSES,
+                        help=f"Nombre de processus de synthèse vocale, 0 pour synthétiser dans le processus principal (défaut: {TTS_PROCESSES})")
+    parser.add_argument("--tts-threads", type=int, default=TTS_THREADS_PER_WORKER,
+                        help=f"Threads torch par processus de synthèse vocale (défaut: {TTS_THREADS_PER_WORKER})")
+
+    # Mode lot (-y avec plusieurs mots) : étapes LLM, TTS et Anki en parallèle
+    pipeline = parser.add_argument_group(
+        "mode lot", "Options du pipeline utilisé avec -y et plusieurs mots")
+    pipeline.add_argument("--llm-workers", type=int, default=PIPELINE_LLM_WORKERS,
+                          help=f"Nombre de requêtes LLM simultanées (défaut: {PIPELINE_LLM_WORKERS})")
+    pipeline.add_argument("--tts-workers", type=int, default=PIPELINE_TTS_WORKERS,
+                          help=f"Nombre de workers de synthèse vocale (défaut: {PIPELINE_TTS_WORKERS})")
+    pipeline.add_argument("--anki-workers", type=int, default=PIPELINE_ANKI_WORKERS,
+                          help=f"Nombre de workers d'envoi vers Anki (défaut: {PIPELINE_ANKI_WORKERS})")
+    pipeline.add_argument("--queue-size", type=int, default=PIPELINE_QUEUE_SIZE,
+                          help=f"Taille maximale des files entre les étapes (défaut: {PIPELINE_QUEUE_SIZE})")
+    pipeline.add_argument("--llm-batch-size", type=int, default=LLM_BATCH_SIZE,
+                          help=f"Nombre de mots envoyés dans une même requête LLM (défaut: {LLM_BATCH_SIZE})")
+    pipeline.add_argument("--tts-batch-size", type=int, default=TTS_BATCH_SIZE,
+                          help=f"Nombre maximal de cartes synthétisées ensemble par un worker TTS (défaut: {TTS_BATCH_SIZE})")
+    pipeline.add_argument("--anki-batch-size", type=int, default=ANKI_BATCH_SIZE,
+                          help=f"Nombre maximal de cartes envoyées dans une même requête AnkiConnect (défaut: {ANKI_BATCH_SIZE})")
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.input and args.input != "-" and not os.path.isfile(args.input):
+        parser.error(f"fichier introuvable: {args.input}")
+    if args.input == "-" and not args.yes:
+        # Les réponses de validation seraient lues dans le flux de mots
+        parser.error("--input - nécessite -y (l'entrée standard sert à lire les mots)")
+    if args.input and args.words:
+        # Avec --input, le seul argument positionnel est la langue
+        if args.language != parser.get_default("language"):
+            parser.error("--input remplace la liste de mots en argument")
+        args.language, args.words = args.words, None
+    if args.daemon and args.words:
+        # Avec --daemon, le seul argument positionnel est la langue à précharger
+        if args.language != parser.get_default("language"):
+            parser.error("--daemon n'accepte pas de mots, seulement la langue à précharger")
+        args.language, args.words = args.words, None
+    return args
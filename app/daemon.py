@@ -0,0 +1,149 @@
+"""Démon résident gardant les modèles TTS et les clients chargés entre les appels.
+
+Le protocole est du JSON délimité par des retours à la ligne sur une socket
+TCP locale : le client envoie une requête, le démon renvoie des événements
+de progression et, en mode interactif, attend le choix de l'utilisateur.
+"""
+
+import socketserver
+import threading
+
+from config.languages import LANGUAGE_CODES
+from config.settings import (DAEMON_HOST, DAEMON_PORT, OLLAMA_MODEL,
+                             OLLAMA_MODEL_LITE)
+from core.session import CardSession
+from core.word_processor import WordProcessor
+
+from .daemon_client import receive_message, send_message
+
+
+class CardDaemon:
+    """Holds warmed sessions and processes the words submitted by clients."""
+
+    def __init__(self, host: str = DAEMON_HOST, port: int = DAEMON_PORT,
+                 tts_processes: int = 0):
+        self.host = host
+        self.port = port
+        self.tts_processes = tts_processes
+        self._sessions = {}
+        # Une requête à la fois : les modèles et la console Anki sont partagés
+        self._lock = threading.Lock()
+
+    def start(self, preload_language: str = None, progress=None) -> dict:
+        """Start the default session and warm the TTS model of a language.
+
+        Retourne le temps de disponibilité d'Anki et d'Ollama.
+        """
+        session = self._get_session(OLLAMA_MODEL, progress)
+        if preload_language:
+            session.audio_generator.preload_async(
+                LANGUAGE_CODES.get(preload_language.lower(), "en"))
+        return session.startup_times
+
+    def serve_forever(self):
+        """Serve requests until interrupted, then tear the sessions down."""
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                request = receive_message(self.rfile)
+                if request is None:
+                    return
+                with daemon._lock:
+                    daemon.process(request, lambda message: send_message(self.wfile, message),
+                                   lambda: receive_message(self.rfile))
+
+        socketserver.TCPServer.allow_reuse_address = True
+        with socketserver.ThreadingTCPServer((self.host, self.port), Handler) as server:
+            server.daemon_threads = True
+            print(f"✅ Daemon listening on {self.host}:{self.port}")
+            try:
+                server.serve_forever()
+            finally:
+                self.close()
+
+    def close(self):
+        """Tear every session down."""
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+    def process(self, request: dict, send, receive):
+        """Create the cards of one request, streaming events back."""
+        model = OLLAMA_MODEL_LITE if request.get("lite") else OLLAMA_MODEL
+        source_language = request.get("language", "Anglais").capitalize()
+        auto_accept = request.get("yes", False)
+        # Le cache est partagé par toutes les requêtes : --no-cache ne le lit
+        # ni ne l'écrit, --refresh régénère puis remplace l'entrée acceptée
+        use_cache = not request.get("no_cache", False)
+        refresh = request.get("refresh", False) or not use_cache
+
+        try:
+            session = self._get_session(model)
+            # Le deck a pu changer depuis la requête précédente
+            session.card_creator.reset_duplicate_index()
+            session.audio_generator.preload_async(
+                LANGUAGE_CODES.get(source_language.lower(), "en"))
+            words, duplicates = session.card_creator.split_new_words(
+                request.get("words", []), source_language)
+        except Exception as e:
+            send({"event": "session_error", "message": str(e)})
+            return
+        send({"event": "duplicates", "words": duplicates})
+
+        total = len(words)
+        for index, word in enumerate(words, 1):
+            send({"event": "word", "word": word, "index": index, "total": total})
+            try:
+                if not self._process_word(session, word, source_language, auto_accept,
+                                          refresh, use_cache, send, receive):
+                    continue
+                send({"event": "success", "word": word,
+                      "index": index, "total": total})
+            except Exception as e:
+                send({"event": "error", "word": word, "message": str(e)})
+                answer = receive()
+                if not answer or not answer.get("continue"):
+                    break
+
+        send({"event": "done", "total": total, "duplicates": len(duplicates)})
+
+    def _process_word(self, session, word, source_language, auto_accept, refresh, use_cache,
+                      send, receive) -> bool:
+        """Run the steps of one word; return False if the user skipped it."""
+        while True:
+            send({"event": "progress", "step": f"Querying LLM for '{word}'"})
+            # Seule une réponse acceptée est mise en cache (voir app.main)
+            response = session.llm_client.generate_word_info(
+                word, source_language, refresh=refresh, remember=False)
+            if auto_accept:
+                break
+            send({"event": "review", "word": word, "response": response})
+            answer = receive() or {}
+            choice = answer.get("choice")
+            if choice == 'y':
+                break
+            if choice == 'r':
+                refresh = True
+                continue
+            send({"event": "skipped", "word": word})
+            return False
+
+        if use_cache:
+            session.llm_client.remember_word_info(word, source_language, response)
+
+        send({"event": "progress", "step": "Processing response"})
+        word_info = WordProcessor.parse_llm_response(response)
+        send({"event": "progress", "step": "Generating audio"})
+        word_audio, example_audio = session.card_creator.synthesize_card_audio(
+            word, word_info, source_language)
+        send({"event": "progress", "step": "Adding card to Anki"})
+        session.card_creator.submit_card(
+            word, word_info, source_language, word_audio, example_audio)
+        return True
+
+    def _get_session(self, model: str, progress=None) -> CardSession:
+        if model not in self._sessions:
+            self._sessions[model] = CardSession(
+                model=model, tts_processes=self.tts_processes).start(progress)
+        return self._sessions[model]
@@ -0,0 +1,96 @@
+"""Client léger soumettant des mots au démon résident."""
+
+import json
+import socket
+
+from config.settings import DAEMON_CONNECT_TIMEOUT, DAEMON_HOST, DAEMON_PORT
+
+
+def send_message(stream, message: dict):
+    """Write one JSON message on a socket stream."""
+    stream.write((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+    stream.flush()
+
+
+def receive_message(stream) -> dict:
+    """Read one JSON message from a socket stream (None when closed)."""
+    line = stream.readline()
+    if not line:
+        return None
+    return json.loads(line.decode("utf-8"))
+
+
+class DaemonClient:
+    """Submits words to a running daemon and renders its events with ConsoleUI."""
+
+    def __init__(self, host: str = DAEMON_HOST, port: int = DAEMON_PORT,
+                 connect_timeout: float = DAEMON_CONNECT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+
+    def run(self, request: dict, ui) -> bool:
+        """Process a request through the daemon.
+
+        Retourne False si aucun démon n'écoute : l'appelant traite alors les
+        mots lui-même.
+        """
+        try:
+            connection = socket.create_connection(
+                (self.host, self.port), timeout=self.connect_timeout)
+        except OSError:
+            return False
+
+        with connection:
+            # La génération peut être longue : plus de délai une fois connecté
+            connection.settimeout(None)
+            stream = connection.makefile("rwb")
+            send_message(stream, request)
+            self._render_events(stream, ui)
+        return True
+
+    @staticmethod
+    def _render_events(stream, ui):
+        # Importé seulement une fois le démon joint (démarrage à froid)
+        from tqdm import tqdm
+
+        progress = None
+        while True:
+            event = receive_message(stream)
+            if event is None:
+                raise ConnectionError("Daemon closed the connection")
+            kind = event["event"]
+
+            if kind == "word":
+                ui.show_word_progress(event["word"], event["index"], event["total"])
+                progress = tqdm(total=4, desc=f"Creating card {event['index']}/{event['total']}",
+                                unit="step")
+            elif kind == "progress":
+                if progress is not None:
+                    progress.set_description(event["step"])
+                    progress.update(1)
+            elif kind == "review":
+                choice = ui.validate_llm_response(event["response"], event["word"])
+                if choice == 'r':
+                    print("Restarting query...")
+                    progress.n = 0
+                send_message(stream, {"choice": choice})
+            elif kind in ("success", "skipped", "error"):
+                if progress is not None:
+                    progress.close()
+                    progress = None
+                if kind == "success":
+                    ui.show_word_success(event["word"], event["index"], event["total"])
+                elif kind == "skipped":
+                    ui.show_word_skipped(event["word"])
+                else:
+                    ui.show_word_error(event["word"], event["message"])
+                    send_message(stream, {"continue": ui.ask_continue_on_error()})
+            elif kind == "duplicates":
+                ui.show_duplicates_skipped(event["words"])
+            elif kind == "session_error":
+                ui.show_session_error(event["message"])
+                return
+            elif kind == "done":
+                ui.show_processing_complete(event["total"], event["duplicates"])
+                return
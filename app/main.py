@@ -1,17 +1,23 @@
 """Point d'entrée principal de l'application."""
 
+import atexit
 import sys
+import time
 
-from tqdm import tqdm
-
-from config.languages import LANGUAGES
-from config.settings import OLLAMA_MODEL, OLLAMA_MODEL_LITE
-from core.card_creator import CardCreator
+from config.languages import LANGUAGE_CODES, LANGUAGES
+from config.settings import OLLAMA_ENDPOINTS, OLLAMA_MODEL, OLLAMA_MODEL_LITE
+from core.pipeline import CardPipeline
 from core.word_processor import WordProcessor
-from services.llm.ollama_client import OllamaClient
+from core.word_source import EntryCounter, WordSource
 from ui.console import ConsoleUI
+from utils import metrics
 
 from .cli import parse_arguments
+from .daemon_client import DaemonClient
+
+# Les modules lourds (tqdm, requests, sqlite3, torch via TTS) ne sont
+# importés qu'une fois des mots à traiter : --help et la liste des langues
+# restent instantanés. Voir --profile-imports et benchmarks/startup.py.
 
 
 def main():
@@ -19,95 +25,386 @@ def main():
     args = parse_arguments()
     ui = ConsoleUI()
 
-    # Validate input
-    if not args.words:
-        ui.show_available_languages(LANGUAGES)
-        sys.exit(1)
+    if args.profile_imports:
+        from utils.import_profiler import profile_imports
+        ui.show_import_profile(profile_imports())
+        return
+
+    # Resident daemon mode: keep the models and clients warm between calls
+    if args.daemon:
+        _run_daemon(args, ui)
+        return
 
-    # Parse multiple words separated by semicolons
-    words_list = [word.strip() for word in args.words.split(';')]
     source_language = args.language.capitalize()
 
+    if args.input:
+        # Streamed input: the file is never loaded as a whole
+        entries = WordSource.read(args.input, source_language, args.input_format)
+        total_words = None
+    elif args.resume and not args.words:
+        # Resume every word left unfinished by the previous runs
+        from core.job_journal import JobJournal
+        journal = JobJournal()
+        entries = journal.pending_entries()
+        journal.close()
+        total_words = len(entries)
+        if not entries:
+            ui.show_nothing_to_resume()
+            return
+    else:
+        # Validate input
+        if not args.words:
+            ui.show_available_languages(LANGUAGES)
+            sys.exit(1)
+
+        # Parse multiple words separated by semicolons, skipping empty strings
+        entries = WordSource.from_argument(args.words, source_language)
+        total_words = len(entries)
+
+        # Submit the words to a running daemon, otherwise process them here
+        # (the daemon keeps no job journal nor metrics and uses its own Ollama servers:
+        # --resume, --metrics and --ollama run locally)
+        if not args.no_daemon and not args.resume and not args.metrics \
+                and not args.ollama_endpoints and DaemonClient().run({
+            "words": [entry.word for entry in entries],
+            "language": source_language,
+            "yes": args.yes,
+            "lite": args.lite,
+            "refresh": args.refresh,
+            "no_cache": args.no_cache,
+        }, ui):
+            return
+
+    from core.session import CardSession
+    from services.http_transport import get_transport
+
+    if args.metrics:
+        # Written on every exit path, including errors and cancellation
+        metrics.enable()
+        atexit.register(_write_metrics, args.metrics, ui)
+
     # Select model based on --lite flag
     model = OLLAMA_MODEL_LITE if args.lite else OLLAMA_MODEL
 
     # Process each word
-    total_words = len(words_list)
-    ui.show_processing_start(total_words)
+    ui.show_processing_start(total_words, args.input)
 
-    for word_index, word in enumerate(words_list, 1):
-        if not word:  # Skip empty strings
-            continue
+    # Initialize the clients and servers once for the whole run
+    language_code = LANGUAGE_CODES.get(source_language.lower(), "en")
+    session = CardSession(model=model, use_cache=not args.no_cache,
+                          refresh_cache=args.refresh,
+                          tts_processes=args.tts_processes,
+                          tts_threads=args.tts_threads,
+                          tts_languages=[language_code],
+                          ollama_endpoints=args.ollama_endpoints or OLLAMA_ENDPOINTS)
+    duplicates = []
+    progress = _progress_bar(total=3, desc="Starting session", unit="step")
+    try:
+        # Warm the TTS model up while the servers start and the LLM generates
+        session.preload_tts(language_code)
+        session.start(progress)
 
-        ui.show_word_progress(word, word_index, total_words)
+        # Pre-flight: only spend LLM and TTS time on words not yet in the deck
+        # (a streamed input is filtered while it is read instead)
+        progress.set_description("Checking existing cards")
+        if total_words is not None:
+            entries = list(session.card_creator.filter_new_entries(
+                entries, lambda entry: duplicates.append(entry.word)))
+            total_words = len(entries)
+        progress.update(1)
+    except KeyboardInterrupt:
+        progress.close()
+        ui.show_cancellation()
+        sys.exit(0)
+    except Exception as e:
+        progress.close()
+        ui.show_session_error(str(e))
+        sys.exit(1)
+    progress.close()
+    ui.show_startup_times(session.startup_times)
+    ui.show_duplicates_skipped(duplicates)
 
-        # Create progress bar for current word (8 steps now: ollama + initialization + anki + 5 existing)
-        progress = tqdm(
-            total=8, desc=f"Creating card {word_index}/{total_words}", unit="step")
+    # Streamed input: total counted in the background, shown once known
+    counter = None
+    if total_words is None:
+        counter = EntryCounter(args.input, args.input_format)
+        counter.start()
 
-        try:
-            # Step 1: Initialize Ollama client (includes server check/start)
-            progress.set_description("Initializing Ollama client")
-            llm_client = OllamaClient(model=model, progress=progress)
-            progress.update(1)
+    try:
+        # Batch mode: overlap the LLM, TTS and Anki stages
+        if args.yes and (total_words is None or total_words > 1):
+            processed, skipped = _run_pipeline(
+                session, ui, args, entries, source_language, total_words, counter)
+        else:
+            processed, skipped = _run_interactive(
+                session, ui, args, entries, total_words, counter)
+    finally:
+        audio_cache_stats = session.audio_cache.stats() if session.audio_cache else None
+        llm_latency = session.llm_client.latency_stats()
+        ollama_stats = session.llm_client.pool.stats()
+        session.close()
 
-            # Step 2: Initialization
-            progress.set_description("Initializing components")
-            # Pass progress to handle Anki startup
-            card_creator = CardCreator(progress)
-            progress.update(1)
+    ui.show_processing_complete(processed, len(duplicates) + skipped)
+    if llm_latency["requests"]:
+        ui.show_llm_latency(llm_latency)
+    if len(ollama_stats) > 1:
+        ui.show_ollama_stats(ollama_stats)
+    if processed > 1:
+        ui.show_connection_stats(get_transport().stats())
+        if audio_cache_stats:
+            ui.show_audio_cache_stats(audio_cache_stats)
 
-            # Loop until user is satisfied or cancels
-            while True:
-                progress.set_description(f"Querying LLM for '{word}'")
-                response = llm_client.generate_word_info(word, source_language)
-                progress.update(1)
-
-                # Get user validation or auto-accept if -y flag is set
-                if args.yes:
-                    break
-                else:
-                    user_choice = ui.validate_llm_response(response, word)
-
-                    if user_choice == 'y':
-                        break
-                    elif user_choice == 'n':
-                        ui.show_word_skipped(word)
-                        progress.close()
-                        break
-                    elif user_choice == 'r':
-                        print("Restarting query...")
-                        progress.n -= 1
-                        continue
-
-            # Skip to next word if user cancelled this one
-            if not args.yes and user_choice == 'n':
-                continue
 
-            # Process response
-            progress.set_description("Processing response")
-            word_info = WordProcessor.parse_llm_response(response)
+def _run_interactive(session, ui, args, entries, total_words, counter):
+    """Process the words one after the other; return (processed, duplicates)."""
+    skipped = 0
+    read = 0
+
+    def on_duplicate(entry):
+        nonlocal skipped
+        skipped += 1
+
+    def numbered(entries):
+        nonlocal read
+        for entry in entries:
+            read += 1
+            yield entry
+
+    # Pair each new word with its position in the input (duplicates included)
+    words = ((read, entry) for entry in session.card_creator.filter_new_entries(
+        numbered(entries), on_duplicate))
+
+    prefetcher = None
+    if not args.yes and args.prefetch > 0:
+        # Generate the next responses while the user reviews the current one
+        from core.prefetcher import ResponsePrefetcher
+        prefetcher = ResponsePrefetcher(session.llm_client, args.prefetch)
+        words = prefetcher.look_ahead(
+            words, lambda item: _prefetch_key(session, args, item[1]))
+
+    processed = 0
+    try:
+        for word_index, entry in words:
+            processed += 1
+            total = total_words if counter is None else counter.total
+            ui.show_word_progress(entry.word, word_index, total)
+            _process_word(session, ui, args, entry, word_index, total, prefetcher)
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+    if prefetcher is not None and processed > 1:
+        ui.show_prefetch_stats(prefetcher.stats())
+    return processed, skipped
+
+
+def _prefetch_key(session, args, entry):
+    """Return the (word, deck) to prefetch, or None if its response is journaled."""
+    if args.resume:
+        record = session.journal.get(entry.language, entry.word)
+        if record and record["word_info"] is not None:
+            return None
+    return entry.word, entry.language
+
+
+def _process_word(session, ui, args, entry, word_index, total_words, prefetcher=None):
+    """Run the per-word steps with the clients owned by the session."""
+    word = entry.word
+    source_language = entry.language
+    journal = session.journal
+    # Resume: restart the word at its first stage missing from the journal
+    record = journal.get(source_language, word) if args.resume else None
+    # Create progress bar for current word (7 steps: llm + parsing + deck + 2 audio + media + note)
+    progress = _progress_bar(
+        total=7, desc=f"Creating card {word_index}/{total_words or '?'}", unit="step")
+
+    try:
+        if record and record["word_info"] is not None:
+            # The response was already accepted before the interruption
+            word_info = record["word_info"]
+            progress.update(2)
+        else:
+            answer = _query_word_info(session, ui, args, word, source_language, progress,
+                                      prefetcher)
+            if answer is None:
+                ui.show_word_skipped(word)
+                progress.close()
+                return
+            response, word_info = answer
+            journal.record_responses(
+                [(word, source_language, entry.tags, response, word_info)])
+
+        audio = None
+        if record and record["word_audio"] is not None:
+            audio = (record["word_audio"], record["example_audio"])
+
+        # Create card with detailed progress
+        result = session.card_creator.create_card_with_progress(
+            word, word_info, source_language, progress, entry.tags, audio=audio,
+            on_audio=lambda word_audio, example_audio: journal.record_audio(
+                [(word, source_language, word_audio, example_audio)]))
+        journal.record_notes([(word, source_language, result["result"])])
+
+        progress.close()
+        ui.show_word_success(word, word_index, total_words)
+
+    except KeyboardInterrupt:
+        progress.close()
+        ui.show_cancellation()
+        sys.exit(0)
+    except Exception as e:
+        progress.close()
+        ui.show_word_error(word, str(e))
+        if not ui.ask_continue_on_error():
+            sys.exit(1)
+
+
+def _query_word_info(session, ui, args, word, source_language, progress, prefetcher=None):
+    """Query the LLM until the user accepts a response.
+
+    A response prefetched while the previous word was reviewed is shown at
+    once; regenerations pause the prefetching so they are served first.
+    Returns (response, word_info), or None if the user skipped the word.
+    """
+    # Loop until user is satisfied or cancels
+    refresh = False
+    while True:
+        progress.set_description(f"Querying LLM for '{word}'")
+
+        # Auto-accept if -y flag is set
+        if args.yes:
+            response = session.llm_client.generate_word_info(
+                word, source_language, refresh=refresh)
             progress.update(1)
+            break
+
+        # Stream the response so it is displayed while being generated;
+        # 'r' bypasses the cache, accepting overwrites the cached entry
+        query_start = time.perf_counter()
+        stream = None
+        if prefetcher is not None and not refresh:
+            stream = prefetcher.take(word, source_language)
+        chunks = stream
+        if stream is None:
+            stream = chunks = session.llm_client.stream_word_info(
+                word, source_language, refresh=refresh)
+            if prefetcher is not None:
+                chunks = prefetcher.in_foreground(stream)
+        user_choice = ui.validate_streamed_llm_response(chunks, word)
+        ui.show_response_timing(stream.time_to_first_token,
+                                time.perf_counter() - query_start)
+        response = stream.text
+        progress.update(1)
 
-            # Create card with detailed progress
-            card_creator.create_card_with_progress(
-                word, word_info, source_language, progress)
-
-            progress.close()
-            ui.show_word_success(word, word_index, total_words)
-
-        except KeyboardInterrupt:
-            progress.close()
-            ui.show_cancellation()
-            sys.exit(0)
-        except Exception as e:
-            progress.close()
-            ui.show_word_error(word, str(e))
-            if not ui.ask_continue_on_error():
-                sys.exit(1)
+        if user_choice == 'y':
+            # Only accepted responses are cached
+            session.llm_client.remember_word_info(word, source_language, response)
+            break
+        elif user_choice == 'n':
+            return None
+        elif user_choice == 'r':
+            print("Restarting query...")
+            progress.n -= 1
+            refresh = True
             continue
 
-    ui.show_processing_complete(total_words)
+    # Process response
+    progress.set_description("Processing response")
+    word_info = WordProcessor.parse_llm_response(response)
+    progress.update(1)
+    return response, word_info
+
+
+def _run_pipeline(session, ui, args, entries, source_language, total_words, counter):
+    """Run the concurrent batch pipeline and report results in word order.
+
+    Returns (processed, duplicates).
+    """
+    # One LLM worker per available Ollama server at least
+    llm_workers = max(args.llm_workers, len(session.llm_client.pool.available()))
+    pipeline = CardPipeline(session, source_language,
+                            llm_workers=llm_workers,
+                            tts_workers=args.tts_workers,
+                            anki_workers=args.anki_workers,
+                            queue_size=args.queue_size,
+                            llm_batch_size=args.llm_batch_size,
+                            tts_batch_size=args.tts_batch_size,
+                            anki_batch_size=args.anki_batch_size,
+                            resume=args.resume)
+
+    progress = _progress_bar(total=total_words, desc="Pipeline", unit="card")
+    if counter is not None:
+        # The bar switches from a plain count to a percentage once counted
+        counter.on_total = lambda total: _set_progress_total(progress, total)
+        if counter.total is not None:
+            _set_progress_total(progress, counter.total)
+
+    skipped = 0
+
+    def on_duplicate(entry):
+        nonlocal skipped
+        skipped += 1
+        progress.update(1)
+
+    processed = 0
+    try:
+        for job in pipeline.run(session.card_creator.filter_new_entries(entries, on_duplicate)):
+            progress.update(1)
+            processed += 1
+            if job.error is not None:
+                ui.show_word_error(job.word, str(job.error))
+                if not ui.ask_continue_on_error():
+                    sys.exit(1)
+                continue
+            # A streamed input has no fixed total: the bar shows the counted one
+            ui.show_word_success(job.word, job.index + 1, total_words)
+    except KeyboardInterrupt:
+        ui.show_cancellation()
+        sys.exit(0)
+    finally:
+        pipeline.stop()
+        progress.close()
+    return processed, skipped
+
+
+def _set_progress_total(progress, total: int):
+    progress.total = total
+    progress.refresh()
+
+
+def _run_daemon(args, ui):
+    """Start the resident daemon and serve requests until interrupted."""
+    from .daemon import CardDaemon
+
+    daemon = CardDaemon(tts_processes=args.tts_processes)
+    progress = _progress_bar(total=2, desc="Starting daemon", unit="step")
+    try:
+        startup_times = daemon.start(preload_language=args.language, progress=progress)
+        progress.close()
+        ui.show_startup_times(startup_times)
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        ui.show_cancellation()
+    except Exception as e:
+        ui.show_session_error(str(e))
+        sys.exit(1)
+    finally:
+        progress.close()
+        daemon.close()
+
+
+def _write_metrics(path: str, ui):
+    """Write the stage timings collected during the run."""
+    try:
+        metrics.write_metrics(path, metrics.get_summary())
+        ui.show_metrics_written(path)
+    except OSError as e:
+        ui.show_session_error(f"Impossible d'écrire les métriques: {e}")
+
+
+def _progress_bar(**kwargs):
+    """Create a tqdm progress bar (imported on first use)."""
+    from tqdm import tqdm
+    return tqdm(**kwargs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+"""Benchmark de bout en bout hors ligne : app.main sur 1, 100 et 5000 mots.
+
+Ollama et AnkiConnect sont remplacés par des serveurs locaux factices
+(latence et taux d'échec réglables) et la synthèse vocale par un
+générateur simulé au coût proportionnel au nombre de caractères. Chaque
+taille est exécutée dans un processus séparé (pic de mémoire isolé) avec
+``--metrics`` pour obtenir la latence de chaque étape.
+
+Usage :
+    python -m benchmarks.end_to_end --sizes 1 100 5000 --output benchmarks/results/latest.json
+    python -m benchmarks.end_to_end --compare benchmarks/results/baseline.json -- --llm-batch-size 8
+
+Les options après ``--`` sont transmises à anki-create, sauf
+``--tts-processes`` : la synthèse simulée reste dans le processus mesuré.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results", "latest.json")
+# Étapes affichées dans le rapport (toutes sont enregistrées dans les résultats)
+REPORTED_STAGES = ("llm.word", "llm.batch", "card.audio", "card.audio_batch",
+                   "card.submit", "anki.multi")
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Mesure le débit de bout en bout avec des serveurs Ollama/Anki factices.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 5000],
+                        help="Nombres de mots à traiter (un processus par taille)")
+    parser.add_argument("--ollama-servers", type=int, default=1,
+                        help="Nombre de serveurs Ollama factices entre lesquels répartir les requêtes")
+    parser.add_argument("--llm-latency", type=float, default=0.01,
+                        help="Latence simulée d'une requête Ollama, en secondes")
+    parser.add_argument("--anki-latency", type=float, default=0.002,
+                        help="Latence simulée d'une requête AnkiConnect, en secondes")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="Proportion de requêtes Ollama et d'ajouts de notes en échec")
+    parser.add_argument("--tts-cost", type=float, default=0.0005,
+                        help="Coût simulé de la synthèse, en secondes par caractère")
+    parser.add_argument("--tts-load", type=float, default=0.5,
+                        help="Coût simulé du chargement d'un modèle TTS, en secondes")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help="Fichier JSON où enregistrer les résultats")
+    parser.add_argument("--compare", metavar="FICHIER",
+                        help="Résultats précédents auxquels comparer cette exécution")
+    parser.add_argument("--child", nargs=3, metavar=("MOTS", "METRIQUES", "RESULTAT"),
+                        help=argparse.SUPPRESS)
+    parser.add_argument("app_arguments", nargs=argparse.REMAINDER,
+                        help="Options transmises à anki-create (après --)")
+    args = parser.parse_args()
+    if args.app_arguments[:1] == ["--"]:
+        args.app_arguments = args.app_arguments[1:]
+    return args
+
+
+def run_child(args):
+    """Run app.main.main on a word file in this process and record its cost."""
+    import resource
+
+    from benchmarks.fakes import StubTTSGenerator
+    from ui.console import ConsoleUI
+    import core.card_creator
+    import core.session
+
+    words_file, metrics_file, result_file = args.child
+    StubTTSGenerator.seconds_per_char = args.tts_cost
+    StubTTSGenerator.load_seconds = args.tts_load
+    core.session.TTSGenerator = StubTTSGenerator
+    core.card_creator.TTSGenerator = StubTTSGenerator
+    # Une carte en échec ne doit pas bloquer sur une question
+    ConsoleUI.ask_continue_on_error = staticmethod(lambda: True)
+
+    from app.main import main
+    # Le pool de processus TTS chargerait Coqui dans ses workers, hors du
+    # générateur simulé : la synthèse reste dans ce processus
+    sys.argv = ["anki-create.py", "--input", words_file, "-y", "--no-daemon",
+                "--metrics", metrics_file, *args.app_arguments, "--tts-processes", "0"]
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            main()
+        finally:
+            sys.stdout = stdout
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss : kilo-octets sous Linux, octets sous macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    with open(result_file, "w", encoding="utf-8") as f:
+        json.dump({"seconds": elapsed, "peak_rss_mb": peak_mb}, f)
+
+
+def run_size(size: int, args, ollama_servers, anki, workdir: str) -> dict:
+    """Process ``size`` words in a child process and collect its results."""
+    words_file = os.path.join(workdir, f"words_{size}.txt")
+    metrics_file = os.path.join(workdir, f"metrics_{size}.json")
+    result_file = os.path.join(workdir, f"result_{size}.json")
+    with open(words_file, "w", encoding="utf-8") as f:
+        for index in range(size):
+            f.write(f"word{size}x{index:05d}\n")
+
+    env = dict(os.environ,
+               ANKI_CREATE_HOME=os.path.join(workdir, f"home_{size}"),
+               ANKI_CREATE_OLLAMA_URL=f"{ollama_servers[0].url}/api/generate",
+               ANKI_CREATE_ANKI_URL=anki.url)
+    if len(ollama_servers) > 1:
+        env["ANKI_CREATE_OLLAMA_ENDPOINTS"] = ",".join(server.url for server in ollama_servers)
+    notes_before = len(anki.notes)
+    command = [sys.executable, "-m", "benchmarks.end_to_end",
+               "--child", words_file, metrics_file, result_file,
+               "--tts-cost", str(args.tts_cost), "--tts-load", str(args.tts_load)]
+    if args.app_arguments:
+        command += ["--", *args.app_arguments]
+    subprocess.run(command, cwd=ROOT, env=env, check=True,
+                   stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+
+    with open(result_file, encoding="utf-8") as f:
+        result = json.load(f)
+    with open(metrics_file, encoding="utf-8") as f:
+        stages = json.load(f)["stages"]
+    return {
+        "words": size,
+        "cards": len(anki.notes) - notes_before,
+        "seconds": result["seconds"],
+        "words_per_minute": size / result["seconds"] * 60 if result["seconds"] else 0.0,
+        "peak_rss_mb": result["peak_rss_mb"],
+        "stages": stages,
+    }
+
+
+def print_run(run: dict, baseline: dict = None):
+    line = (f"{run['words']:>6} mots  {run['words_per_minute']:9.1f} mots/min  "
+            f"{run['seconds']:7.2f}s  RSS max {run['peak_rss_mb']:6.1f} Mo  "
+            f"{run['cards']} cartes")
+    if baseline:
+        speedup = run["words_per_minute"] / baseline["words_per_minute"] - 1
+        memory = run["peak_rss_mb"] - baseline["peak_rss_mb"]
+        line += f"  ({speedup:+.1%} débit, {memory:+.1f} Mo)"
+    print(line)
+    for name in REPORTED_STAGES:
+        if name in run["stages"]:
+            stats = run["stages"][name]
+            print(f"         {name:<18} p50 {stats['p50'] * 1000:8.1f} ms  "
+                  f"p95 {stats['p95'] * 1000:8.1f} ms  max {stats['max'] * 1000:8.1f} ms  "
+                  f"(x{stats['count']})")
+
+
+def main():
+    args = _parse_arguments()
+    if args.child:
+        run_child(args)
+        return
+
+    from benchmarks.fakes import FakeAnki, FakeOllama
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = {run["words"]: run for run in json.load(f)["runs"]}
+
+    ollama_servers = [FakeOllama(latency=args.llm_latency, failure_rate=args.failure_rate,
+                                 seed=index).start()
+                      for index in range(max(1, args.ollama_servers))]
+    anki = FakeAnki(latency=args.anki_latency, failure_rate=args.failure_rate).start()
+    runs = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="anki-create-bench-") as workdir:
+            for size in args.sizes:
+                run = run_size(size, args, ollama_servers, anki, workdir)
+                runs.append(run)
+                print_run(run, baseline.get(size))
+    finally:
+        for server in ollama_servers:
+            server.stop()
+        anki.stop()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "settings": {
+                "ollama_servers": args.ollama_servers,
+                "llm_latency": args.llm_latency,
+                "anki_latency": args.anki_latency,
+                "failure_rate": args.failure_rate,
+                "tts_cost": args.tts_cost,
+                "tts_load": args.tts_load,
+                "app_arguments": args.app_arguments,
+            },
+            "runs": runs,
+        }, f, indent=2)
+    print(f"📊 Résultats enregistrés dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Serveurs Ollama et AnkiConnect factices et synthèse vocale simulée, pour les benchmarks.
+
+Les serveurs écoutent sur un port libre de 127.0.0.1 et simulent une
+latence par requête ainsi que des échecs aléatoires (reproductibles grâce à
+une graine). Aucun modèle, ni Ollama, ni Anki n'est nécessaire.
+"""
+
+import io
+import json
+import random
+import re
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services.audio.tts_generator import TTSGenerator
+
+# Mots entre guillemets français dans les prompts (« mot »)
+_QUOTED_WORD = re.compile(r"«\s*(.+?)\s*»")
+
+
+class FakeServer(ABC):
+    """Base of the fake HTTP services: latency, failure injection and call counts."""
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve on a free local port in a background thread."""
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                service._respond(self, "GET", None)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                service._respond(self, "POST", json.loads(self.rfile.read(length) or b"{}"))
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def count(self, name: str):
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.failure_rate
+
+    @abstractmethod
+    def _respond(self, handler, method: str, body):
+        """Answer one request (``body`` is the decoded JSON of a POST, None for a GET)."""
+
+    @staticmethod
+    def send_json(handler, payload, status: int = 200):
+        data = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+class FakeOllama(FakeServer):
+    """Answers /api/tags and /api/generate (single, batched and streamed prompts)."""
+
+    def __init__(self, models=("gemma3:12b", "gemma3:4b"), **kwargs):
+        super().__init__(**kwargs)
+        self.models = list(models)
+
+    def _respond(self, handler, method, body):
+        if method == "GET" and handler.path.startswith("/api/tags"):
+            self.count("tags")
+            self.send_json(handler, {"models": [{"name": name} for name in self.models]})
+            return
+        if method != "POST" or not handler.path.startswith("/api/generate"):
+            self.send_json(handler, {"error": "not found"}, status=404)
+            return
+
+        prompt = body.get("prompt")
+        if not prompt:
+            # Requête de préchargement du modèle
+            self.count("warm_up")
+            self.send_json(handler, {"response": "", "done": True})
+            return
+
+        self.count("generate")
+        time.sleep(self.latency)
+        if self.should_fail():
+            self.count("failures")
+            self.send_json(handler, {"error": "injected failure"}, status=500)
+            return
+
+        words = _QUOTED_WORD.findall(prompt)
+        if "### 1" in prompt:
+            # Prompt groupé : le premier « ### » du prompt n'est pas un mot
+            words = [word for word in words if word != "###"]
+            text = "\n".join(f"### {index}\n{self._word_block(word)}"
+                             for index, word in enumerate(words, 1))
+        else:
+            text = self._word_block(words[0] if words else "mot")
+
+        if body.get("stream"):
+            self._stream(handler, text)
+        else:
+            self.send_json(handler, {"response": text, "done": True})
+
+    @staticmethod
+    def _word_block(word: str) -> str:
+        return (f"Définition : définition de {word}\n"
+                f"Synonymes : {word}-a, {word}-b\n"
+                f"Exemple : This sentence uses the word {word} in context.")
+
+    @staticmethod
+    def _stream(handler, text: str):
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/x-ndjson")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+        for line in text.splitlines(keepends=True) + [None]:
+            chunk = {"response": line, "done": False} if line else {"response": "", "done": True}
+            data = (json.dumps(chunk) + "\n").encode("utf-8")
+            handler.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        handler.wfile.write(b"0\r\n\r\n")
+
+
+class FakeAnki(FakeServer):
+    """Implements the AnkiConnect actions used by the application."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.notes = {}
+        self.media = set()
+        self.decks = set()
+        self._next_note_id = 1
+
+    def _respond(self, handler, method, body):
+        time.sleep(self.latency)
+        action = body.get("action", "") if body else ""
+        self.count(action)
+        if action == "multi":
+            results = [self._run(inner.get("action"), inner.get("params", {}))
+                       for inner in body["params"]["actions"]]
+            self.send_json(handler, {"result": results, "error": None})
+        else:
+            self.send_json(handler, self._run(action, (body or {}).get("params", {})))
+
+    def _run(self, action: str, params: dict) -> dict:
+        if action == "version":
+            return {"result": 6, "error": None}
+        if action == "createDeck":
+            self.decks.add(params["deck"])
+            return {"result": 1, "error": None}
+        if action == "deckNames":
+            return {"result": sorted(self.decks), "error": None}
+        if action == "storeMediaFile":
+            self.media.add(params["filename"])
+            return {"result": params["filename"], "error": None}
+        if action == "addNote":
+            if self.should_fail():
+                self.count("failures")
+                return {"result": None, "error": "injected failure"}
+            with self._lock:
+                note_id = self._next_note_id
+                self._next_note_id += 1
+                self.notes[note_id] = params["note"]
+            return {"result": note_id, "error": None}
+        if action == "findNotes":
+            deck = params["query"].split('"')[1] if '"' in params["query"] else ""
+            return {"result": [note_id for note_id, note in self.notes.items()
+                               if note["deckName"] == deck], "error": None}
+        if action == "notesInfo":
+            return {"result": [{"noteId": note_id, "fields": {
+                name: {"value": value, "order": order}
+                for order, (name, value) in enumerate(self.notes[note_id]["fields"].items())}}
+                for note_id in params["notes"] if note_id in self.notes], "error": None}
+        return {"result": None, "error": f"unsupported action {action}"}
+
+
+class StubTTSGenerator(TTSGenerator):
+    """TTSGenerator whose model load and synthesis only cost configured time.
+
+    Chaque clip coûte ``seconds_per_char`` par caractère et produit un WAV
+    silencieux de durée proportionnelle ; le chargement d'un modèle coûte
+    ``load_seconds`` par langue.
+    """
+
+    seconds_per_char = 0.0005
+    load_seconds = 0.0
+
+    def _get_tts_instance(self, language_code: str):
+        with self._get_synthesis_lock(language_code):
+            if language_code not in self._tts_instances:
+                time.sleep(self.load_seconds)
+                self._tts_instances[language_code] = True
+            return self._tts_instances[language_code]
+
+    def _synthesize_uncached(self, texts: list, language: str) -> list:
+        self._get_tts_instance(language)
+        clips = []
+        with self._get_synthesis_lock(language):
+            for text in texts:
+                time.sleep(self.seconds_per_char * len(text))
+                clips.append(self._silence(len(text)))
+        return clips
+
+    @staticmethod
+    def _silence(characters: int, sample_rate: int = 16000) -> bytes:
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            # Environ 60 ms de silence par caractère
+            wav_file.writeframes(b"\x00\x00" * (sample_rate * 6 // 100) * max(1, characters))
+        return buffer.getvalue()
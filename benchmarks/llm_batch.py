@@ -0,0 +1,66 @@
+"""Benchmark du débit LLM : une requête par mot contre requêtes groupées.
+
+Usage :
+    python -m benchmarks.llm_batch "hello; world; house; ..." [langue] --batch-sizes 1 4 8
+"""
+
+import argparse
+import time
+
+from config.settings import OLLAMA_MODEL, OLLAMA_MODEL_LITE
+from services.llm.ollama_client import OllamaClient
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Compare le débit (mots/minute) de la génération mot par mot et groupée.")
+    parser.add_argument("words", help="Mots séparés par des points-virgules")
+    parser.add_argument("language", nargs="?", default="Anglais")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8],
+                        help="Tailles de lot à mesurer (1 = chemin actuel, un mot par requête)")
+    parser.add_argument("--lite", action="store_true",
+                        help="Utilise le modèle léger")
+    return parser.parse_args()
+
+
+def run_benchmark(client: OllamaClient, words: list, language: str, batch_size: int) -> dict:
+    """Generate every word once with the given batch size and measure throughput."""
+    start = time.perf_counter()
+    complete = 0
+    for offset in range(0, len(words), batch_size):
+        chunk = words[offset:offset + batch_size]
+        if batch_size == 1:
+            responses = [client.generate_word_info(chunk[0], language)]
+        else:
+            responses = client.generate_words_info(chunk, language)
+        complete += sum(1 for response in responses if response)
+    elapsed = time.perf_counter() - start
+    return {
+        "batch_size": batch_size,
+        "words": len(words),
+        "complete": complete,
+        "seconds": elapsed,
+        "words_per_minute": len(words) / elapsed * 60 if elapsed else 0.0,
+    }
+
+
+def main():
+    args = _parse_arguments()
+    words = [word.strip() for word in args.words.split(";") if word.strip()]
+    model = OLLAMA_MODEL_LITE if args.lite else OLLAMA_MODEL
+    # Pas de cache : on mesure la génération réelle
+    client = OllamaClient(model=model)
+
+    print(f"Modèle {model}, {len(words)} mots")
+    baseline = None
+    for batch_size in args.batch_sizes:
+        result = run_benchmark(client, words, args.language.capitalize(), batch_size)
+        if baseline is None:
+            baseline = result["words_per_minute"]
+        speedup = result["words_per_minute"] / baseline if baseline else 0.0
+        print(f"K={batch_size:<3} {result['words_per_minute']:8.1f} mots/min "
+              f"({result['seconds']:.1f}s, x{speedup:.2f})")
+
+
+if __name__ == "__main__":
+    main()
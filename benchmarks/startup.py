@@ -0,0 +1,80 @@
+"""Benchmark du démarrage à froid de la CLI, avec budget de temps.
+
+Lance plusieurs fois ``anki-create.py --help`` et la liste des langues
+(appel sans mots) dans des interpréteurs neufs, puis échoue (code de sortie
+1) si la médiane dépasse le budget ou si une commande ne sort pas avec son
+code attendu : à utiliser en CI pour éviter qu'un import lourd revienne au
+niveau module.
+
+Usage :
+    python -m benchmarks.startup --runs 5 --budget 0.5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ENTRY_POINT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "anki-create.py")
+
+# Arguments et code de sortie attendu : la liste des langues sort avec 1 (aucun mot fourni)
+COMMANDS = {
+    "--help": (["--help"], 0),
+    "liste des langues": ([], 1),
+}
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Mesure le démarrage à froid de la CLI et vérifie un budget.")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Nombre d'exécutions par commande")
+    parser.add_argument("--budget", type=float, default=0.5,
+                        help="Temps médian maximal par commande, en secondes")
+    return parser.parse_args()
+
+
+def time_command(arguments: list, runs: int, expected_code: int = 0) -> list:
+    """Run the CLI ``runs`` times in fresh interpreters and return the durations.
+
+    Lève RuntimeError si une exécution ne sort pas avec ``expected_code`` ou
+    lève une exception : une CLI qui plante à l'import serait sinon très
+    rapide.
+    """
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, ENTRY_POINT, *arguments],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        durations.append(time.perf_counter() - start)
+        # Une exception non rattrapée sort aussi avec 1 : la trace la distingue
+        if result.returncode != expected_code or "Traceback" in result.stderr:
+            last_line = (result.stderr.strip().splitlines() or [""])[-1]
+            raise RuntimeError(f"exit code {result.returncode} (expected {expected_code})"
+                               f"{': ' + last_line if last_line else ''}")
+    return durations
+
+
+def main():
+    args = _parse_arguments()
+    failed = False
+    for name, (arguments, expected_code) in COMMANDS.items():
+        try:
+            durations = time_command(arguments, args.runs, expected_code)
+        except RuntimeError as e:
+            failed = True
+            print(f"❌ {name:<18} {e}")
+            continue
+        median = statistics.median(durations)
+        status = "✅" if median <= args.budget else "❌"
+        failed |= median > args.budget
+        print(f"{status} {name:<18} médiane {median * 1000:6.0f} ms "
+              f"(min {min(durations) * 1000:.0f} ms, budget {args.budget * 1000:.0f} ms)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark CPU de la synthèse vocale : clip par clip contre synthèse groupée.
+
+Usage :
+    python -m benchmarks.tts_batch [code langue] --clips 40
+"""
+
+import argparse
+import time
+
+from services.audio.tts_generator import TTSGenerator
+
+SAMPLE_TEXTS = [
+    "hello",
+    "She opened the window to let the morning air in.",
+    "goodbye",
+    "We should meet again next week to finish the project.",
+    "house",
+    "The old house at the end of the street has been empty for years.",
+    "quickly",
+    "He quickly realized that he had taken the wrong train.",
+]
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Compare la synthèse clip par clip et la synthèse groupée (sans cache).")
+    parser.add_argument("language", nargs="?", default="en",
+                        help="Code de langue du modèle TTS (défaut: en)")
+    parser.add_argument("--clips", type=int, default=40,
+                        help="Nombre de clips à générer par mode")
+    parser.add_argument("--batch-size", type=int, default=16,
+                        help="Nombre de textes par appel groupé")
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_arguments()
+    texts = [f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} ({i})"
+             for i in range(args.clips)]
+
+    # Sans cache audio : on mesure la synthèse réelle
+    generator = TTSGenerator()
+    start = time.perf_counter()
+    generator.synthesize(SAMPLE_TEXTS[0], args.language)
+    print(f"Chargement du modèle + premier clip : {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    for text in texts:
+        generator.synthesize(text, args.language)
+    per_clip = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for offset in range(0, len(texts), args.batch_size):
+        generator.synthesize_batch(
+            texts[offset:offset + args.batch_size], args.language)
+    batched = time.perf_counter() - start
+
+    print(f"Clip par clip : {per_clip:.2f}s ({args.clips / per_clip:.1f} clips/s)")
+    print(f"Groupé (x{args.batch_size}) : {batched:.2f}s ({args.clips / batched:.1f} clips/s, "
+          f"x{per_clip / batched:.2f})")
+
+
+if __name__ == "__main__":
+    main()
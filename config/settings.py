@@ -1,10 +1,109 @@
 """Configuration principale de l'application."""
 
-# API endpoints
-OLLAMA_API_URL = "http://localhost:11434/api/generate"
-ANKI_CONNECT_URL = "http://localhost:8765"
+import os
+
+# Répertoire des données locales (caches, état)
+DATA_DIR = os.environ.get(
+    "ANKI_CREATE_HOME", os.path.join(os.path.expanduser("~"), ".anki-create"))
+
+# API endpoints (modifiables par variables d'environnement, ex. pour les benchmarks)
+OLLAMA_API_URL = os.environ.get(
+    "ANKI_CREATE_OLLAMA_URL", "http://localhost:11434/api/generate")
+ANKI_CONNECT_URL = os.environ.get(
+    "ANKI_CREATE_ANKI_URL", "http://localhost:8765")
+
+# Serveurs Ollama (URL de base séparées par des virgules, ex. plusieurs machines GPU).
+# Vide : le serveur local d'OLLAMA_API_URL, démarré au besoin
+OLLAMA_ENDPOINTS = [url.strip() for url in os.environ.get(
+    "ANKI_CREATE_OLLAMA_ENDPOINTS", "").split(",") if url.strip()]
+# Un serveur en échec OLLAMA_MAX_FAILURES fois de suite est écarté, puis
+# re-sondé (/api/tags) après OLLAMA_EJECT_SECONDS
+OLLAMA_MAX_FAILURES = 3
+OLLAMA_EJECT_SECONDS = 30
 
 # Models
 OLLAMA_MODEL = "gemma3:12b"
 # Modèle plus léger pour systèmes avec moins de VRAM
 OLLAMA_MODEL_LITE = "gemma3:4b"
+
+# Profils de génération Ollama (options de /api/generate)
+# Durée pendant laquelle Ollama garde le modèle en VRAM après une requête
+OLLAMA_KEEP_ALIVE = "30m"
+# Fenêtre de contexte commune à tous les profils : une valeur différente
+# forcerait Ollama à recharger le modèle
+OLLAMA_NUM_CTX = 4096
+OLLAMA_PROFILES = {
+    # Un mot : trois lignes courtes
+    "word": {"num_predict": 200, "temperature": 0.3, "stop": ["\n\n\n", "###"]},
+    # Plusieurs mots par requête : num_predict par mot, multiplié par la taille du lot
+    "batch": {"num_predict": 200, "temperature": 0.3, "stop": ["\n\n\n\n"]},
+}
+
+# Pipeline de traitement par lots (-y avec plusieurs mots)
+PIPELINE_LLM_WORKERS = 1
+PIPELINE_TTS_WORKERS = 1
+PIPELINE_ANKI_WORKERS = 1
+# Taille maximale de chaque file entre deux étapes
+PIPELINE_QUEUE_SIZE = 4
+
+# Mode interactif : nombre de mots suivants dont la réponse LLM est générée
+# pendant la relecture du mot courant (0 = désactivé)
+PREFETCH_WINDOW = 2
+
+# Cache des réponses LLM (SQLite)
+LLM_CACHE_PATH = os.path.join(DATA_DIR, "llm_cache.sqlite3")
+LLM_CACHE_MAX_ENTRIES = 10000
+LLM_CACHE_TTL = 90 * 24 * 3600  # secondes
+
+# Journal des étapes terminées par mot, pour reprendre une exécution interrompue (--resume)
+JOB_JOURNAL_PATH = os.path.join(DATA_DIR, "jobs.sqlite3")
+JOB_JOURNAL_TTL = 7 * 24 * 3600  # secondes de conservation d'un mot après sa dernière étape
+
+# Nombre maximal de cartes synthétisées ensemble par un worker TTS en mode lot
+TTS_BATCH_SIZE = 8
+
+# Nombre de cartes envoyées dans une même requête AnkiConnect en mode lot
+ANKI_BATCH_SIZE = 8
+
+# Nombre de mots envoyés dans une même requête LLM en mode lot (1 = un mot par requête)
+LLM_BATCH_SIZE = 1
+
+# Transport HTTP partagé (AnkiConnect et Ollama)
+# Délais (connexion, lecture) en secondes par type de requête
+HTTP_TIMEOUTS = {
+    "ollama_generate": (3.05, 300),
+    "ollama_tags": (1, 3),
+    "anki": (3.05, 60),
+    "anki_ping": (1, 2),
+}
+HTTP_DEFAULT_TIMEOUT = (3.05, 60)
+HTTP_POOL_SIZE = 8
+# Nouvelles tentatives après une erreur de connexion, avec attente exponentielle
+HTTP_MAX_RETRIES = 3
+HTTP_RETRY_BACKOFF = 0.5  # secondes, doublé à chaque tentative
+
+# Démarrage d'Anki et d'Ollama : sondage rapide puis attente exponentielle
+STARTUP_TIMEOUT = 60  # secondes par service
+STARTUP_POLL_INITIAL = 0.1  # premier intervalle entre deux sondages
+STARTUP_POLL_MAX = 2.0  # intervalle maximal
+STARTUP_POLL_FACTOR = 1.5
+
+# Chemin de l'exécutable Anki trouvé lors d'une exécution précédente
+ANKI_PATH_STATE_FILE = os.path.join(DATA_DIR, "anki_path.json")
+
+# Cache audio adressé par contenu (clips WAV indexés par modèle TTS et texte)
+AUDIO_CACHE_DIR = os.path.join(DATA_DIR, "audio_cache")
+AUDIO_CACHE_MAX_BYTES = 500 * 1024 * 1024
+# Une fois la limite dépassée, éviction jusqu'à cette fraction de la taille maximale
+AUDIO_CACHE_LOW_WATER = 0.9
+
+# Synthèse vocale multi-processus (0 = synthèse dans le processus principal)
+TTS_PROCESSES = 0
+# Threads torch par worker, pour ne pas surcharger les cœurs
+TTS_THREADS_PER_WORKER = 1
+
+# Mode démon : processus résident qui garde modèles et clients chargés
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 8766
+# Délai de connexion du client avant de repasser en mode autonome (secondes)
+DAEMON_CONNECT_TIMEOUT = 0.5
@@ -1,56 +1,201 @@
 """Logique principale de création de cartes Anki."""
 
+import hashlib
+
 from config.languages import LANGUAGE_CODES
 from services.anki.client import AnkiClient
 from services.audio.tts_generator import TTSGenerator
-from utils.file_utils import FileUtils
+from utils.metrics import span
 
-from .models import WordInfo
+from .models import WordEntry, WordInfo
 from .word_processor import WordProcessor
 
 
 class CardCreator:
     """Main class for creating Anki cards."""
 
-    def __init__(self, progress=None):
+    def __init__(self, progress=None, audio_cache=None, audio_generator=None):
         self.progress = progress
         if progress:
             progress.set_description("Connecting to Anki")
         self.anki_client = AnkiClient(progress)
-        self.audio_generator = TTSGenerator()
+        # Générateur fourni par la session (ex. TTSProcessPool) ou synthèse en processus
+        self.audio_generator = audio_generator or TTSGenerator(audio_cache)
+        # Recto normalisés des notes existantes, par deck
+        self._deck_fronts = {}
         if progress:
             progress.update(1)
 
-    def create_card_with_progress(self, word: str, word_info: WordInfo, deck_name: str, progress) -> dict:
-        """Create complete Anki card with audio and detailed progress updates."""
+    def close(self):
+        """Release the TTS models loaded during the session."""
+        self.audio_generator.unload()
+
+    def create_card_with_progress(self, word: str, word_info: WordInfo, deck_name: str, progress,
+                                  tags=(), audio: tuple = None, on_audio=None) -> dict:
+        """Create complete Anki card with audio and detailed progress updates.
+
+        ``audio`` (word_audio, example_audio) réutilise des clips déjà
+        synthétisés ; ``on_audio(word_audio, example_audio)`` est appelé une
+        fois les clips prêts, avant l'envoi à Anki.
+        """
         self._ensure_deck_exists(deck_name, progress)
         language_code = self._get_language_code(deck_name)
 
-        word_audio = self._generate_audio_with_progress(
-            text=word,
-            filename=f"temp_word_{word}.mp3",
-            language_code=language_code,
-            progress=progress,
-            description="Generating word audio"
-        )
+        if audio is not None:
+            word_audio, example_audio = audio
+            progress.update(2)
+        else:
+            word_audio = self._generate_audio_with_progress(
+                text=word,
+                language_code=language_code,
+                progress=progress,
+                description="Generating word audio"
+            )
+
+            example_text = WordProcessor.clean_example_text(word_info.example)
+            example_audio = self._generate_audio_with_progress(
+                text=example_text,
+                language_code=language_code,
+                progress=progress,
+                description="Generating example audio"
+            )
+            if on_audio:
+                on_audio(word_audio, example_audio)
+
+        # Médias et note envoyés en une seule requête AnkiConnect
+        progress.set_description("Adding card to Anki")
+        result = self.submit_card(
+            word, word_info, deck_name, word_audio, example_audio, tags)
+        progress.update(2)
+        return result
 
-        example_text = WordProcessor.clean_example_text(word_info.example)
-        example_audio = self._generate_audio_with_progress(
-            text=example_text,
-            filename=f"temp_example_{word}.mp3",
-            language_code=language_code,
-            progress=progress,
-            description="Generating example audio"
-        )
+    def split_new_words(self, words: list, deck_name: str) -> tuple:
+        """Separate new words from those already in the deck (or repeated)."""
+        duplicates = []
+        new_words = [entry.word for entry in self.filter_new_entries(
+            (WordEntry(word, deck_name) for word in words),
+            lambda entry: duplicates.append(entry.word))]
+        return new_words, duplicates
+
+    def filter_new_entries(self, entries, on_duplicate=None):
+        """Yield the entries whose word is not yet in its deck (nor repeated).
+
+        Filtre paresseux : les entrées sont lues au fur et à mesure. Le
+        contenu de chaque deck est chargé une seule fois par session ; les
+        mots ajoutés ensuite sont enregistrés dans cet index local.
+        ``on_duplicate(entry)`` est appelé pour chaque doublon écarté.
+        """
+        seen = {}
+        for entry in entries:
+            key = WordProcessor.normalize_front(entry.word)
+            deck_seen = seen.setdefault(entry.language, set())
+            if key in self._get_deck_fronts(entry.language) or key in deck_seen:
+                if on_duplicate:
+                    on_duplicate(entry)
+                continue
+            deck_seen.add(key)
+            yield entry
+
+    def reset_duplicate_index(self):
+        """Forget the loaded deck contents so the next check reloads them."""
+        self._deck_fronts.clear()
+
+    def _get_deck_fronts(self, deck_name: str) -> set:
+        if deck_name not in self._deck_fronts:
+            with span("card.duplicate_index"):
+                self._deck_fronts[deck_name] = {
+                    WordProcessor.normalize_front(front)
+                    for front in self.anki_client.get_note_fronts(deck_name)}
+        return self._deck_fronts[deck_name]
+
+    def synthesize_card_audio(self, word: str, word_info: WordInfo, deck_name: str) -> tuple:
+        """Generate the word and example audio clips of a card (TTS stage)."""
+        language_code = self._get_language_code(deck_name)
+        with span("card.audio"):
+            word_audio = self.audio_generator.synthesize(word, language_code)
+            example_audio = self.audio_generator.synthesize(
+                WordProcessor.clean_example_text(word_info.example), language_code)
+        return word_audio, example_audio
+
+    def synthesize_cards_audio(self, cards: list) -> list:
+        """Generate the audio clips of several cards with one batch per language.
+
+        ``cards`` contient des tuples (word, word_info, deck_name). Retourne,
+        pour chaque carte, le tuple (word_audio, example_audio) ou
+        l'exception décrivant son échec.
+        """
+        by_language = {}
+        for position, (word, word_info, deck_name) in enumerate(cards):
+            by_language.setdefault(
+                self._get_language_code(deck_name), []).append(position)
+
+        results = [None] * len(cards)
+        for language_code, positions in by_language.items():
+            texts = []
+            for position in positions:
+                word, word_info, _ = cards[position]
+                texts += [word, WordProcessor.clean_example_text(word_info.example)]
+            try:
+                with span("card.audio_batch"):
+                    clips = self.audio_generator.synthesize_batch(
+                        texts, language_code)
+            except Exception:
+                # Repli carte par carte pour isoler l'erreur
+                for position in positions:
+                    try:
+                        results[position] = self.synthesize_card_audio(
+                            *cards[position])
+                    except Exception as e:
+                        results[position] = e
+                continue
+            for offset, position in enumerate(positions):
+                results[position] = (clips[2 * offset], clips[2 * offset + 1])
+        return results
+
+    def submit_card(self, word: str, word_info: WordInfo, deck_name: str, word_audio: bytes, example_audio: bytes, tags=()) -> dict:
+        """Upload the audio clips and add the note (Anki stage)."""
+        result = self.submit_cards(
+            [(word, word_info, deck_name, word_audio, example_audio, tags)])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
 
-        try:
-            self._add_media_files_with_progress(
-                word, word_audio, example_audio, progress)
-            result = self._create_anki_note_with_progress(
-                word, word_info, deck_name, language_code, progress)
-            return result
-        finally:
-            FileUtils.cleanup_temp_files([word_audio, example_audio])
+    def submit_cards(self, cards: list) -> list:
+        """Upload and add several cards with a single AnkiConnect request.
+
+        ``cards`` contient des tuples (word, word_info, deck_name,
+        word_audio, example_audio, tags), les clips étant des bytes WAV. Retourne, pour chaque carte, la réponse
+        d'AnkiConnect ou l'exception décrivant son échec.
+        """
+        anki_cards = []
+        for word, word_info, deck_name, word_audio, example_audio, tags in cards:
+            # Noms adressés par contenu : un clip identique n'est stocké qu'une fois
+            word_media = self._media_name("word", word_audio)
+            example_media = self._media_name("example", example_audio)
+            front_content, back_content = self._build_note_fields(
+                word, word_info, self._get_language_code(deck_name),
+                word_media, example_media)
+            # Les clips sont envoyés directement depuis la mémoire
+            anki_cards.append({
+                "deck_name": deck_name,
+                "front_content": front_content,
+                "back_content": back_content,
+                "media_files": {
+                    word_media: word_audio,
+                    example_media: example_audio,
+                },
+                "tags": list(tags),
+            })
+        with span("card.submit"):
+            results = self.anki_client.submit_cards(anki_cards)
+
+        for card, result in zip(cards, results):
+            if not result["error"] and card[2] in self._deck_fronts:
+                self._deck_fronts[card[2]].add(
+                    WordProcessor.normalize_front(card[0]))
+
+        return [RuntimeError(result["error"]) if result["error"] else result
+                for result in results]
 
     def _ensure_deck_exists(self, deck_name: str, progress):
         progress.set_description("Creating deck")
@@ -60,32 +205,26 @@ class CardCreator:
     def _get_language_code(self, deck_name: str) -> str:
         return LANGUAGE_CODES.get(deck_name.lower(), "en")
 
-    def _generate_audio_with_progress(self, text: str, filename: str, language_code: str, progress, description: str) -> str:
+    def _generate_audio_with_progress(self, text: str, language_code: str, progress, description: str) -> bytes:
         progress.set_description(description)
-        self.audio_generator.generate_audio(text, filename, language_code)
-        progress.update(1)
-        return filename
-
-    def _add_media_files_with_progress(self, word: str, word_audio: str, example_audio: str, progress):
-        progress.set_description("Adding media to Anki")
-        self.anki_client.add_media_file(f"word_{word}.mp3", word_audio)
-        self.anki_client.add_media_file(f"example_{word}.mp3", example_audio)
+        with span("card.audio"):
+            audio = self.audio_generator.synthesize(text, language_code)
         progress.update(1)
+        return audio
 
-    def _create_anki_note_with_progress(self, word: str, word_info: WordInfo, deck_name: str, language_code: str, progress) -> dict:
-        progress.set_description("Creating Anki card")
+    @staticmethod
+    def _media_name(prefix: str, audio: bytes) -> str:
+        return f"{prefix}_{hashlib.sha256(audio).hexdigest()[:24]}.wav"
 
+    def _build_note_fields(self, word: str, word_info: WordInfo, language_code: str, word_media: str, example_media: str) -> tuple:
         if language_code == "en":
-            front_content = f"{word} [sound:word_{word}.mp3]"
+            front_content = f"{word} [sound:{word_media}]"
         else:
             front_content = word
 
         back_content = (
             f"{word_info.definition}<br>"
             f"{word_info.synonyms}<br>"
-            f"{word_info.example} [sound:example_{word}.mp3]"
+            f"{word_info.example} [sound:{example_media}]"
         )
-        result = self.anki_client.add_note(
-            deck_name, front_content, back_content)
-        progress.update(1)
-        return result
+        return front_content, back_content
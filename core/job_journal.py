@@ -0,0 +1,148 @@
+"""Journal persistant des étapes terminées pour chaque mot (reprise avec --resume)."""
+
+import dataclasses
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from config.settings import JOB_JOURNAL_PATH, JOB_JOURNAL_TTL
+
+from .models import WordEntry, WordInfo
+from .word_processor import WordProcessor
+
+
+class JobJournal:
+    """SQLite journal of the completed stages of each word.
+
+    Chaque étape (réponse LLM et WordInfo, clips audio, id de la note) est
+    enregistrée dans sa propre transaction : un arrêt brutal à n'importe quel
+    moment laisse le journal dans l'état de la dernière étape validée. Les
+    clips ne sont conservés que jusqu'à l'ajout de la note, et tout mot
+    (terminé, en échec ou abandonné) est purgé JOB_JOURNAL_TTL après sa
+    dernière étape.
+
+    Le journal est tenu à chaque exécution, pas seulement avec --resume :
+    les deux clips WAV de chaque mot (quelques centaines de Ko) transitent
+    donc par SQLite avant d'être effacés à l'ajout de la note.
+    """
+
+    def __init__(self, path: str = JOB_JOURNAL_PATH, ttl: float = JOB_JOURNAL_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Partagé entre les threads du pipeline, protégé par self._lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            # WAL : une transaction interrompue n'est jamais visible à la relecture
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    deck TEXT NOT NULL,
+                    word_key TEXT NOT NULL,
+                    word TEXT NOT NULL,
+                    tags TEXT NOT NULL DEFAULT '[]',
+                    response TEXT,
+                    word_info TEXT,
+                    word_audio BLOB,
+                    example_audio BLOB,
+                    note_id INTEGER,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (deck, word_key)
+                )""")
+            if self.ttl:
+                # Les mots inachevés expirent aussi : sinon un mot en échec
+                # reviendrait à chaque --resume sans liste de mots
+                self._conn.execute(
+                    "DELETE FROM jobs WHERE updated_at < ?", (time.time() - self.ttl,))
+
+    def get(self, deck_name: str, word: str) -> Optional[dict]:
+        """Return the completed stages of a word, or None if it is unknown.
+
+        Le dictionnaire contient ``response``, ``word_info`` (WordInfo),
+        ``word_audio``, ``example_audio`` et ``note_id`` ; une étape non
+        terminée vaut None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, word_info, word_audio, example_audio, note_id "
+                "FROM jobs WHERE deck = ? AND word_key = ?",
+                (deck_name, WordProcessor.normalize_front(word))).fetchone()
+        if row is None:
+            return None
+        response, word_info, word_audio, example_audio, note_id = row
+        return {
+            "response": response,
+            "word_info": WordInfo(**json.loads(word_info)) if word_info else None,
+            "word_audio": word_audio,
+            "example_audio": example_audio,
+            "note_id": note_id,
+        }
+
+    def pending_entries(self) -> list:
+        """Return the words whose note was not added, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT word, deck, tags FROM jobs WHERE note_id IS NULL "
+                "ORDER BY created_at").fetchall()
+        return [WordEntry(word, deck, tuple(json.loads(tags)))
+                for word, deck, tags in rows]
+
+    def record_responses(self, items: list):
+        """Record the LLM stage of several words.
+
+        ``items`` contient des tuples (word, deck_name, tags, response,
+        word_info). Les étapes suivantes d'un mot régénéré sont effacées.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            for word, deck_name, tags, response, word_info in items:
+                self._conn.execute("""
+                    INSERT INTO jobs (deck, word_key, word, tags, response, word_info,
+                                      created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (deck, word_key) DO UPDATE SET
+                        word = excluded.word, tags = excluded.tags,
+                        response = excluded.response, word_info = excluded.word_info,
+                        word_audio = NULL, example_audio = NULL, note_id = NULL,
+                        updated_at = excluded.updated_at""",
+                    (deck_name, WordProcessor.normalize_front(word), word,
+                     json.dumps(list(tags)), response,
+                     json.dumps(dataclasses.asdict(word_info)), now, now))
+
+    def record_audio(self, items: list):
+        """Record the TTS stage: tuples (word, deck_name, word_audio, example_audio)."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE jobs SET word_audio = ?, example_audio = ?, updated_at = ? "
+                "WHERE deck = ? AND word_key = ?",
+                [(word_audio, example_audio, now, deck_name,
+                  WordProcessor.normalize_front(word))
+                 for word, deck_name, word_audio, example_audio in items])
+
+    def record_notes(self, items: list):
+        """Record the Anki stage: tuples (word, deck_name, note_id).
+
+        Les clips ne servent plus une fois la note ajoutée : ils sont effacés.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE jobs SET note_id = ?, word_audio = NULL, example_audio = NULL, "
+                "updated_at = ? WHERE deck = ? AND word_key = ?",
+                [(note_id, now, deck_name, WordProcessor.normalize_front(word))
+                 for word, deck_name, note_id in items])
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
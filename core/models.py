@@ -1,6 +1,7 @@
 """Classes de données pour l'application."""
 
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -9,3 +10,26 @@ class WordInfo:
     definition: str
     synonyms: str
     example: str
+
+
+@dataclass
+class WordEntry:
+    """One word to import, with its deck (language) and extra note tags."""
+    word: str
+    language: str
+    tags: tuple = ()
+
+
+@dataclass
+class CardJob:
+    """State of one word travelling through the batch pipeline."""
+    index: int
+    word: str
+    deck_name: str
+    tags: tuple = ()
+    response: Optional[str] = None
+    word_info: Optional[WordInfo] = None
+    word_audio: Optional[bytes] = None
+    example_audio: Optional[bytes] = None
+    result: Optional[dict] = None
+    error: Optional[Exception] = None
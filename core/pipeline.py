@@ -0,0 +1,255 @@
+"""Pipeline concurrent pour la création de cartes en mode lot."""
+
+import queue
+import threading
+
+from config.settings import (ANKI_BATCH_SIZE, LLM_BATCH_SIZE,
+                             PIPELINE_ANKI_WORKERS, PIPELINE_LLM_WORKERS,
+                             PIPELINE_QUEUE_SIZE, PIPELINE_TTS_WORKERS,
+                             TTS_BATCH_SIZE)
+
+from .models import CardJob
+from .word_processor import WordProcessor
+
+# Marqueur de fin de flux transmis d'une étape à la suivante
+_END = object()
+
+
+class CardPipeline:
+    """Runs the LLM, TTS and Anki stages concurrently over bounded queues.
+
+    Ollama (GPU), Coqui TTS (CPU) et AnkiConnect (I/O) travaillent en même
+    temps sur des mots différents : le mot N+1 interroge le LLM pendant que
+    le mot N est synthétisé et que le mot N-1 est envoyé à Anki.
+    """
+
+    def __init__(self, session, deck_name: str,
+                 llm_workers: int = PIPELINE_LLM_WORKERS,
+                 tts_workers: int = PIPELINE_TTS_WORKERS,
+                 anki_workers: int = PIPELINE_ANKI_WORKERS,
+                 queue_size: int = PIPELINE_QUEUE_SIZE,
+                 llm_batch_size: int = LLM_BATCH_SIZE,
+                 tts_batch_size: int = TTS_BATCH_SIZE,
+                 anki_batch_size: int = ANKI_BATCH_SIZE,
+                 resume: bool = False):
+        self.session = session
+        self.deck_name = deck_name
+        # Reprise : chaque mot repart de sa première étape absente du journal
+        self.resume = resume
+        self.workers = {
+            "llm": max(1, llm_workers),
+            "tts": max(1, tts_workers),
+            "anki": max(1, anki_workers),
+        }
+        # Nombre maximal de jobs traités ensemble par un worker de chaque étape
+        self.batch_sizes = {
+            "llm": max(1, llm_batch_size),
+            "tts": max(1, tts_batch_size),
+            "anki": max(1, anki_batch_size),
+        }
+        self.queue_size = max(1, queue_size)
+        self._stop = threading.Event()
+        # Erreur de lecture de l'entrée, relevée à la fin de run()
+        self._feed_error = None
+
+    def run(self, entries):
+        """Process the WordEntry items and yield finished CardJobs in input order.
+
+        ``entries`` peut être un itérateur paresseux : il est consommé au
+        rythme des files bornées, la mémoire reste constante.
+        """
+        # Les files d'entrée des étapes groupées doivent pouvoir contenir un lot complet
+        llm_queue = queue.Queue(max(self.queue_size, self.batch_sizes["llm"]))
+        tts_queue = queue.Queue(max(self.queue_size, self.batch_sizes["tts"]))
+        anki_queue = queue.Queue(max(self.queue_size, self.batch_sizes["anki"]))
+        # Bornée elle aussi : les workers attendent pendant que l'appelant traite un résultat
+        done_queue = queue.Queue(max(self.queue_size, self.batch_sizes["anki"]))
+
+        threads = [threading.Thread(
+            target=self._feed, args=(entries, llm_queue), daemon=True)]
+        threads += self._start_stage("llm", self._llm_stage, llm_queue,
+                                     tts_queue, done_queue)
+        threads += self._start_stage("tts", self._tts_stage, tts_queue,
+                                     anki_queue, done_queue)
+        threads += self._start_stage("anki", self._anki_stage, anki_queue,
+                                     done_queue, done_queue)
+        for thread in threads:
+            thread.start()
+
+        # Réordonner les résultats pour conserver l'ordre des mots
+        pending = {}
+        next_index = 0
+        try:
+            while True:
+                job = done_queue.get()
+                if job is _END:
+                    break
+                pending[job.index] = job
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+        finally:
+            self.stop()
+        if self._feed_error is not None:
+            raise self._feed_error
+
+    def stop(self):
+        """Ask every stage to stop after its current job."""
+        self._stop.set()
+
+    def _feed(self, entries, out_queue):
+        try:
+            for index, entry in enumerate(entries):
+                job = CardJob(index=index, word=entry.word,
+                              deck_name=entry.language or self.deck_name,
+                              tags=entry.tags)
+                if self.resume:
+                    self._restore(job)
+                if not self._put(out_queue, job):
+                    return
+        except Exception as e:
+            self._feed_error = e
+        finally:
+            # Toujours terminer le flux, même si la lecture de l'entrée échoue
+            self._put(out_queue, _END)
+
+    def _restore(self, job):
+        """Fill the stages of a job already completed in the journal."""
+        journal = self.session.journal
+        record = journal.get(job.deck_name, job.word) if journal else None
+        if record is None or record["word_info"] is None:
+            return
+        job.response = record["response"]
+        job.word_info = record["word_info"]
+        if record["word_audio"] is not None:
+            job.word_audio = record["word_audio"]
+            job.example_audio = record["example_audio"]
+
+    def _start_stage(self, name, handler, in_queue, out_queue, done_queue):
+        """Create the worker threads of a stage and the thread closing it."""
+        workers = [threading.Thread(
+            target=self._work,
+            args=(handler, self.batch_sizes[name], in_queue, out_queue, done_queue),
+            name=f"pipeline-{name}-{i}", daemon=True)
+            for i in range(self.workers[name])]
+
+        def close_stage():
+            for worker in workers:
+                worker.join()
+            self._put(out_queue, _END)
+
+        return workers + [threading.Thread(target=close_stage, daemon=True)]
+
+    def _work(self, handler, batch_size, in_queue, out_queue, done_queue):
+        finished = False
+        while not finished:
+            job = self._get(in_queue)
+            if job is None:
+                return
+            jobs = [job]
+            # Compléter le lot avec les jobs déjà disponibles, sans attendre
+            while len(jobs) < batch_size and jobs[-1] is not _END:
+                try:
+                    jobs.append(in_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if jobs[-1] is _END:
+                # Laisser le marqueur aux autres workers de l'étape
+                in_queue.put(_END)
+                jobs.pop()
+                finished = True
+            if not jobs:
+                continue
+
+            try:
+                handler(jobs)
+            except Exception as e:
+                for job in jobs:
+                    job.error = e
+            for job in jobs:
+                if job.error is not None or out_queue is done_queue:
+                    # Job terminé (envoyé à Anki ou en échec) : ses clips ne
+                    # servent plus, inutile de les garder jusqu'à la sortie
+                    job.word_audio = job.example_audio = None
+                    self._put(done_queue, job)
+                else:
+                    self._put(out_queue, job)
+
+    def _get(self, in_queue):
+        """Get the next item, or None once stop() has been called."""
+        while not self._stop.is_set():
+            try:
+                return in_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _put(self, out_queue, item) -> bool:
+        """Put with back-pressure while still honouring stop()."""
+        while not self._stop.is_set():
+            try:
+                out_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _llm_stage(self, jobs):
+        # Une requête groupée par langue, pour les mots sans réponse journalisée
+        by_deck = {}
+        for job in jobs:
+            if job.word_info is None:
+                by_deck.setdefault(job.deck_name, []).append(job)
+        for deck_name, deck_jobs in by_deck.items():
+            # Une erreur ne concerne que les mots de ce deck, pas le reste du lot
+            try:
+                self._generate_responses(deck_name, deck_jobs)
+            except Exception as e:
+                for job in deck_jobs:
+                    job.error = e
+
+    def _generate_responses(self, deck_name, jobs):
+        if len(jobs) > 1:
+            responses = self.session.llm_client.generate_words_info(
+                [job.word for job in jobs], deck_name)
+        else:
+            responses = [self.session.llm_client.generate_word_info(
+                jobs[0].word, deck_name)]
+        for job, response in zip(jobs, responses):
+            job.response = response
+            job.word_info = WordProcessor.parse_llm_response(response)
+        if self.session.journal:
+            self.session.journal.record_responses([
+                (job.word, job.deck_name, job.tags, job.response, job.word_info)
+                for job in jobs])
+
+    def _tts_stage(self, jobs):
+        pending = [job for job in jobs if job.word_audio is None]
+        if not pending:
+            return
+        results = self.session.card_creator.synthesize_cards_audio([
+            (job.word, job.word_info, job.deck_name) for job in pending])
+        for job, result in zip(pending, results):
+            if isinstance(result, Exception):
+                job.error = result
+            else:
+                job.word_audio, job.example_audio = result
+        if self.session.journal:
+            self.session.journal.record_audio([
+                (job.word, job.deck_name, job.word_audio, job.example_audio)
+                for job in pending if job.error is None])
+
+    def _anki_stage(self, jobs):
+        results = self.session.card_creator.submit_cards([
+            (job.word, job.word_info, job.deck_name,
+             job.word_audio, job.example_audio, job.tags)
+            for job in jobs])
+        for job, result in zip(jobs, results):
+            if isinstance(result, Exception):
+                job.error = result
+            else:
+                job.result = result
+        if self.session.journal:
+            self.session.journal.record_notes([
+                (job.word, job.deck_name, job.result["result"])
+                for job in jobs if job.error is None])
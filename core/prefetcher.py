@@ -0,0 +1,170 @@
+"""Génération anticipée des réponses LLM pendant la relecture interactive."""
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from config.settings import PREFETCH_WINDOW
+from services.llm.ollama_client import ResponseStream
+
+
+class ResponsePrefetcher:
+    """Generates the LLM responses of the next words while the user reviews the current one.
+
+    Un seul thread génère les réponses dans l'ordre des mots (Ollama traite
+    les requêtes une par une) et les garde prêtes jusqu'à leur relecture.
+    Une requête au premier plan (régénération 'r', mot non préchargé)
+    suspend la génération anticipée et interrompt celle en cours, qui
+    reprend ensuite en tête de file. Les réponses préchargées ne sont pas
+    mises en cache : seul l'appelant le fait, une fois la réponse acceptée.
+    """
+
+    def __init__(self, llm_client, window: int = PREFETCH_WINDOW):
+        self.llm_client = llm_client
+        self.window = max(0, window)
+        self._condition = threading.Condition()
+        # Clés (deck, mot) à générer, dans l'ordre de relecture
+        self._queue = deque()
+        # Clés annoncées et pas encore relues (en file, en cours ou prêtes)
+        self._wanted = set()
+        self._ready = {}
+        self._running = None
+        self._cancel_running = False
+        self._foreground = 0
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.interrupted = 0
+        self._thread = threading.Thread(target=self._work, name="llm-prefetch", daemon=True)
+        self._thread.start()
+
+    def look_ahead(self, items, key):
+        """Yield ``items`` while the responses of the next ``window`` ones are generated.
+
+        ``key(item)`` retourne (mot, deck) à précharger, ou None pour un
+        élément qui n'a pas besoin du LLM. Un élément n'est lu dans
+        ``items`` qu'une fois le précédent rendu : un mot relu (accepté,
+        annulé ou régénéré) libère aussitôt sa place dans la fenêtre. Le
+        premier élément n'est pas préchargé : sa réponse est affichée en
+        direct pendant sa génération.
+        """
+        ahead = deque()
+        items = iter(items)
+        exhausted = False
+        while True:
+            while not exhausted and len(ahead) <= self.window:
+                item = next(items, None)
+                if item is None:
+                    exhausted = True
+                    break
+                item_key = key(item) if ahead else None
+                if item_key is not None:
+                    self.schedule(*item_key)
+                ahead.append(item)
+            if not ahead:
+                return
+            yield ahead.popleft()
+
+    def schedule(self, word: str, deck_name: str):
+        """Queue the generation of a word's response."""
+        with self._condition:
+            response_key = (deck_name, word)
+            if response_key in self._wanted:
+                return
+            self._wanted.add(response_key)
+            self._queue.append(response_key)
+            self._condition.notify_all()
+
+    def take(self, word: str, deck_name: str):
+        """Return the prefetched response of a word as a ResponseStream, or None.
+
+        Attend la fin de la génération si elle est en cours. Un mot encore
+        en file en est retiré : l'appelant le génère lui-même au premier plan.
+        """
+        response_key = (deck_name, word)
+        with self._condition:
+            if response_key in self._queue:
+                self._queue.remove(response_key)
+            while self._running == response_key:
+                self._condition.wait()
+            self._wanted.discard(response_key)
+            text = self._ready.pop(response_key, None)
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return ResponseStream(iter([text]))
+
+    @contextmanager
+    def foreground(self):
+        """Pause the prefetching while a foreground request is generated."""
+        with self._condition:
+            self._foreground += 1
+            if self._running is not None:
+                self._cancel_running = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._foreground -= 1
+                self._condition.notify_all()
+
+    def in_foreground(self, stream):
+        """Iterate ``stream`` with the prefetching paused (see foreground())."""
+        with self.foreground():
+            yield from stream
+
+    def stats(self) -> dict:
+        """Return the number of reviewed words found ready, generated live and interrupted."""
+        with self._condition:
+            return {"hits": self.hits, "misses": self.misses, "interrupted": self.interrupted}
+
+    def close(self):
+        """Stop the worker and drop every pending response."""
+        with self._condition:
+            self._closed = True
+            self._cancel_running = True
+            self._queue.clear()
+            self._wanted.clear()
+            self._ready.clear()
+            self._condition.notify_all()
+        self._thread.join(timeout=1)
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._closed and (self._foreground or not self._queue):
+                    self._condition.wait()
+                if self._closed:
+                    return
+                response_key = self._queue.popleft()
+                self._running = response_key
+                self._cancel_running = False
+
+            deck_name, word = response_key
+            text = None
+            try:
+                stream = self.llm_client.stream_word_info(word, deck_name)
+                chunks = iter(stream)
+                try:
+                    for _ in chunks:
+                        if self._cancel_running:
+                            break
+                finally:
+                    # Fermer le flux interrompt la génération côté Ollama
+                    chunks.close()
+                if not self._cancel_running:
+                    text = stream.text
+            except Exception:
+                # Le mot sera généré au premier plan, qui affichera l'erreur
+                pass
+
+            with self._condition:
+                self._running = None
+                if self._cancel_running and response_key in self._wanted:
+                    # Interrompu par une requête au premier plan : reprendre ensuite
+                    self.interrupted += 1
+                    self._queue.appendleft(response_key)
+                elif text and response_key in self._wanted:
+                    self._ready[response_key] = text
+                self._condition.notify_all()
@@ -0,0 +1,113 @@
+"""Session partagée par tous les mots d'une même exécution."""
+
+from config.settings import (OLLAMA_ENDPOINTS, OLLAMA_MODEL,
+                             TTS_THREADS_PER_WORKER)
+from services.audio.audio_cache import AudioCache
+from services.audio.tts_generator import TTSGenerator
+from services.audio.tts_pool import TTSProcessPool
+from services.llm.ollama_client import OllamaClient
+from services.llm.response_cache import ResponseCache
+from services.startup import ServiceStarter
+
+from .card_creator import CardCreator
+from .job_journal import JobJournal
+
+
+class CardSession:
+    """Owns the LLM client, the Anki client and the loaded TTS models for a whole run."""
+
+    def __init__(self, model: str = OLLAMA_MODEL, use_cache: bool = True, refresh_cache: bool = False,
+                 tts_processes: int = 0, tts_threads: int = TTS_THREADS_PER_WORKER, tts_languages=(),
+                 ollama_endpoints=OLLAMA_ENDPOINTS):
+        self.model = model
+        # Serveurs Ollama entre lesquels répartir les requêtes (vide : serveur local)
+        self.ollama_endpoints = list(ollama_endpoints)
+        self.use_cache = use_cache
+        self.refresh_cache = refresh_cache
+        # tts_processes > 0 : synthèse dans un pool de processus, modèles de
+        # tts_languages chargés avant la création des workers
+        self.tts_processes = tts_processes
+        self.tts_threads = tts_threads
+        self.tts_languages = tuple(tts_languages)
+        self.response_cache = None
+        self.journal = None
+        self.audio_cache = None
+        self.audio_generator = None
+        self.llm_client = None
+        self.card_creator = None
+        # Temps de disponibilité d'Anki et d'Ollama (secondes), mesuré par start()
+        self.startup_times = {}
+
+    def preload_tts(self, language_code: str):
+        """Start loading the TTS model of the run language in the background.
+
+        Appelé dès que la langue est connue, le chargement se fait pendant
+        le démarrage des serveurs, la génération LLM ou la relecture.
+        """
+        self._ensure_audio_generator()
+        self.audio_generator.preload_async(language_code)
+
+    def _ensure_audio_generator(self):
+        if self.audio_generator is not None:
+            return
+        if self.use_cache:
+            self.audio_cache = AudioCache()
+        if self.tts_processes > 0:
+            self.audio_generator = TTSProcessPool(
+                self.tts_processes, self.tts_threads,
+                languages=self.tts_languages, audio_cache=self.audio_cache)
+        else:
+            self.audio_generator = TTSGenerator(self.audio_cache)
+
+    def start(self, progress=None):
+        """Check/start the servers once and create the shared clients."""
+        # Anki et Ollama démarrent en parallèle ; les clients ne font ensuite
+        # qu'une vérification rapide
+        self.startup_times = ServiceStarter.start_all(
+            progress, skip=("Ollama",) if self.ollama_endpoints else ())
+
+        if progress:
+            progress.set_description("Initializing Ollama client")
+        if self.use_cache:
+            self.response_cache = ResponseCache()
+        self.journal = JobJournal()
+        self.llm_client = OllamaClient(
+            model=self.model, progress=progress,
+            cache=self.response_cache, refresh_cache=self.refresh_cache,
+            endpoints=self.ollama_endpoints)
+        # Le modèle se charge en VRAM pendant le démarrage d'Anki et du TTS
+        self.llm_client.warm_up_async()
+        if progress:
+            progress.update(1)
+
+        if progress and self.audio_generator is None and self.tts_processes > 0:
+            progress.set_description("Starting TTS workers")
+        self._ensure_audio_generator()
+
+        # CardCreator vérifie Anki et met à jour la progression lui-même
+        self.card_creator = CardCreator(
+            progress, audio_generator=self.audio_generator)
+        return self
+
+    def close(self):
+        """Release the clients, the caches and unload the TTS models."""
+        if self.card_creator:
+            self.card_creator.close()
+        elif self.audio_generator:
+            self.audio_generator.unload()
+        if self.response_cache:
+            self.response_cache.close()
+        if self.journal:
+            self.journal.close()
+        self.card_creator = None
+        self.response_cache = None
+        self.journal = None
+        self.audio_cache = None
+        self.audio_generator = None
+        self.llm_client = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
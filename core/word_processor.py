@@ -1,7 +1,15 @@
 """Module de traitement des mots et des réponses LLM."""
 
+import html
+import re
+
+from services.llm.response_parser import ResponseParser
+
 from .models import WordInfo
 
+_SOUND_TAG = re.compile(r"\[sound:[^\]]*\]")
+_HTML_TAG = re.compile(r"<[^>]+>")
+
 
 class WordProcessor:
     """Classe pour traiter les réponses LLM et extraire les informations des mots."""
@@ -9,7 +17,7 @@ class WordProcessor:
     @staticmethod
     def parse_llm_response(response: str) -> WordInfo:
         """Parse LLM response into structured data."""
-        lines = [line.strip() for line in response.split("\n") if line.strip()]
+        lines = ResponseParser.lines(response)
 
         return WordInfo(
             definition=lines[0] if len(lines) > 0 else "",
@@ -24,3 +32,9 @@ class WordProcessor:
         if example.lower().startswith(prefix):
             return example[len(prefix):].strip()
         return example.strip()
+
+    @staticmethod
+    def normalize_front(front: str) -> str:
+        """Normalize a card front (or a word) for duplicate detection."""
+        text = _HTML_TAG.sub(" ", _SOUND_TAG.sub(" ", front))
+        return " ".join(html.unescape(text).casefold().split())
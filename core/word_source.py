@@ -0,0 +1,136 @@
+"""Lecture en flux des mots à importer (argument, fichier texte/CSV/TSV ou stdin)."""
+
+import csv
+import itertools
+import os
+import re
+import sys
+import threading
+
+from .models import WordEntry
+
+# Noms de colonnes reconnus dans une ligne d'en-tête CSV/TSV
+WORD_COLUMNS = {"word", "mot"}
+LANGUAGE_COLUMNS = {"language", "langue", "deck"}
+TAGS_COLUMNS = {"tags", "tag"}
+
+INPUT_FORMATS = ("auto", "txt", "csv", "tsv")
+
+
+class WordSource:
+    """Produces WordEntry items lazily from the command line or an input file."""
+
+    @staticmethod
+    def from_argument(words: str, language: str) -> list:
+        """Split the positional argument on semicolons, skipping empty strings."""
+        return [WordEntry(word.strip(), language)
+                for word in words.split(';') if word.strip()]
+
+    @staticmethod
+    def read(path: str, default_language: str, input_format: str = "auto"):
+        """Yield the entries of a file, or of stdin when ``path`` is ``-``.
+
+        Le fichier est lu ligne par ligne : la mémoire utilisée ne dépend
+        pas de sa taille. Format ``txt`` : un mot par ligne (lignes vides et
+        commentaires ``#`` ignorés). Formats ``csv``/``tsv`` : colonnes
+        mot, langue et tags, par position ou nommées par une ligne d'en-tête
+        (word/mot, language/langue/deck, tags). Une langue vide utilise
+        ``default_language`` ; les tags sont séparés par des espaces ou des
+        virgules.
+        """
+        stream = sys.stdin if path == "-" else open(
+            path, encoding="utf-8-sig", newline="")
+        try:
+            lines = iter(stream)
+            first_line = next(lines, None)
+            if first_line is None:
+                return
+            lines = itertools.chain([first_line], lines)
+            file_format = WordSource._detect_format(path, input_format, first_line)
+
+            if file_format == "txt":
+                rows = ([line] for line in lines)
+            else:
+                rows = csv.reader(lines, delimiter="," if file_format == "csv" else "\t")
+            yield from WordSource._parse_rows(rows, default_language)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+    @staticmethod
+    def _detect_format(path: str, input_format: str, first_line: str) -> str:
+        if input_format != "auto":
+            return input_format
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return "csv"
+        if extension in (".tsv", ".tab"):
+            return "tsv"
+        # Entrée standard ou extension inconnue : TSV si la ligne contient une tabulation
+        return "tsv" if "\t" in first_line else "txt"
+
+    @staticmethod
+    def _parse_rows(rows, default_language: str):
+        columns = {"word": 0, "language": 1, "tags": 2}
+        for line_number, row in enumerate(rows):
+            cells = [cell.strip() for cell in row]
+            if line_number == 0 and cells and cells[0].lower() in WORD_COLUMNS:
+                columns = WordSource._header_columns(cells)
+                continue
+
+            word = WordSource._cell(cells, columns["word"])
+            if not word or word.startswith("#"):
+                continue
+            language = WordSource._cell(cells, columns["language"])
+            tags = WordSource._cell(cells, columns["tags"])
+            yield WordEntry(
+                word=word,
+                language=language.capitalize() if language else default_language,
+                tags=tuple(tag for tag in re.split(r"[\s,]+", tags) if tag))
+
+    @staticmethod
+    def _header_columns(header: list) -> dict:
+        columns = {"word": None, "language": None, "tags": None}
+        for position, name in enumerate(header):
+            name = name.lower()
+            if name in WORD_COLUMNS:
+                columns["word"] = position
+            elif name in LANGUAGE_COLUMNS:
+                columns["language"] = position
+            elif name in TAGS_COLUMNS:
+                columns["tags"] = position
+        return columns
+
+    @staticmethod
+    def _cell(cells: list, position) -> str:
+        if position is None or position >= len(cells):
+            return ""
+        return cells[position]
+
+
+class EntryCounter(threading.Thread):
+    """Counts the entries of an input file in the background.
+
+    ``total`` vaut None tant que le comptage n'est pas terminé ;
+    ``on_total(count)`` est alors appelé. L'entrée standard ne pouvant être
+    lue deux fois, elle n'est jamais comptée.
+    """
+
+    def __init__(self, path: str, input_format: str = "auto", on_total=None):
+        super().__init__(name="input-count", daemon=True)
+        self.path = path
+        self.input_format = input_format
+        self.on_total = on_total
+        self.total = None
+
+    def run(self):
+        if self.path == "-":
+            return
+        try:
+            total = sum(1 for _ in WordSource.read(self.path, "", self.input_format))
+        except (OSError, ValueError, csv.Error):
+            # La lecture principale signalera l'erreur
+            return
+        self.total = total
+        if self.on_total:
+            self.on_total(total)
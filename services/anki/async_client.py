@@ -0,0 +1,93 @@
+"""Client AnkiConnect asyncio (aiohttp) pour les services qui tournent dans une boucle d'événements."""
+
+import asyncio
+
+from config.settings import STARTUP_TIMEOUT
+from utils.metrics import span
+from utils.polling import wait_until_ready_async
+
+from ..async_http_transport import AsyncHttpTransport, aiohttp
+from .client import BaseAnkiClient
+from .launcher import AnkiLauncher
+
+
+class AsyncAnkiClient(BaseAnkiClient):
+    """Asyncio counterpart of AnkiClient.
+
+    S'utilise avec ``async with AsyncAnkiClient() as anki:``, qui démarre
+    Anki si nécessaire puis ferme les connexions à la sortie. Les requêtes
+    partagent le pool de connexions du transport et peuvent être annulées.
+    """
+
+    def __init__(self, transport: AsyncHttpTransport = None):
+        super().__init__()
+        self.transport = transport or AsyncHttpTransport()
+
+    async def __aenter__(self):
+        await self.ensure_server_running()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the pooled connections."""
+        await self.transport.close()
+
+    async def is_server_running(self) -> bool:
+        """Check if Anki Connect is available."""
+        try:
+            await self.transport.post_json(self.api_url, "anki_ping",
+                                           self._action("version"), retries=0)
+            return True
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+    async def ensure_server_running(self, timeout: float = STARTUP_TIMEOUT):
+        """Start Anki if needed and wait for Anki Connect, without blocking the loop."""
+        if await self.is_server_running():
+            return
+        # La recherche de l'exécutable et le lancement se font dans un thread
+        await asyncio.to_thread(AnkiLauncher.start_anki_silent, None)
+        if not await wait_until_ready_async(self.is_server_running, timeout):
+            raise RuntimeError("Anki server startup timeout")
+
+    async def create_deck_if_not_exists(self, deck_name: str) -> dict:
+        """Create deck if it doesn't exist (once per session)."""
+        if deck_name in self._known_decks:
+            return {"result": None, "error": None}
+        result = await self._invoke("createDeck", deck=deck_name)
+        self._known_decks.add(deck_name)
+        return result
+
+    async def add_media_file(self, filename: str, content) -> dict:
+        """Add media to Anki from a local file path or an in-memory buffer."""
+        return await self._invoke("storeMediaFile", **self._media_params(filename, content))
+
+    async def add_note(self, deck_name: str, front_content: str, back_content: str,
+                       tags=()) -> dict:
+        """Add note to Anki deck."""
+        return await self._invoke("addNote", note=self._build_note(
+            deck_name, front_content, back_content, tags))
+
+    async def multi(self, actions: list) -> list:
+        """Run several actions in a single AnkiConnect request (see AnkiClient.multi)."""
+        response = await self._invoke("multi", actions=actions)
+        if response.get("error"):
+            raise RuntimeError(f"AnkiConnect multi failed: {response['error']}")
+        return response["result"]
+
+    async def submit_cards(self, cards: list) -> list:
+        """Upload the media and add the notes of several cards in one request.
+
+        Même format de cartes et de résultats que AnkiClient.submit_cards().
+        """
+        actions, new_decks, spans = self._submit_actions(cards)
+        results = await self.multi(actions)
+        return self._submit_results(actions, new_decks, spans, results)
+
+    async def _invoke(self, action: str, **params) -> dict:
+        """Send one action to AnkiConnect and return the raw JSON response."""
+        with span(f"anki.{action}"):
+            return await self.transport.post_json(
+                self.api_url, "anki", self._action(action, **params))
@@ -1,122 +1,254 @@
 """Client Anki Connect pour la gestion des cartes."""
 
 import base64
-import time
 
 import requests
 
-from config.settings import ANKI_CONNECT_URL
+from config.settings import ANKI_CONNECT_URL, STARTUP_TIMEOUT
+from utils.metrics import span
+from utils.polling import wait_until_ready
 
+from ..http_transport import get_transport
 from .launcher import AnkiLauncher
 
 
-class AnkiClient:
+class BaseAnkiClient:
+    """AnkiConnect actions and session state shared by the blocking and asyncio clients.
+
+    Ne fait aucune entrée/sortie réseau : construction des actions, des
+    notes et des requêtes ``multi``, et interprétation de leurs réponses.
+    """
+
+    def __init__(self):
+        self.api_url = ANKI_CONNECT_URL
+        # Decks déjà créés et médias déjà envoyés pendant la session
+        self._known_decks = set()
+        self._stored_media = set()
+
+    def _submit_actions(self, cards: list) -> tuple:
+        """Build the multi actions of submit_cards().
+
+        Retourne (actions, nouveaux decks, position (début, fin) des actions
+        de chaque carte).
+        """
+        actions = []
+        new_decks = []
+        for card in cards:
+            deck_name = card["deck_name"]
+            if deck_name not in self._known_decks and deck_name not in new_decks:
+                new_decks.append(deck_name)
+                actions.append(self._action("createDeck", deck=deck_name))
+
+        # Position de chaque carte dans la liste d'actions
+        spans = []
+        for card in cards:
+            start = len(actions)
+            for filename, content in card["media_files"].items():
+                # Les noms adressés par contenu permettent de ne pas renvoyer un média identique
+                if filename in self._stored_media:
+                    continue
+                actions.append(self._action(
+                    "storeMediaFile", **self._media_params(filename, content)))
+            actions.append(self._action("addNote", note=self._build_note(
+                card["deck_name"], card["front_content"], card["back_content"],
+                card.get("tags", ()))))
+            spans.append((start, len(actions)))
+        return actions, new_decks, spans
+
+    def _submit_results(self, actions: list, new_decks: list, spans: list, results: list) -> list:
+        """Record the created decks and stored media, and return one result per card."""
+        for deck_name, deck_result in zip(new_decks, results):
+            if not deck_result.get("error"):
+                self._known_decks.add(deck_name)
+
+        for action, result in zip(actions, results):
+            if action["action"] == "storeMediaFile" and not result.get("error"):
+                self._stored_media.add(action["params"]["filename"])
+
+        card_results = []
+        for start, end in spans:
+            card_actions = results[start:end]
+            errors = [result.get("error") for result in card_actions
+                      if result.get("error")]
+            card_results.append({
+                "result": card_actions[-1].get("result"),
+                "error": errors[0] if errors else None,
+            })
+        return card_results
+
+    @staticmethod
+    def _action(action: str, **params) -> dict:
+        return {"action": action, "version": 6, "params": params}
+
+    @staticmethod
+    def _media_params(filename: str, content) -> dict:
+        """Build storeMediaFile params from bytes or a local file path."""
+        if isinstance(content, (bytes, bytearray)):
+            raw = bytes(content)
+        else:
+            with open(content, 'rb') as f:
+                raw = f.read()
+        with span("anki.base64"):
+            data = base64.b64encode(raw).decode('utf-8')
+        return {"filename": filename, "data": data}
+
+    @staticmethod
+    def _build_note(deck_name: str, front_content: str, back_content: str, tags=()) -> dict:
+        return {
+            "deckName": deck_name,
+            "modelName": "Basic",
+            "fields": {
+                "Front": front_content,
+                "Back": back_content
+            },
+            "options": {"allowDuplicate": False},
+            "tags": ["auto-llm", deck_name.lower(), *tags]
+        }
+
+
+class AnkiClient(BaseAnkiClient):
     """Handles communication with Anki Connect."""
 
     def __init__(self, progress=None):
-        self.api_url = ANKI_CONNECT_URL
+        super().__init__()
         self.progress = progress
+        self.transport = get_transport()
         self._ensure_anki_running()
 
-    def _is_anki_running(self) -> bool:
+    @staticmethod
+    def is_server_running() -> bool:
         """Check if Anki Connect is available."""
         try:
-            response = requests.post(self.api_url, json={
+            response = get_transport().post(ANKI_CONNECT_URL, "anki_ping", json={
                 "action": "version",
                 "version": 6
-            }, timeout=2)
+            }, retries=0)
             return response.status_code == 200
         except requests.exceptions.RequestException:
             return False
 
-    def _ensure_anki_running(self):
+    @staticmethod
+    def ensure_server_running(progress=None):
         """Ensure Anki is running, start it if necessary, and wait for server."""
         # Vérifier d'abord si Anki est déjà en cours d'exécution
-        if self._is_anki_running():
-            if not self.progress:
+        if AnkiClient.is_server_running():
+            if not progress:
                 print("✅ Anki server is already available")
             return
 
         # Démarrer Anki s'il n'est pas en cours d'exécution
-        AnkiLauncher.start_anki_silent(self.progress)
+        AnkiLauncher.start_anki_silent(progress)
 
         # Attendre que le serveur soit disponible
-        self._wait_for_anki_server()
+        AnkiClient._wait_for_anki_server(progress)
+
+    def _ensure_anki_running(self):
+        AnkiClient.ensure_server_running(self.progress)
 
-    def _wait_for_anki_server(self):
+    @staticmethod
+    def _wait_for_anki_server(progress=None):
         """Wait for Anki server to become available."""
-        if self.progress:
-            self.progress.set_description("Waiting for Anki server...")
+        if progress:
+            progress.set_description("Waiting for Anki server...")
         else:
             print("⏳ Waiting for Anki server to be available...")
 
-        max_attempts = 30  # Maximum 60 secondes d'attente
-        attempts = 0
-
-        while not self._is_anki_running() and attempts < max_attempts:
-            if not self.progress:
-                print(
-                    f"⏳ Anki server not available, waiting... (attempt {attempts + 1}/{max_attempts})")
-            time.sleep(2)
-            attempts += 1
+        def on_wait(attempt, delay):
+            if not progress:
+                print(f"⏳ Anki server not available, retrying in {delay:.1f}s... (attempt {attempt})")
 
-        if attempts >= max_attempts:
-            error_msg = "❌ Timeout: Anki server did not become available within 60 seconds"
-            if self.progress:
-                self.progress.set_description(error_msg)
+        if not wait_until_ready(AnkiClient.is_server_running, on_wait=on_wait):
+            error_msg = f"❌ Timeout: Anki server did not become available within {STARTUP_TIMEOUT} seconds"
+            if progress:
+                progress.set_description(error_msg)
             else:
                 print(error_msg)
             raise RuntimeError("Anki server startup timeout")
 
-        if not self.progress:
+        if not progress:
             print("✅ Anki server is available")
 
     def create_deck_if_not_exists(self, deck_name: str):
-        """Create deck if it doesn't exist."""
-        payload = {
-            "action": "createDeck",
-            "version": 6,
-            "params": {"deck": deck_name}
-        }
-        response = requests.post(self.api_url, json=payload)
-        response.raise_for_status()
-        return response.json()
+        """Create deck if it doesn't exist (once per session)."""
+        if deck_name in self._known_decks:
+            return {"result": None, "error": None}
+        result = self._invoke("createDeck", deck=deck_name)
+        self._known_decks.add(deck_name)
+        return result
 
     def add_media_file(self, filename: str, file_path: str):
         """Add media file to Anki."""
-        with open(file_path, 'rb') as f:
-            data = base64.b64encode(f.read()).decode('utf-8')
-
-        payload = {
-            "action": "storeMediaFile",
-            "version": 6,
-            "params": {
-                "filename": filename,
-                "data": data
-            }
-        }
-        response = requests.post(self.api_url, json=payload)
-        response.raise_for_status()
-        return response.json()
+        return self._invoke("storeMediaFile", **self._media_params(filename, file_path))
 
     def add_note(self, deck_name: str, front_content: str, back_content: str):
         """Add note to Anki deck."""
-        payload = {
-            "action": "addNote",
-            "version": 6,
-            "params": {
-                "note": {
-                    "deckName": deck_name,
-                    "modelName": "Basic",
-                    "fields": {
-                        "Front": front_content,
-                        "Back": back_content
-                    },
-                    "options": {"allowDuplicate": False},
-                    "tags": ["auto-llm", deck_name.lower()]
-                }
-            }
-        }
-        response = requests.post(self.api_url, json=payload)
-        response.raise_for_status()
-        return response.json()
+        return self._invoke("addNote", note=self._build_note(
+            deck_name, front_content, back_content))
+
+    def get_note_fronts(self, deck_name: str, chunk_size: int = 500) -> list:
+        """Return the first field of every note in a deck.
+
+        Utilise ``findNotes`` puis ``notesInfo`` par paquets : deux requêtes
+        suffisent pour un deck de taille moyenne, quel que soit le nombre de
+        mots à importer.
+        """
+        query = f'deck:"{deck_name.replace(chr(34), "")}"'
+        response = self._invoke("findNotes", query=query)
+        if response.get("error"):
+            raise RuntimeError(f"AnkiConnect findNotes failed: {response['error']}")
+        note_ids = response["result"]
+
+        fronts = []
+        for start in range(0, len(note_ids), chunk_size):
+            response = self._invoke(
+                "notesInfo", notes=note_ids[start:start + chunk_size])
+            if response.get("error"):
+                raise RuntimeError(f"AnkiConnect notesInfo failed: {response['error']}")
+            for note in response["result"]:
+                fields = note.get("fields") or {}
+                # Anki détecte les doublons sur le premier champ de la note
+                first = min(fields.values(), key=lambda field: field.get("order", 0),
+                            default=None)
+                if first is not None:
+                    fronts.append(first.get("value", ""))
+        return fronts
+
+    def multi(self, actions: list) -> list:
+        """Run several actions in a single AnkiConnect request.
+
+        Retourne une réponse {"result", "error"} par action, dans l'ordre.
+        """
+        response = self._invoke("multi", actions=actions)
+        if response.get("error"):
+            raise RuntimeError(f"AnkiConnect multi failed: {response['error']}")
+        return response["result"]
+
+    def submit_card(self, deck_name: str, front_content: str, back_content: str, media_files: dict) -> dict:
+        """Upload the media files and add the note in a single request."""
+        return self.submit_cards([{
+            "deck_name": deck_name,
+            "front_content": front_content,
+            "back_content": back_content,
+            "media_files": media_files,
+        }])[0]
+
+    def submit_cards(self, cards: list) -> list:
+        """Upload the media and add the notes of several cards in one request.
+
+        Chaque carte est un dictionnaire avec les clés ``deck_name``,
+        ``front_content``, ``back_content``, ``media_files``
+        ({nom dans Anki: contenu en bytes ou chemin local}) et, en option,
+        ``tags`` (étiquettes ajoutées à la note). Retourne pour chaque carte un
+        dictionnaire {"result": id de la note, "error": message ou None}.
+        """
+        actions, new_decks, spans = self._submit_actions(cards)
+        results = self.multi(actions)
+        return self._submit_results(actions, new_decks, spans, results)
+
+    def _invoke(self, action: str, **params) -> dict:
+        """Send one action to AnkiConnect and return the raw JSON response."""
+        with span(f"anki.{action}"):
+            response = self.transport.post(
+                self.api_url, "anki", json=self._action(action, **params))
+            response.raise_for_status()
+            return response.json()
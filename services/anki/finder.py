@@ -1,19 +1,39 @@
 """Module pour trouver l'exécutable Anki sur le système."""
 
+import json
 import os
-import subprocess
+import shutil
 import sys
 
+from config.settings import ANKI_PATH_STATE_FILE
+
 
 class AnkiFinder:
     """Classe pour localiser l'exécutable Anki sur différents systèmes."""
 
     @staticmethod
     def find_anki_executable():
-        """Find Anki executable on the system."""
+        """Find Anki executable on the system.
+
+        Le chemin trouvé est mémorisé dans ANKI_PATH_STATE_FILE avec la
+        plateforme et la date de modification du fichier : les exécutions
+        suivantes se contentent d'un ``stat``. La recherche complète n'est
+        relancée que si Anki a été déplacé, réinstallé ou mis à jour.
+        """
+        cached_path = AnkiFinder._load_cached_path()
+        if cached_path:
+            return cached_path
+
+        path = AnkiFinder._discover()
+        if path:
+            AnkiFinder._save_cached_path(path)
+        return path
+
+    @staticmethod
+    def _candidate_paths() -> list:
         if sys.platform == "win32":
             # Emplacements typiques d'Anki sur Windows
-            possible_paths = [
+            return [
                 r"C:\Program Files\Anki\anki.exe",
                 r"C:\Program Files (x86)\Anki\anki.exe",
                 os.path.expanduser(r"~\AppData\Local\Programs\Anki\anki.exe"),
@@ -24,24 +44,48 @@ class AnkiFinder:
                 "anki.exe",  # Si dans le PATH
                 "anki"       # Si dans le PATH
             ]
-        else:
-            # Unix/Linux/Mac
-            possible_paths = [
-                "/usr/bin/anki",
-                "/usr/local/bin/anki",
-                "/opt/anki/anki",
-                "anki"  # Si dans le PATH
-            ]
+        # Unix/Linux/Mac
+        return [
+            "/usr/bin/anki",
+            "/usr/local/bin/anki",
+            "/opt/anki/anki",
+            "anki"  # Si dans le PATH
+        ]
 
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-            # Vérifier aussi si la commande est disponible dans le PATH
-            try:
-                subprocess.run([path, "--version"],
-                               capture_output=True, timeout=5)
-                return path
-            except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+    @staticmethod
+    def _discover():
+        """Check the candidate paths without spawning any process."""
+        for path in AnkiFinder._candidate_paths():
+            if os.path.isabs(path):
+                if os.path.exists(path):
+                    return path
                 continue
+            # Nom de commande : résolution dans le PATH
+            resolved = shutil.which(path)
+            if resolved:
+                return resolved
+        return None
 
+    @staticmethod
+    def _load_cached_path():
+        try:
+            with open(ANKI_PATH_STATE_FILE, encoding="utf-8") as f:
+                state = json.load(f)
+            path = state["path"]
+            if (state["platform"] == sys.platform
+                    and os.stat(path).st_mtime == state["mtime"]):
+                return path
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
         return None
+
+    @staticmethod
+    def _save_cached_path(path: str):
+        try:
+            os.makedirs(os.path.dirname(ANKI_PATH_STATE_FILE), exist_ok=True)
+            with open(ANKI_PATH_STATE_FILE, "w", encoding="utf-8") as f:
+                json.dump({"platform": sys.platform, "path": path,
+                           "mtime": os.stat(path).st_mtime}, f)
+        except OSError:
+            # Le cache n'est qu'une optimisation
+            pass
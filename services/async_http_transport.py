@@ -0,0 +1,111 @@
+"""Transport HTTP asyncio pour les clients asynchrones AnkiConnect et Ollama.
+
+Repose sur aiohttp, dépendance optionnelle : seuls les clients asynchrones
+en ont besoin (``pip install aiohttp``).
+"""
+
+import asyncio
+import json
+
+from config.settings import (HTTP_DEFAULT_TIMEOUT, HTTP_MAX_RETRIES,
+                             HTTP_POOL_SIZE, HTTP_RETRY_BACKOFF,
+                             HTTP_TIMEOUTS)
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncHttpTransport:
+    """Pooled keep-alive aiohttp session with per-endpoint timeouts and retries.
+
+    Même politique que HttpTransport : délais (connexion, lecture) par type
+    de requête, et nouvelles tentatives avec attente exponentielle
+    (asyncio.sleep) pour les seules erreurs de connexion. Annuler la tâche
+    appelante ferme la connexion en cours ; pour Ollama, cela interrompt la
+    génération.
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE,
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 backoff: float = HTTP_RETRY_BACKOFF,
+                 timeouts: dict = None):
+        if aiohttp is None:
+            raise RuntimeError(
+                "aiohttp is required for the asyncio clients: pip install aiohttp")
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeouts = timeouts if timeouts is not None else HTTP_TIMEOUTS
+        self.retries = 0
+        # Créée à la première requête, dans la boucle qui l'utilise
+        self._session = None
+
+    async def get_status(self, url: str, endpoint: str, retries: int = 0) -> int:
+        """Send a GET request and return its HTTP status."""
+        async with await self._request("GET", url, endpoint, retries) as response:
+            return response.status
+
+    async def post_json(self, url: str, endpoint: str, payload: dict,
+                        retries: int = None, on_retry=None) -> dict:
+        """POST a JSON payload and return the decoded JSON response.
+
+        Un statut HTTP d'erreur lève aiohttp.ClientResponseError.
+        """
+        async with await self._request("POST", url, endpoint, retries, on_retry,
+                                       json=payload) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def post_ndjson(self, url: str, endpoint: str, payload: dict,
+                          retries: int = None, on_retry=None):
+        """POST a JSON payload and yield each object of the NDJSON response.
+
+        Fermer le générateur (``aclose()``, sortie anticipée d'un
+        ``async for``) ou annuler la tâche ferme la connexion.
+        """
+        async with await self._request("POST", url, endpoint, retries, on_retry,
+                                       json=payload) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    async def close(self):
+        """Close every pooled connection."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, method: str, url: str, endpoint: str, retries: int = None,
+                       on_retry=None, **kwargs):
+        """Send a request and return the aiohttp response (to use with ``async with``).
+
+        ``on_retry(attempt)`` est une coroutine attendue avant chaque nouvelle
+        tentative, par exemple pour redémarrer le serveur.
+        """
+        connect, read = self.timeouts.get(endpoint, HTTP_DEFAULT_TIMEOUT)
+        timeout = aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        retries = self.max_retries if retries is None else retries
+
+        attempt = 0
+        while True:
+            try:
+                return await self._get_session().request(
+                    method, url, timeout=timeout, **kwargs)
+            except aiohttp.ClientConnectorError:
+                if attempt >= retries:
+                    raise
+                attempt += 1
+                self.retries += 1
+                if on_retry:
+                    await on_retry(attempt)
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+
+    def _get_session(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size))
+        return self._session
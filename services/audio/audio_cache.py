@@ -0,0 +1,114 @@
+"""Cache disque des clips audio générés, adressé par contenu."""
+
+import hashlib
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+from config.settings import (AUDIO_CACHE_DIR, AUDIO_CACHE_LOW_WATER,
+                             AUDIO_CACHE_MAX_BYTES)
+
+
+class AudioCache:
+    """Size-bounded LRU cache of synthesized clips keyed by (TTS model, text).
+
+    Chaque clip est un fichier ``<sha256>.wav``. L'ordre LRU est tenu en
+    mémoire, chargé une seule fois depuis les dates de modification (qui
+    sont rafraîchies à chaque lecture pour les sessions suivantes). Au-delà
+    de ``max_bytes``, les clips les plus anciens sont supprimés jusqu'à
+    ``low_water`` fois cette taille, pour ne pas évincer à chaque ajout.
+    """
+
+    def __init__(self, directory: str = AUDIO_CACHE_DIR, max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+                 low_water: float = AUDIO_CACHE_LOW_WATER):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+        # Clé -> taille du clip, du moins au plus récemment utilisé
+        self._index = OrderedDict(
+            (key, size) for _, key, size in sorted(self._entries()))
+        self._total_bytes = sum(self._index.values())
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """Build the content address of a clip."""
+        normalized = " ".join(unicodedata.normalize("NFC", text).split())
+        return hashlib.sha256(f"{model_name}\x1f{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached clip, or None on a miss."""
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                os.utime(path)
+            except OSError:
+                # Clip supprimé hors du cache (ou par un autre processus)
+                self._total_bytes -= self._index.pop(key, 0)
+                self.misses += 1
+                return None
+            if key not in self._index:
+                # Écrit par un autre processus depuis le chargement de l'index
+                self._index[key] = len(data)
+                self._total_bytes += len(data)
+            self._index.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes):
+        """Store a clip atomically, then evict the least recently used ones."""
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            try:
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+            finally:
+                # Écriture en échec (disque plein...) : ne pas laisser de .tmp
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            self._total_bytes += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict(self.max_bytes * self.low_water)
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and the cache size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self._total_bytes,
+            }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def _entries(self):
+        """Yield (mtime, key, size) for every cached clip."""
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".wav"):
+                stat = entry.stat()
+                yield stat.st_mtime, entry.name[:-len(".wav")], stat.st_size
+
+    def _evict(self, target_bytes: float):
+        """Remove the least recently used clips until the cache fits in ``target_bytes``."""
+        while self._index and self._total_bytes > target_bytes:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                continue
+            self.evictions += 1
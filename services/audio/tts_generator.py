@@ -1,50 +1,156 @@
 """Générateur audio utilisant des modèles TTS légers spécifiques aux langues."""
 
-import os
-from contextlib import redirect_stderr, redirect_stdout
-
-from TTS.api import TTS
+import io
+import threading
+import wave
 
 from config.languages import DEFAULT_TTS_MODEL, TTS_MODELS
+from utils.metrics import span
+from utils.quiet import silence_current_thread
 
 
 class TTSGenerator:
     """Handles audio generation for words and examples using lightweight TTS models."""
 
-    def __init__(self):
+    def __init__(self, audio_cache=None):
         self._tts_instances = {}
+        # Cache optionnel des clips (AudioCache), consulté avant tout chargement de modèle
+        self.audio_cache = audio_cache
+        # Un modèle Coqui n'est pas thread-safe : un verrou par langue
+        self._instances_lock = threading.Lock()
+        self._synthesis_locks = {}
 
     def _get_tts_model_for_language(self, language_code: str) -> str:
         """Get the appropriate lightweight TTS model for the given language."""
         return TTS_MODELS.get(language_code, DEFAULT_TTS_MODEL)
 
+    def _get_synthesis_lock(self, language_code: str) -> threading.Lock:
+        """Get the lock serializing access to the model of a language."""
+        with self._instances_lock:
+            return self._synthesis_locks.setdefault(language_code, threading.Lock())
+
     def _get_tts_instance(self, language_code: str):
         """Get or create TTS instance for specific language."""
-        if language_code not in self._tts_instances:
-            model_name = self._get_tts_model_for_language(language_code)
-            # Créer l'instance TTS en supprimant les logs d'initialisation
-            with open(os.devnull, 'w') as fnull:
-                # Rediriger uniquement stdout, pas stderr pour voir la progression
-                with redirect_stdout(fnull):
+        with self._get_synthesis_lock(language_code):
+            if language_code not in self._tts_instances:
+                # Import différé : TTS.api charge torch (plusieurs secondes)
+                from TTS.api import TTS
 
+                model_name = self._get_tts_model_for_language(language_code)
+                # Créer l'instance TTS en supprimant les logs d'initialisation
+                # Rediriger uniquement stdout, pas stderr pour voir la progression
+                with span("tts.model_load"), silence_current_thread(stderr=False):
                     self._tts_instances[language_code] = TTS(
                         model_name=model_name,
                         progress_bar=True,
                         gpu=False
                     )
 
-        return self._tts_instances[language_code]
+            return self._tts_instances[language_code]
 
-    def generate_audio(self, text: str, filename: str, language: str):
-        """Generate audio file for given text using monolanguage model."""
+    def preload(self, language_code: str):
+        """Load the TTS model of a language ahead of the first synthesis."""
+        self._get_tts_instance(language_code)
+
+    def preload_async(self, language_code: str) -> threading.Thread:
+        """Start loading the TTS model of a language in a background thread.
+
+        Le chargement se fait sous le verrou de la langue : une synthèse
+        demandée avant la fin du chargement attend simplement ce verrou.
+        """
+        def load():
+            try:
+                self.preload(language_code)
+            except Exception:
+                # L'erreur sera levée de nouveau lors de la synthèse
+                pass
+
+        thread = threading.Thread(
+            target=load, name=f"tts-preload-{language_code}", daemon=True)
+        thread.start()
+        return thread
+
+    def unload(self):
+        """Release every loaded TTS model."""
+        self._tts_instances.clear()
+
+    def synthesize(self, text: str, language: str) -> bytes:
+        """Synthesize text and return the clip as in-memory WAV bytes."""
+        return self.synthesize_batch([text], language)[0]
 
+    def synthesize_batch(self, texts: list, language: str) -> list:
+        """Synthesize several texts of one language and return their WAV clips.
+
+        Les clips en cache sont servis directement et les textes identiques
+        ne sont synthétisés qu'une fois.
+        """
+        model_name = self._get_tts_model_for_language(language)
+        clips = {}
+        pending = []
+        for text in texts:
+            if text in clips or text in pending:
+                continue
+            cached = None
+            if self.audio_cache is not None:
+                cached = self.audio_cache.get(
+                    self.audio_cache.make_key(model_name, text))
+            if cached is not None:
+                clips[text] = cached
+            else:
+                pending.append(text)
+
+        if pending:
+            for text, audio in zip(pending, self._synthesize_uncached(pending, language)):
+                clips[text] = audio
+                if self.audio_cache is not None:
+                    self.audio_cache.put(
+                        self.audio_cache.make_key(model_name, text), audio)
+
+        return [clips[text] for text in texts]
+
+    def _synthesize_uncached(self, texts: list, language: str) -> list:
+        """Run the texts through the loaded model in one warmed loop.
+
+        Le verrou du modèle et la mise en sourdine de la sortie ne sont pris
+        qu'une fois pour tout le lot. L'API Coqui n'expose pas d'inférence
+        par lots avec padding : les textes passent un par un dans le modèle.
+        """
         # Get TTS instance for this language
         tts = self._get_tts_instance(language)
+        sample_rate = tts.synthesizer.output_sample_rate
 
         # Generate audio with suppressed output
-        with open(os.devnull, 'w') as fnull:
-            with redirect_stdout(fnull), redirect_stderr(fnull):
-                tts.tts_to_file(
-                    text=text,
-                    file_path=filename
-                )
+        waveforms = []
+        with self._get_synthesis_lock(language), silence_current_thread():
+            for text in texts:
+                with span("tts.synthesize"):
+                    waveforms.append(tts.tts(text=text))
+        clips = []
+        for samples in waveforms:
+            with span("tts.encode_wav"):
+                clips.append(self._encode_wav(samples, sample_rate))
+        return clips
+
+    def generate_audio(self, text: str, filename: str, language: str):
+        """Generate audio file for given text using monolanguage model."""
+        with open(filename, 'wb') as f:
+            f.write(self.synthesize(text, language))
+
+    @staticmethod
+    def _encode_wav(samples, sample_rate: int) -> bytes:
+        """Encode a float waveform as 16-bit mono WAV.
+
+        Le signal est normalisé sur son pic, comme le fait ``save_wav`` de
+        Coqui : les clips gardent le volume des fichiers écrits par TTS.
+        """
+        import numpy as np
+
+        waveform = np.asarray(samples, dtype=np.float32)
+        peak = max(0.01, float(np.abs(waveform).max())) if waveform.size else 1.0
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(int(sample_rate))
+            wav_file.writeframes((waveform * (32767 / peak)).astype('<i2').tobytes())
+        return buffer.getvalue()
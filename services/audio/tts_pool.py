@@ -0,0 +1,89 @@
+"""Pool de processus pour la synthèse vocale sur plusieurs cœurs."""
+
+import multiprocessing
+import os
+
+from config.settings import TTS_PROCESSES, TTS_THREADS_PER_WORKER
+from utils.metrics import span
+
+from .tts_generator import TTSGenerator
+
+# Générateur du processus worker, créé par _init_worker
+_worker_generator = None
+# Erreur de chargement d'un modèle dans le worker, relevée au premier job
+_worker_error = None
+
+
+def _init_worker(threads: int, languages: tuple):
+    """Limit the math library threads of a worker, then load its models.
+
+    Une exception levée ici ferait relancer le worker indéfiniment par le
+    pool (et map() ne rendrait jamais la main) : elle est gardée pour être
+    levée par chaque job, donc transmise à l'appelant.
+    """
+    global _worker_generator, _worker_error
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    _worker_generator = TTSGenerator()
+    try:
+        for language in languages:
+            _worker_generator.preload(language)
+    except Exception as e:
+        _worker_error = e
+
+
+def _synthesize_job(job: tuple) -> bytes:
+    """Synthesize one (text, language) job in a worker and return WAV bytes."""
+    if _worker_error is not None:
+        raise _worker_error
+    text, language = job
+    return _worker_generator._synthesize_uncached([text], language)[0]
+
+
+class TTSProcessPool(TTSGenerator):
+    """Process-pool TTS backend, used in place of the in-process generator.
+
+    Les workers sont créés par ``forkserver`` (``spawn`` sous Windows) et
+    non par ``fork`` : forker un parent qui a déjà chargé torch, ou dont
+    des threads (préchargement, démarrage des services) tournent encore,
+    peut bloquer les workers. Chaque worker charge donc lui-même les
+    modèles des langues indiquées à son démarrage, les autres au premier
+    job de la langue. Les jobs passent par la file du pool et les workers
+    renvoient des clips WAV encodés ; le cache audio reste géré par le
+    processus parent.
+    """
+
+    def __init__(self, processes: int = TTS_PROCESSES,
+                 threads_per_worker: int = TTS_THREADS_PER_WORKER,
+                 languages=(), audio_cache=None):
+        super().__init__(audio_cache)
+        self.processes = max(1, processes)
+
+        start_method = ("forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+                        else "spawn")
+        context = multiprocessing.get_context(start_method)
+        self._pool = context.Pool(self.processes, initializer=_init_worker,
+                                  initargs=(max(1, threads_per_worker), tuple(languages)))
+
+    def preload(self, language_code: str):
+        """Models are loaded by each worker: nothing to do."""
+
+    def preload_async(self, language_code: str):
+        """Models are loaded by each worker: nothing to do."""
+
+    def unload(self):
+        """Stop the worker processes."""
+        self._pool.terminate()
+        self._pool.join()
+
+    def _synthesize_uncached(self, texts: list, language: str) -> list:
+        """Spread the texts across the worker processes."""
+        # Les spans des workers restent dans leur processus : on mesure le lot
+        with span("tts.pool_batch"):
+            return self._pool.map(
+                _synthesize_job, [(text, language) for text in texts], chunksize=1)
@@ -0,0 +1,113 @@
+"""Transport HTTP partagé par les clients AnkiConnect et Ollama."""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+from config.settings import (HTTP_DEFAULT_TIMEOUT, HTTP_MAX_RETRIES,
+                             HTTP_POOL_SIZE, HTTP_RETRY_BACKOFF,
+                             HTTP_TIMEOUTS)
+
+
+class HttpTransport:
+    """Pooled keep-alive HTTP session with per-endpoint timeouts and retries."""
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE,
+                 max_retries: int = HTTP_MAX_RETRIES,
+                 backoff: float = HTTP_RETRY_BACKOFF,
+                 timeouts: dict = None):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeouts = timeouts if timeouts is not None else HTTP_TIMEOUTS
+        self._adapter = HTTPAdapter(pool_connections=pool_size,
+                                    pool_maxsize=pool_size)
+        self._session = requests.Session()
+        self._session.mount("http://", self._adapter)
+        self._session.mount("https://", self._adapter)
+        self._lock = threading.Lock()
+        self._retries = 0
+
+    def get(self, url: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send a GET request (see request())."""
+        return self.request("GET", url, endpoint, **kwargs)
+
+    def post(self, url: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send a POST request (see request())."""
+        return self.request("POST", url, endpoint, **kwargs)
+
+    def request(self, method: str, url: str, endpoint: str, retries: int = None,
+                on_retry=None, **kwargs) -> requests.Response:
+        """Send a request with the timeouts configured for ``endpoint``.
+
+        Seuls les échecs d'établissement de la connexion sont retentés
+        (connexion refusée ou délai de connexion dépassé : la requête n'a
+        pas été envoyée), avec une attente exponentielle entre les
+        tentatives. Une connexion coupée après l'envoi n'est jamais
+        retentée, pour ne pas rejouer une action comme addNote. ``on_retry(attempt)`` est appelé avant chaque nouvelle
+        tentative, par exemple pour redémarrer le serveur.
+        """
+        kwargs.setdefault("timeout", self.timeouts.get(
+            endpoint, HTTP_DEFAULT_TIMEOUT))
+        retries = self.max_retries if retries is None else retries
+
+        attempt = 0
+        while True:
+            try:
+                return self._session.request(method, url, **kwargs)
+            except requests.exceptions.ConnectionError as error:
+                if attempt >= retries or not self._is_connect_error(error):
+                    raise
+                attempt += 1
+                with self._lock:
+                    self._retries += 1
+                if on_retry:
+                    on_retry(attempt)
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+    @staticmethod
+    def _is_connect_error(error: requests.exceptions.ConnectionError) -> bool:
+        """Tell whether the connection failed before the request was sent."""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        # urllib3 : NewConnectionError (connexion refusée) dérive de ConnectTimeoutError
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, ConnectTimeoutError)
+
+    def stats(self) -> dict:
+        """Return connection reuse metrics per host.
+
+        ``connections`` compte les connexions TCP ouvertes, ``requests`` les
+        requêtes envoyées ; la différence correspond aux connexions réutilisées.
+        """
+        hosts = {}
+        for key in list(self._adapter.poolmanager.pools.keys()):
+            pool = self._adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.host}:{pool.port}"
+            entry = hosts.setdefault(host, {"requests": 0, "connections": 0})
+            entry["requests"] += pool.num_requests
+            entry["connections"] += pool.num_connections
+        for entry in hosts.values():
+            entry["reused"] = max(0, entry["requests"] - entry["connections"])
+        return {"hosts": hosts, "retries": self._retries}
+
+    def close(self):
+        """Close every pooled connection."""
+        self._session.close()
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """Return the process-wide shared transport."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HttpTransport()
+        return _transport
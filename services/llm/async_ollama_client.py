@@ -0,0 +1,199 @@
+"""Client LLM asyncio (aiohttp) pour les services qui tournent dans une boucle d'événements."""
+
+import asyncio
+import time
+
+from config.settings import OLLAMA_MODEL, STARTUP_TIMEOUT
+from utils.metrics import span
+from utils.polling import wait_until_ready_async
+
+from ..async_http_transport import AsyncHttpTransport, aiohttp
+from .ollama_client import BATCH_PROMPT_VERSION, BaseOllamaClient
+from .ollama_server import OllamaServer
+from .response_parser import ResponseParser, StreamingResponseParser
+
+
+class AsyncResponseStream:
+    """Streamed LLM response, parsed incrementally while it is iterated with ``async for``.
+
+    Comme ResponseStream, l'itération s'arrête et ferme la connexion dès
+    que les trois lignes attendues sont reçues.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.parser = StreamingResponseParser()
+        self.started_at = time.perf_counter()
+        self.first_token_at = None
+        self.finished_at = None
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self._chunks:
+                if self.first_token_at is None:
+                    self.first_token_at = time.perf_counter()
+                accepted = self.parser.feed(chunk)
+                if accepted:
+                    yield accepted
+                if self.parser.is_complete:
+                    break
+        finally:
+            aclose = getattr(self._chunks, "aclose", None)
+            if aclose:
+                await aclose()
+        self.parser.finish()
+        self.finished_at = time.perf_counter()
+
+    @property
+    def text(self) -> str:
+        """Response text received so far."""
+        return self.parser.text.strip()
+
+
+class AsyncOllamaClient(BaseOllamaClient):
+    """Asyncio counterpart of OllamaClient.
+
+    S'utilise avec ``async with AsyncOllamaClient() as client:``, qui
+    démarre le serveur si nécessaire puis ferme les connexions à la sortie.
+    Plusieurs générations peuvent être attendues en parallèle
+    (asyncio.gather) sur le pool de connexions du transport ; annuler une
+    tâche ferme sa connexion et interrompt la génération côté Ollama.
+    """
+
+    def __init__(self, model: str = OLLAMA_MODEL, cache=None, refresh_cache: bool = False,
+                 transport: AsyncHttpTransport = None):
+        super().__init__(model, cache, refresh_cache)
+        self.transport = transport or AsyncHttpTransport()
+
+    async def __aenter__(self):
+        await self.ensure_server_running()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the pooled connections."""
+        await self.transport.close()
+
+    async def is_server_running(self) -> bool:
+        """Check if the Ollama server answers."""
+        try:
+            status = await self.transport.get_status(OllamaServer.tags_url(), "ollama_tags")
+            return status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+    async def ensure_server_running(self, timeout: float = STARTUP_TIMEOUT):
+        """Start the Ollama server if needed and wait until it answers, without blocking the loop."""
+        if await self.is_server_running():
+            return
+        try:
+            await asyncio.to_thread(OllamaServer.launch)
+        except FileNotFoundError:
+            raise RuntimeError("Ollama executable not found")
+        if not await wait_until_ready_async(self.is_server_running, timeout):
+            raise RuntimeError("Ollama server startup timeout")
+
+    async def warm_up(self) -> float:
+        """Load the model into VRAM without generating anything; return the load time."""
+        start = time.perf_counter()
+        with span("llm.warm_up"):
+            await self.transport.post_json(
+                self.api_url, "ollama_generate", self._warm_up_payload(), retries=0)
+        return time.perf_counter() - start
+
+    async def generate(self, prompt: str, profile: str = "word", count: int = 1) -> str:
+        """Send a prompt to Ollama and return the generated text."""
+        start = time.perf_counter()
+        with span(f"llm.{profile}"):
+            data = await self.transport.post_json(
+                self.api_url, "ollama_generate",
+                self._generate_payload(prompt, False, profile, count),
+                on_retry=self._restart_server)
+        self._latencies.append(time.perf_counter() - start)
+        return data["response"]
+
+    async def generate_word_info(self, word: str, language: str, refresh: bool = False,
+                                 remember: bool = True) -> str:
+        """Generate definition, synonyms and example for a word (see OllamaClient)."""
+        if not refresh:
+            cached = self._get_cached(word, language)
+            if cached is not None:
+                return cached
+
+        response = await self.generate(self._word_prompt(word, language))
+        if remember:
+            self.remember_word_info(word, language, response)
+        return response
+
+    async def generate_words_info(self, words: list, language: str, refresh: bool = False) -> list:
+        """Generate the information of several words with a single request.
+
+        Les mots absents ou mal formés de la réponse groupée sont redemandés
+        individuellement, en parallèle.
+        """
+        responses = [None] * len(words)
+        if not refresh:
+            for index, word in enumerate(words):
+                responses[index] = self._get_cached(word, language)
+
+        missing = [index for index, response in enumerate(responses)
+                   if response is None]
+        if len(missing) > 1:
+            prompt = self._batch_prompt([words[index] for index in missing], language)
+            blocks = ResponseParser.split_batch_response(
+                await self.generate(prompt, "batch", len(missing)), len(missing))
+            for position, index in enumerate(missing):
+                if position in blocks:
+                    responses[index] = blocks[position]
+                    self._put_cached(words[index], language,
+                                     BATCH_PROMPT_VERSION, blocks[position])
+
+        # Repli sur une requête par mot pour les réponses manquantes
+        retry = [index for index, response in enumerate(responses) if response is None]
+        retried = await asyncio.gather(*(
+            self.generate_word_info(words[index], language, refresh=True) for index in retry))
+        for index, response in zip(retry, retried):
+            responses[index] = response
+        return responses
+
+    def stream_word_info(self, word: str, language: str, refresh: bool = False) -> AsyncResponseStream:
+        """Stream the information of a word, token by token (``async for``).
+
+        Comme OllamaClient.stream_word_info(), la réponse n'est mise en cache
+        que par remember_word_info(), une fois acceptée.
+        """
+        if not refresh:
+            cached = self._get_cached(word, language)
+            if cached is not None:
+                return AsyncResponseStream(_single_chunk(cached))
+
+        return AsyncResponseStream(self._generate_stream(self._word_prompt(word, language)))
+
+    async def _generate_stream(self, prompt: str):
+        """Send a streaming request to Ollama and yield the generated tokens."""
+        start = time.perf_counter()
+        chunks = self.transport.post_ndjson(
+            self.api_url, "ollama_generate", self._generate_payload(prompt, True),
+            on_retry=self._restart_server)
+        try:
+            with span("llm.stream"):
+                async for data in chunks:
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        return
+        finally:
+            # Fermer la connexion interrompt la génération côté serveur
+            await chunks.aclose()
+            self._latencies.append(time.perf_counter() - start)
+
+    async def _restart_server(self, attempt: int):
+        """Restart the Ollama server before retrying a failed connection."""
+        print("⚠️ Connection to Ollama server lost, attempting to restart...")
+        await self.ensure_server_running()
+
+
+async def _single_chunk(text: str):
+    yield text
@@ -1,58 +1,398 @@
 """Client LLM pour générer les définitions et exemples de mots."""
 
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
-from config.settings import OLLAMA_API_URL, OLLAMA_MODEL
+from config.settings import (OLLAMA_API_URL, OLLAMA_ENDPOINTS,
+                             OLLAMA_KEEP_ALIVE, OLLAMA_MODEL, OLLAMA_NUM_CTX,
+                             OLLAMA_PROFILES)
+from utils.metrics import span
 
+from ..http_transport import get_transport
+from .ollama_pool import OllamaPool
 from .ollama_server import OllamaServer
+from .response_parser import ResponseParser, StreamingResponseParser
 
+WORD_INFO_PROMPT = """
+        Donne-moi des infos sur le mot {language} « {word} » :
 
-class OllamaClient:
-    """Handles communication with Ollama LLM."""
+        - Définition en français (courte phrase)
+        - Synonymes en {language}
+        - Exemple en {language}
 
-    def __init__(self, model: str = OLLAMA_MODEL, progress=None):
-        self.model = model
-        self.api_url = OLLAMA_API_URL
-        # S'assurer que le serveur Ollama est en cours d'exécution
-        OllamaServer.ensure_server_running(progress)
+        Supprime tout ce qui est entre parenthèses. Répond exactement dans ce format :
+
+        Définition : …  
+        Synonymes : …  
+        Exemple : …
+        """
+
+BATCH_WORD_INFO_PROMPT = """
+        Donne-moi des infos sur chacun des mots {language} suivants :
 
-    def generate_word_info(self, word: str, language: str) -> str:
-        """Generate definition, synonyms and example for a word."""
-        prompt = f"""
-        Donne-moi des infos sur le mot {language.lower()} « {word} » :
+{word_list}
 
+        Pour chaque mot :
         - Définition en français (courte phrase)
-        - Synonymes en {language.lower()}
-        - Exemple en {language.lower()}
+        - Synonymes en {language}
+        - Exemple en {language}
 
-        Supprime tout ce qui est entre parenthèses. Répond exactement dans ce format :
+        Supprime tout ce qui est entre parenthèses. Répond exactement dans ce format,
+        avec un bloc par mot, dans l'ordre, précédé de « ### » et du numéro du mot :
 
+        ### 1
         Définition : …  
         Synonymes : …  
         Exemple : …
         """
 
-        return self._ask_ollama(prompt)
 
-    def _ask_ollama(self, prompt: str) -> str:
-        """Send request to Ollama API."""
+def _prompt_version(template: str, profile: str) -> str:
+    """Hash a prompt template with the generation options of its profile."""
+    options = dict(OLLAMA_PROFILES[profile], num_ctx=OLLAMA_NUM_CTX)
+    raw = template + json.dumps(options, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+# Version du prompt : toute modification du modèle de prompt ou des options
+# du profil (température, stop, num_predict...) invalide le cache
+PROMPT_VERSION = _prompt_version(WORD_INFO_PROMPT, "word")
+BATCH_PROMPT_VERSION = _prompt_version(BATCH_WORD_INFO_PROMPT, "batch")
+
+
+class ResponseStream:
+    """Streamed LLM response, parsed incrementally while it is iterated.
+
+    L'itération s'arrête (et ferme la connexion, ce qui interrompt la
+    génération côté Ollama) dès que les trois lignes attendues sont reçues.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.parser = StreamingResponseParser()
+        self.started_at = time.perf_counter()
+        self.first_token_at = None
+        self.finished_at = None
+
+    def __iter__(self):
+        try:
+            for chunk in self._chunks:
+                if self.first_token_at is None:
+                    self.first_token_at = time.perf_counter()
+                accepted = self.parser.feed(chunk)
+                if accepted:
+                    yield accepted
+                if self.parser.is_complete:
+                    break
+        finally:
+            close = getattr(self._chunks, "close", None)
+            if close:
+                close()
+        self.parser.finish()
+        self.finished_at = time.perf_counter()
+
+    @property
+    def text(self) -> str:
+        """Response text received so far."""
+        return self.parser.text.strip()
+
+    @property
+    def time_to_first_token(self):
+        """Seconds between the request and the first chunk (None before it)."""
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+
+class BaseOllamaClient:
+    """State and request building shared by the blocking and asyncio Ollama clients.
+
+    Ne fait aucune entrée/sortie réseau : prompts, corps des requêtes,
+    cache des réponses et latences mesurées.
+    """
+
+    def __init__(self, model: str = OLLAMA_MODEL, cache=None, refresh_cache: bool = False):
+        self.model = model
+        self.api_url = OLLAMA_API_URL
+        # Cache optionnel des réponses (ResponseCache) ; refresh_cache ignore les entrées existantes
+        self.cache = cache
+        self.refresh_cache = refresh_cache
+        # Durées des requêtes de génération (secondes), dans l'ordre d'envoi
+        self._latencies = []
+
+    def latency_stats(self) -> dict:
+        """Return the first request latency apart from the steady-state ones.
+
+        La première requête inclut le chargement du modèle s'il n'était pas
+        déjà en VRAM ; les suivantes mesurent le régime établi.
+        """
+        latencies = list(self._latencies)
+        if not latencies:
+            return {"requests": 0, "first": None, "steady_mean": None, "steady_max": None}
+        steady = latencies[1:]
+        return {
+            "requests": len(latencies),
+            "first": latencies[0],
+            "steady_mean": sum(steady) / len(steady) if steady else None,
+            "steady_max": max(steady) if steady else None,
+        }
+
+    @staticmethod
+    def _word_prompt(word: str, language: str) -> str:
+        return WORD_INFO_PROMPT.format(language=language.lower(), word=word)
+
+    @staticmethod
+    def _batch_prompt(words: list, language: str) -> str:
+        word_list = "\n".join(
+            f"        {position}. « {word} »" for position, word in enumerate(words, 1))
+        return BATCH_WORD_INFO_PROMPT.format(
+            language=language.lower(), word_list=word_list)
+
+    def _get_cached(self, word: str, language: str):
+        """Look up the newest cached response produced by the single or batched prompt."""
+        if self.cache is None or self.refresh_cache:
+            return None
+        return self.cache.get_newest(
+            self.cache.make_key(self.model, language, word, version)
+            for version in (PROMPT_VERSION, BATCH_PROMPT_VERSION))
+
+    def remember_word_info(self, word: str, language: str, response: str):
+        """Cache an accepted response to the single-word prompt.
+
+        Une réponse incomplète (flux interrompu, ligne manquante) n'est pas
+        gardée : elle serait resservie telle quelle aux sessions suivantes.
+        """
+        if ResponseParser.is_complete_response(response):
+            self._put_cached(word, language, PROMPT_VERSION, response)
+
+    def _put_cached(self, word: str, language: str, prompt_version: str, response: str):
+        if self.cache is not None:
+            self.cache.put(self.cache.make_key(
+                self.model, language, word, prompt_version), response)
+
+    def _warm_up_payload(self) -> dict:
+        """Request body loading the model without generating anything."""
+        return {
+            "model": self.model,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": {"num_ctx": OLLAMA_NUM_CTX},
+        }
+
+    def _generate_payload(self, prompt: str, stream: bool, profile: str = "word",
+                          count: int = 1) -> dict:
+        options = dict(OLLAMA_PROFILES[profile], num_ctx=OLLAMA_NUM_CTX)
+        options["num_predict"] *= count
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": options,
+        }
+
+
+class OllamaClient(BaseOllamaClient):
+    """Handles communication with Ollama LLM.
+
+    Les requêtes sont réparties entre les serveurs de ``endpoints`` (voir
+    OllamaPool). Sans liste, le serveur local est démarré au besoin et
+    redémarré si la connexion est perdue ; des serveurs distants ne sont
+    que sondés, et une requête en échec est renvoyée à un autre serveur.
+    """
+
+    def __init__(self, model: str = OLLAMA_MODEL, progress=None, cache=None, refresh_cache: bool = False,
+                 endpoints=OLLAMA_ENDPOINTS):
+        super().__init__(model, cache, refresh_cache)
+        self.transport = get_transport()
+        self._warm_up_thread = None
+        self.local = not endpoints
+        if self.local:
+            # S'assurer que le serveur Ollama est en cours d'exécution
+            OllamaServer.ensure_server_running(progress)
+        self.pool = OllamaPool(endpoints, model)
+        self.pool.check_models()
+
+    def warm_up(self) -> float:
+        """Load the model into VRAM without generating anything.
+
+        Une requête sans prompt charge le modèle avec la fenêtre de contexte
+        et le keep_alive des vraies requêtes. Retourne la durée du chargement.
+        """
+        start = time.perf_counter()
+        endpoints = self.pool.available()
+        with span("llm.warm_up"), ThreadPoolExecutor(max_workers=max(1, len(endpoints))) as executor:
+            # Chaque serveur charge le modèle en même temps
+            for future in [executor.submit(self._warm_up_endpoint, endpoint)
+                           for endpoint in endpoints]:
+                future.result()
+        return time.perf_counter() - start
+
+    def _warm_up_endpoint(self, endpoint):
+        response = self.transport.post(endpoint.generate_url, "ollama_generate",
+                                       json=self._warm_up_payload(), retries=0)
+        response.raise_for_status()
+
+    def warm_up_async(self):
+        """Start loading the model in the background (session start)."""
+        if self._warm_up_thread is not None:
+            return
+
+        def warm_up():
+            try:
+                self.warm_up()
+            except Exception:
+                # La première vraie requête relèvera l'erreur
+                pass
+
+        self._warm_up_thread = threading.Thread(
+            target=warm_up, name="ollama-warm-up", daemon=True)
+        self._warm_up_thread.start()
+
+    def generate_word_info(self, word: str, language: str, refresh: bool = False,
+                           remember: bool = True) -> str:
+        """Generate definition, synonyms and example for a word.
+
+        Avec ``refresh=True`` le cache est ignoré et l'entrée est remplacée.
+        Avec ``remember=False`` la réponse n'est pas mise en cache : une
+        réponse soumise à relecture n'y est confiée (remember_word_info())
+        qu'une fois acceptée.
+        """
+        if not refresh:
+            cached = self._get_cached(word, language)
+            if cached is not None:
+                return cached
+
+        response = self._ask_ollama(self._word_prompt(word, language))
+
+        if remember:
+            self.remember_word_info(word, language, response)
+        return response
+
+    def stream_word_info(self, word: str, language: str, refresh: bool = False) -> ResponseStream:
+        """Stream the information of a word, token by token.
+
+        Une réponse en cache est renvoyée en un seul morceau. Une réponse
+        générée n'est pas mise en cache : l'appelant la confie à
+        remember_word_info() une fois qu'elle a été acceptée.
+        """
+        if not refresh:
+            cached = self._get_cached(word, language)
+            if cached is not None:
+                return ResponseStream(iter([cached]))
+
+        return ResponseStream(self._ask_ollama_stream(self._word_prompt(word, language)))
+
+    def generate_words_info(self, words: list, language: str, refresh: bool = False) -> list:
+        """Generate the information of several words with a single request.
+
+        Les réponses sont renvoyées dans l'ordre des mots. Un mot absent ou
+        mal formé dans la réponse groupée est redemandé individuellement.
+        """
+        responses = [None] * len(words)
+        if not refresh:
+            for index, word in enumerate(words):
+                responses[index] = self._get_cached(word, language)
+
+        missing = [index for index, response in enumerate(responses)
+                   if response is None]
+        if len(missing) > 1:
+            prompt = self._batch_prompt([words[index] for index in missing], language)
+            blocks = ResponseParser.split_batch_response(
+                self._ask_ollama(prompt, "batch", len(missing)), len(missing))
+            for position, index in enumerate(missing):
+                if position in blocks:
+                    responses[index] = blocks[position]
+                    self._put_cached(words[index], language,
+                                     BATCH_PROMPT_VERSION, blocks[position])
+
+        # Repli sur une requête par mot pour les réponses manquantes
+        for index, response in enumerate(responses):
+            if response is None:
+                responses[index] = self.generate_word_info(
+                    words[index], language, refresh=True)
+        return responses
+
+    def _ask_ollama(self, prompt: str, profile: str = "word", count: int = 1) -> str:
+        """Send request to Ollama API, on the least loaded server.
+
+        Une requête en échec est renvoyée aux serveurs disponibles pas encore
+        essayés ; quand il n'en reste plus, l'erreur de la dernière requête
+        est levée.
+        """
+        start = time.perf_counter()
+        tried = []
+        with span(f"llm.{profile}"):
+            while True:
+                try:
+                    endpoint = self.pool.acquire(exclude=tried)
+                except RuntimeError:
+                    # Plus aucun serveur à essayer : relever l'erreur de la dernière requête
+                    if tried:
+                        raise error from None
+                    raise
+                tried.append(endpoint)
+                sent_at = time.perf_counter()
+                ok = False
+                try:
+                    response = self._post_generate(endpoint, prompt, False, profile, count)
+                    response.raise_for_status()
+                    text = response.json()["response"]
+                    ok = True
+                    break
+                except requests.exceptions.RequestException as e:
+                    error = e
+                finally:
+                    # Toujours libérer le serveur, même sur une réponse mal formée
+                    self.pool.release(endpoint, time.perf_counter() - sent_at, ok=ok)
+        self._latencies.append(time.perf_counter() - start)
+        return text
+
+    def _ask_ollama_stream(self, prompt: str):
+        """Send a streaming request to Ollama and yield the generated tokens."""
+        start = time.perf_counter()
+        endpoint = self.pool.acquire()
+        failed = False
+
+        # Fermer la connexion interrompt la génération côté serveur
         try:
-            response = requests.post(self.api_url, json={
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False
-            })
-            response.raise_for_status()
-            return response.json()["response"]
-        except requests.exceptions.ConnectionError:
-            # Si la connexion échoue, essayer de redémarrer le serveur
-            print("⚠️ Connection to Ollama server lost, attempting to restart...")
-            OllamaServer.ensure_server_running()
-            # Réessayer la requête
-            response = requests.post(self.api_url, json={
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False
-            })
-            response.raise_for_status()
-            return response.json()["response"]
+            response = self._post_generate(endpoint, prompt, stream=True)
+            with span("llm.stream"), response:
+                response.raise_for_status()
+                # Ollama renvoie un objet JSON par ligne (NDJSON)
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        return
+        except requests.exceptions.RequestException:
+            failed = True
+            raise
+        finally:
+            # Flux terminé ou interrompu dès la réponse complète
+            elapsed = time.perf_counter() - start
+            self.pool.release(endpoint, elapsed, ok=not failed)
+            self._latencies.append(elapsed)
+
+    def _post_generate(self, endpoint, prompt: str, stream: bool, profile: str = "word",
+                       count: int = 1):
+        # Serveurs distants : pas de nouvelle tentative, la requête change de serveur
+        retry = {"on_retry": self._restart_server} if self.local else {"retries": 0}
+        return self.transport.post(
+            endpoint.generate_url, "ollama_generate",
+            json=self._generate_payload(prompt, stream, profile, count),
+            stream=stream, **retry)
+
+    @staticmethod
+    def _restart_server(attempt: int):
+        """Restart the Ollama server before retrying a failed connection."""
+        # Si la connexion échoue, essayer de redémarrer le serveur
+        print("⚠️ Connection to Ollama server lost, attempting to restart...")
+        OllamaServer.ensure_server_running()
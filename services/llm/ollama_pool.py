@@ -0,0 +1,164 @@
+"""Répartition des requêtes LLM entre plusieurs serveurs Ollama."""
+
+import threading
+import time
+
+import requests
+
+from config.settings import (OLLAMA_API_URL, OLLAMA_EJECT_SECONDS,
+                             OLLAMA_MAX_FAILURES)
+
+from ..http_transport import get_transport
+
+
+class OllamaEndpoint:
+    """One Ollama server of the pool and its request counters."""
+
+    def __init__(self, url: str):
+        # Accepte l'URL de base ou celle de /api/generate
+        self.base_url = url.rstrip("/").removesuffix("/api/generate")
+        self.generate_url = f"{self.base_url}/api/generate"
+        self.tags_url = f"{self.base_url}/api/tags"
+        self.models = set()
+        self.has_model = False
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.busy_seconds = 0.0
+        self.first_request_at = None
+        self.last_request_at = None
+        # Écarté jusqu'à cette date (time.monotonic()), None s'il est sain
+        self.ejected_until = None
+
+
+class OllamaPool:
+    """Dispatches LLM requests over several Ollama servers, least outstanding requests first.
+
+    Seuls les serveurs qui proposent le modèle (/api/tags) reçoivent des
+    requêtes. Un serveur en échec OLLAMA_MAX_FAILURES fois de suite est
+    écarté ; il est re-sondé après OLLAMA_EJECT_SECONDS, ou aussitôt si
+    plus aucun serveur n'est disponible, et réintégré s'il répond.
+    """
+
+    def __init__(self, urls, model: str,
+                 max_failures: int = OLLAMA_MAX_FAILURES,
+                 eject_seconds: float = OLLAMA_EJECT_SECONDS):
+        urls = list(urls) or [OLLAMA_API_URL]
+        self.endpoints = [OllamaEndpoint(url) for url in dict.fromkeys(urls)]
+        self.model = model
+        self.max_failures = max_failures
+        self.eject_seconds = eject_seconds
+        self.transport = get_transport()
+        self._lock = threading.Lock()
+
+    def check_models(self):
+        """Probe every endpoint and record whether it serves the model.
+
+        Un serveur injoignable est écarté. Lève RuntimeError si aucun
+        serveur ne propose le modèle.
+        """
+        for endpoint in self.endpoints:
+            self._probe(endpoint)
+        if not self.available():
+            raise RuntimeError(
+                f"Model {self.model} is not available on any Ollama server "
+                f"({', '.join(endpoint.base_url for endpoint in self.endpoints)})")
+
+    def available(self) -> list:
+        """Return the healthy endpoints serving the model."""
+        with self._lock:
+            return [endpoint for endpoint in self.endpoints
+                    if endpoint.has_model and endpoint.ejected_until is None]
+
+    def acquire(self, exclude=()) -> OllamaEndpoint:
+        """Reserve the healthy endpoint with the fewest outstanding requests.
+
+        À charge égale, le serveur qui a traité le moins de requêtes est
+        choisi. Les serveurs de ``exclude`` (déjà essayés pour cette requête)
+        sont ignorés. Lève RuntimeError si aucun serveur n'est disponible.
+        """
+        self._readmit(force=False)
+        if not self.available():
+            self._readmit(force=True)
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints
+                          if endpoint.has_model and endpoint.ejected_until is None
+                          and endpoint not in exclude]
+            if not candidates:
+                raise RuntimeError("No Ollama server available")
+            endpoint = min(candidates, key=lambda candidate: (
+                candidate.outstanding, candidate.requests))
+            endpoint.outstanding += 1
+            if endpoint.first_request_at is None:
+                endpoint.first_request_at = time.monotonic()
+            return endpoint
+
+    def release(self, endpoint: OllamaEndpoint, seconds: float, ok: bool):
+        """Record the outcome of a request sent to ``endpoint``."""
+        with self._lock:
+            endpoint.outstanding -= 1
+            endpoint.requests += 1
+            endpoint.busy_seconds += seconds
+            endpoint.last_request_at = time.monotonic()
+            if ok:
+                endpoint.consecutive_failures = 0
+                return
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.max_failures:
+                endpoint.ejected_until = time.monotonic() + self.eject_seconds
+
+    def stats(self) -> dict:
+        """Return the request counters and throughput of each endpoint.
+
+        ``requests_per_minute`` est calculé entre la première et la dernière
+        requête du serveur.
+        """
+        with self._lock:
+            stats = {}
+            for endpoint in self.endpoints:
+                elapsed = 0.0
+                if endpoint.first_request_at is not None and endpoint.last_request_at is not None:
+                    elapsed = endpoint.last_request_at - endpoint.first_request_at
+                stats[endpoint.base_url] = {
+                    "requests": endpoint.requests,
+                    "failures": endpoint.failures,
+                    "outstanding": endpoint.outstanding,
+                    "has_model": endpoint.has_model,
+                    "ejected": endpoint.ejected_until is not None,
+                    "mean_seconds": (endpoint.busy_seconds / endpoint.requests
+                                     if endpoint.requests else None),
+                    "requests_per_minute": (endpoint.requests / elapsed * 60
+                                            if elapsed > 0 else None),
+                }
+            return stats
+
+    def _readmit(self, force: bool):
+        """Health-check the ejected endpoints whose ejection delay is over (all if ``force``)."""
+        now = time.monotonic()
+        with self._lock:
+            due = [endpoint for endpoint in self.endpoints
+                   if endpoint.ejected_until is not None
+                   and (force or endpoint.ejected_until <= now)]
+            # Un seul thread sonde un serveur donné
+            for endpoint in due:
+                endpoint.ejected_until = now + self.eject_seconds
+        for endpoint in due:
+            self._probe(endpoint)
+
+    def _probe(self, endpoint: OllamaEndpoint):
+        """Query /api/tags: readmit the endpoint if it answers, eject it otherwise."""
+        try:
+            response = self.transport.get(endpoint.tags_url, "ollama_tags", retries=0)
+            response.raise_for_status()
+            models = {model.get("name") for model in response.json().get("models", [])}
+        except (requests.exceptions.RequestException, ValueError):
+            with self._lock:
+                endpoint.ejected_until = time.monotonic() + self.eject_seconds
+            return
+        with self._lock:
+            endpoint.models = models
+            endpoint.has_model = self.model in models or f"{self.model}:latest" in models
+            endpoint.ejected_until = None
+            endpoint.consecutive_failures = 0
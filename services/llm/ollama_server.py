@@ -2,11 +2,13 @@
 
 import subprocess
 import sys
-import time
 
 import requests
 
-from config.settings import OLLAMA_API_URL
+from config.settings import OLLAMA_API_URL, STARTUP_TIMEOUT
+from utils.polling import wait_until_ready
+
+from ..http_transport import get_transport
 
 
 class OllamaServer:
@@ -16,12 +18,17 @@ class OllamaServer:
     def is_server_running() -> bool:
         """Vérifier si le serveur Ollama est en cours d'exécution."""
         try:
-            response = requests.get(
-                f"{OLLAMA_API_URL.replace('/api/generate', '')}/api/tags", timeout=3)
+            response = get_transport().get(
+                OllamaServer.tags_url(), "ollama_tags", retries=0)
             return response.status_code == 200
         except requests.exceptions.RequestException:
             return False
 
+    @staticmethod
+    def tags_url() -> str:
+        """URL de la liste des modèles, utilisée pour sonder le serveur."""
+        return f"{OLLAMA_API_URL.replace('/api/generate', '')}/api/tags"
+
     @staticmethod
     def start_server(progress=None):
         """Démarrer le serveur Ollama si nécessaire."""
@@ -36,27 +43,7 @@ class OllamaServer:
             else:
                 print("🚀 Starting Ollama server...")
 
-            # Démarrer Ollama en arrière-plan
-            if sys.platform == "win32":
-                # Sur Windows, utiliser start pour démarrer en arrière-plan
-                subprocess.Popen(
-                    ["ollama", "serve"],
-                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS,
-                    stdin=subprocess.DEVNULL,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    shell=False
-                )
-            else:
-                # Sur Unix/Linux/Mac
-                subprocess.Popen(
-                    ["ollama", "serve"],
-                    start_new_session=True,
-                    stdin=subprocess.DEVNULL,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    close_fds=Truee
-                )
+            OllamaServer.launch()
 
             # Attendre que le serveur soit disponible
             OllamaServer._wait_for_server(progress)
@@ -78,6 +65,31 @@ Download from: https://ollama.ai/"""
                 print(error_msg)
             raise RuntimeError(f"Failed to start Ollama server: {str(e)}")
 
+    @staticmethod
+    def launch():
+        """Lancer ``ollama serve`` en arrière-plan, sans attendre qu'il réponde."""
+        # Démarrer Ollama en arrière-plan
+        if sys.platform == "win32":
+            # Sur Windows, utiliser start pour démarrer en arrière-plan
+            subprocess.Popen(
+                ["ollama", "serve"],
+                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                shell=False
+            )
+        else:
+            # Sur Unix/Linux/Mac
+            subprocess.Popen(
+                ["ollama", "serve"],
+                start_new_session=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=True
+            )
+
     @staticmethod
     def _wait_for_server(progress=None):
         """Attendre que le serveur Ollama soit disponible."""
@@ -86,18 +98,12 @@ Download from: https://ollama.ai/"""
         else:
             print("⏳ Waiting for Ollama server to be available...")
 
-        max_attempts = 30  # Maximum 60 secondes d'attente
-        attempts = 0
-
-        while not OllamaServer.is_server_running() and attempts < max_attempts:
+        def on_wait(attempt, delay):
             if not progress:
-                print(
-                    f"⏳ Ollama server not available, waiting... (attempt {attempts + 1}/{max_attempts})")
-            time.sleep(2)
-            attempts += 1
+                print(f"⏳ Ollama server not available, retrying in {delay:.1f}s... (attempt {attempt})")
 
-        if attempts >= max_attempts:
-            error_msg = "❌ Timeout: Ollama server did not become available within 60 seconds"
+        if not wait_until_ready(OllamaServer.is_server_running, on_wait=on_wait):
+            error_msg = f"❌ Timeout: Ollama server did not become available within {STARTUP_TIMEOUT} seconds"
             if progress:
                 progress.set_description(error_msg)
             else:
@@ -0,0 +1,105 @@
+"""Cache persistant des réponses LLM."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Optional
+
+from config.settings import (LLM_CACHE_MAX_ENTRIES, LLM_CACHE_PATH,
+                             LLM_CACHE_TTL)
+
+
+class ResponseCache:
+    """SQLite store of LLM responses with TTL and size-bounded LRU eviction.
+
+    Les entrées sont indexées par modèle, langue, mot normalisé et version
+    du prompt : modifier le prompt invalide donc automatiquement le cache.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES,
+                 ttl: float = LLM_CACHE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Partagé entre les threads du pipeline, protégé par self._lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )""")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+
+    @staticmethod
+    def normalize_word(word: str) -> str:
+        """Normalize a word so trivial variants share the same entry."""
+        return " ".join(unicodedata.normalize("NFC", word).casefold().split())
+
+    @staticmethod
+    def make_key(model: str, language: str, word: str, prompt_version: str) -> str:
+        """Build the cache key of a request."""
+        raw = "\x1f".join([model, language.casefold(),
+                           ResponseCache.normalize_word(word), prompt_version])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None if missing or expired."""
+        return self.get_newest([key])
+
+    def get_newest(self, keys) -> Optional[str]:
+        """Return the most recently stored response among ``keys``, or None.
+
+        Sert quand une même réponse peut provenir de plusieurs prompts : la
+        plus récente l'emporte, quel que soit l'ordre des clés.
+        """
+        keys = list(keys)
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT key, response, created_at FROM responses "
+                f"WHERE key IN ({', '.join('?' * len(keys))})", keys).fetchall()
+            if self.ttl:
+                expired = [(key,) for key, _, created_at in rows if now - created_at > self.ttl]
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", expired)
+                rows = [row for row in rows if now - row[2] <= self.ttl]
+            if not rows:
+                return None
+            key, response, _ = max(rows, key=lambda row: row[2])
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return response
+
+    def put(self, key: str, response: str):
+        """Store (or overwrite) a response and evict old entries."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)", (key, response, now, now))
+            if self.ttl:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            # Supprimer les entrées les moins récemment utilisées au-delà de la limite
+            self._conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )""", (self.max_entries,))
+
+    def close(self):
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
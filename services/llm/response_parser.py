@@ -0,0 +1,96 @@
+"""Découpage des réponses du LLM, au format imposé par les prompts du client Ollama."""
+
+import re
+
+# En-tête d'un bloc dans une réponse groupée : "### 3" ou "### 3. mot"
+_BATCH_HEADER = re.compile(r"^\s*#{2,}\s*(\d+)\b")
+
+# Définition, synonymes et exemple
+EXPECTED_LINES = 3
+
+
+class ResponseParser:
+    """Splits LLM responses into their definition, synonyms and example lines."""
+
+    @staticmethod
+    def lines(response: str) -> list:
+        """Return the non-empty lines of a response, stripped."""
+        return [line.strip() for line in response.split("\n") if line.strip()]
+
+    @staticmethod
+    def is_complete_response(response: str) -> bool:
+        """Check that a response contains a definition, synonyms and an example."""
+        return len(ResponseParser.lines(response)) >= EXPECTED_LINES
+
+    @staticmethod
+    def split_batch_response(response: str, count: int) -> dict:
+        """Split a multi-word response into per-word responses.
+
+        Retourne un dictionnaire {position du mot (0-based): réponse} ; les
+        mots absents ou dont le bloc est incomplet ne figurent pas dans le
+        résultat.
+        """
+        blocks = {}
+        current = None
+        for line in response.split("\n"):
+            match = _BATCH_HEADER.match(line)
+            if match:
+                current = int(match.group(1)) - 1
+                blocks[current] = []
+            elif current is not None:
+                blocks[current].append(line)
+
+        return {
+            index: "\n".join(lines).strip()
+            for index, lines in blocks.items()
+            if 0 <= index < count and ResponseParser.is_complete_response("\n".join(lines))
+        }
+
+
+class StreamingResponseParser:
+    """Incremental parser recognising the response lines in streamed LLM tokens.
+
+    Les lignes sont reconnues au fil de l'eau ; une fois la définition, les
+    synonymes et l'exemple complets, le reste de la génération est ignoré.
+    """
+
+    EXPECTED_LINES = EXPECTED_LINES
+
+    def __init__(self):
+        self.lines = []
+        self._partial = ""
+        self._accepted = []
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the three expected lines have been received."""
+        return len(self.lines) >= self.EXPECTED_LINES
+
+    @property
+    def text(self) -> str:
+        """Text accepted so far (trailing chatter excluded)."""
+        return "".join(self._accepted)
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk and return the part of it that belongs to the response."""
+        accepted = []
+        for piece in chunk.splitlines(keepends=True):
+            if self.is_complete:
+                break
+            accepted.append(piece)
+            self._partial += piece
+            if piece.endswith(("\n", "\r")):
+                line = self._partial.strip()
+                self._partial = ""
+                if line:
+                    self.lines.append(line)
+        text = "".join(accepted)
+        self._accepted.append(text)
+        return text
+
+    def finish(self):
+        """Flush the last line when the stream ends without a newline."""
+        line = self._partial.strip()
+        self._partial = ""
+        if line and not self.is_complete:
+            self.lines.append(line)
@@ -0,0 +1,46 @@
+"""Démarrage parallèle des services externes (Anki et Ollama)."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.metrics import span
+
+from .anki.client import AnkiClient
+from .llm.ollama_server import OllamaServer
+
+
+class ServiceStarter:
+    """Brings Anki and Ollama up concurrently and measures their time-to-ready."""
+
+    SERVICES = {
+        "Ollama": OllamaServer.ensure_server_running,
+        "Anki": AnkiClient.ensure_server_running,
+    }
+
+    @staticmethod
+    def start_all(progress=None, skip=()) -> dict:
+        """Start every service that is not running and wait until all are ready.
+
+        Un démarrage à froid attend le plus lent des deux services au lieu
+        de leur somme. Retourne le temps de disponibilité de chaque service
+        en secondes ; si un service échoue, l'autre termine son démarrage
+        avant que l'erreur ne soit relevée. Les services de ``skip`` (ex.
+        "Ollama" avec des serveurs distants) ne sont pas démarrés.
+        """
+        services = {name: ensure_running for name, ensure_running
+                    in ServiceStarter.SERVICES.items() if name not in skip}
+        if progress:
+            progress.set_description("Starting Anki and Ollama")
+
+        def bring_up(name, ensure_running):
+            start = time.perf_counter()
+            with span(f"startup.{name.lower()}"):
+                ensure_running(progress)
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=len(services)) as executor:
+            futures = {name: executor.submit(bring_up, name, ensure_running)
+                       for name, ensure_running in services.items()}
+
+        # Tous les démarrages sont terminés à la sortie du bloc
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,157 @@
+"""Tests des clients asyncio AnkiConnect et Ollama (serveurs factices locaux)."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from benchmarks.fakes import FakeAnki, FakeOllama  # noqa: E402
+from services.anki import async_client  # noqa: E402
+from services.anki.async_client import AsyncAnkiClient  # noqa: E402
+from services.llm.async_ollama_client import AsyncOllamaClient  # noqa: E402
+from services.llm.response_cache import ResponseCache  # noqa: E402
+
+
+@pytest.fixture
+def anki():
+    server = FakeAnki().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def ollama():
+    server = FakeOllama().start()
+    yield server
+    server.stop()
+
+
+def _card(word: str, deck_name: str = "Anglais") -> dict:
+    return {
+        "deck_name": deck_name,
+        "front_content": f"{word} [sound:word-{word}.wav]",
+        "back_content": f"définition de {word}",
+        "media_files": {f"word-{word}.wav": word.encode("utf-8"), "shared.wav": b"shared"},
+    }
+
+
+class RecordingAnkiClient(AsyncAnkiClient):
+    """Async client keeping the actions of each multi request."""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    async def multi(self, actions: list) -> list:
+        self.sent.append([action["action"] for action in actions])
+        return await super().multi(actions)
+
+
+def _anki_client(server) -> RecordingAnkiClient:
+    client = RecordingAnkiClient()
+    client.api_url = server.url
+    return client
+
+
+def test_submit_cards_maps_one_result_per_card(anki):
+    client = _anki_client(anki)
+
+    async def submit():
+        async with client:
+            first = await client.submit_cards([_card("house"), _card("tree")])
+            second = await client.submit_cards([_card("car")])
+            return first, second
+
+    first, second = asyncio.run(submit())
+
+    assert first == [{"result": 1, "error": None}, {"result": 2, "error": None}]
+    assert second == [{"result": 3, "error": None}]
+    # Deck créé une seule fois ; un média déjà stocké n'est pas renvoyé par la requête suivante
+    assert client.sent == [
+        ["createDeck", "storeMediaFile", "storeMediaFile", "addNote",
+         "storeMediaFile", "storeMediaFile", "addNote"],
+        ["storeMediaFile", "addNote"],
+    ]
+    assert anki.media == {"word-house.wav", "word-tree.wav", "word-car.wav", "shared.wav"}
+
+
+def test_submit_cards_reports_note_errors(anki):
+    anki.failure_rate = 1.0
+
+    async def submit():
+        async with _anki_client(anki) as client:
+            return await client.submit_cards([_card("house")])
+
+    assert asyncio.run(submit()) == [{"result": None, "error": "injected failure"}]
+
+
+def test_add_media_file(anki, tmp_path):
+    path = tmp_path / "clip.wav"
+    path.write_bytes(b"RIFF")
+
+    async def add():
+        async with _anki_client(anki) as client:
+            await client.add_media_file("from-path.wav", str(path))
+            await client.add_media_file("from-bytes.wav", b"RIFF")
+
+    asyncio.run(add())
+    assert anki.media == {"from-path.wav", "from-bytes.wav"}
+
+
+def test_ensure_server_running_does_not_launch_a_running_anki(anki, monkeypatch):
+    launches = []
+    monkeypatch.setattr(async_client.AnkiLauncher, "start_anki_silent",
+                        lambda progress: launches.append(progress))
+
+    async def ensure():
+        client = _anki_client(anki)
+        try:
+            await client.ensure_server_running(timeout=1)
+        finally:
+            await client.close()
+
+    asyncio.run(ensure())
+    assert launches == []
+
+
+def test_ensure_server_running_launches_anki_and_times_out(anki, monkeypatch):
+    launches = []
+    monkeypatch.setattr(async_client.AnkiLauncher, "start_anki_silent",
+                        lambda progress: launches.append(progress))
+    url = anki.url
+    anki.stop()
+
+    async def ensure():
+        client = AsyncAnkiClient()
+        client.api_url = url
+        try:
+            await client.ensure_server_running(timeout=0.3)
+        finally:
+            await client.close()
+
+    with pytest.raises(RuntimeError, match="timeout"):
+        asyncio.run(ensure())
+    assert launches == [None]
+
+
+def test_generate_words_info_batches_the_uncached_words(ollama, tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm_cache.sqlite3"))
+    cached = "Définition : en cache\nSynonymes : tree\nExemple : A tree."
+
+    async def generate():
+        client = AsyncOllamaClient(cache=cache)
+        client.api_url = f"{ollama.url}/api/generate"
+        client.remember_word_info("tree", "anglais", cached)
+        try:
+            return await client.generate_words_info(["house", "tree", "car"], "anglais")
+        finally:
+            await client.close()
+
+    responses = asyncio.run(generate())
+
+    assert responses[1] == cached
+    assert "définition de house" in responses[0]
+    assert "définition de car" in responses[2]
+    # Une seule requête groupée pour les deux mots absents du cache
+    assert ollama.calls["generate"] == 1
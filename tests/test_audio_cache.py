@@ -0,0 +1,42 @@
+"""Tests du cache disque des clips audio."""
+
+import os
+
+import pytest
+
+from services.audio.audio_cache import AudioCache
+
+
+def test_evicts_least_recently_used_down_to_low_water(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=1000, low_water=0.5)
+    for key in "abcd":
+        cache.put(key, b"x" * 250)
+    # Lire "a" le rend plus récent que "b", "c" et "d"
+    assert cache.get("a") == b"x" * 250
+
+    cache.put("e", b"x" * 250)
+
+    assert cache.stats()["bytes"] == 500
+    assert cache.stats()["evictions"] == 3
+    assert sorted(os.listdir(tmp_path)) == ["a.wav", "e.wav"]
+
+
+def test_index_is_loaded_from_disk(tmp_path):
+    AudioCache(str(tmp_path)).put("a", b"x" * 100)
+    cache = AudioCache(str(tmp_path))
+    assert cache.stats()["bytes"] == 100
+    assert cache.get("a") == b"x" * 100
+    assert cache.get("b") is None
+
+
+def test_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    cache = AudioCache(str(tmp_path))
+
+    def fail(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        cache.put("a", b"x" * 100)
+    assert os.listdir(tmp_path) == []
+    assert cache.stats()["bytes"] == 0
@@ -0,0 +1,35 @@
+"""Tests de l'analyse des arguments de ligne de commande."""
+
+import sys
+
+import pytest
+
+from app.cli import parse_arguments
+
+
+def _parse(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["anki-create.py", *argv])
+    return parse_arguments()
+
+
+def test_daemon_positional_is_preload_language(monkeypatch):
+    args = _parse(monkeypatch, "--daemon", "espagnol")
+    assert args.language == "espagnol"
+    assert args.words is None
+
+
+def test_daemon_defaults_to_english(monkeypatch):
+    args = _parse(monkeypatch, "--daemon")
+    assert args.language == "Anglais"
+    assert args.words is None
+
+
+def test_daemon_rejects_words(monkeypatch):
+    with pytest.raises(SystemExit):
+        _parse(monkeypatch, "--daemon", "hola", "espagnol")
+
+
+def test_words_and_language(monkeypatch):
+    args = _parse(monkeypatch, "hola", "espagnol")
+    assert args.words == "hola"
+    assert args.language == "espagnol"
@@ -0,0 +1,82 @@
+"""Tests du démon : mise en cache des réponses relues (serveur Ollama factice)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.daemon import CardDaemon
+from benchmarks.fakes import FakeOllama
+from config.settings import OLLAMA_MODEL
+from services.llm.ollama_client import OllamaClient
+from services.llm.response_cache import ResponseCache
+
+
+class FakeCardCreator:
+    def __init__(self):
+        self.submitted = []
+
+    def reset_duplicate_index(self):
+        pass
+
+    def split_new_words(self, words, language):
+        return list(words), []
+
+    def synthesize_card_audio(self, word, word_info, language):
+        return b"word", b"example"
+
+    def submit_card(self, word, word_info, language, word_audio, example_audio):
+        self.submitted.append(word)
+
+
+@pytest.fixture
+def server():
+    server = FakeOllama().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def daemon(server, tmp_path):
+    client = OllamaClient(cache=ResponseCache(str(tmp_path / "llm_cache.sqlite3")),
+                          endpoints=[server.url])
+    daemon = CardDaemon()
+    daemon._sessions[OLLAMA_MODEL] = SimpleNamespace(
+        llm_client=client, card_creator=FakeCardCreator(),
+        audio_generator=SimpleNamespace(preload_async=lambda language_code: None))
+    return daemon
+
+
+def _request(daemon, *choices, **options):
+    """Process one request for 'maison', answering the reviews with ``choices``."""
+    events = []
+    answers = iter({"choice": choice} for choice in choices)
+    daemon.process(dict(words=["maison"], language="anglais", **options),
+                   events.append, lambda: next(answers, None))
+    return events
+
+
+def _client(daemon):
+    return daemon._sessions[OLLAMA_MODEL].llm_client
+
+
+def test_rejected_response_is_not_served_again(daemon, server):
+    events = _request(daemon, "n")
+    assert any(event["event"] == "skipped" for event in events)
+    assert _client(daemon)._get_cached("maison", "anglais") is None
+
+    # La nouvelle demande interroge le LLM au lieu de resservir la réponse refusée
+    _request(daemon, "r", "y")
+    assert server.calls["generate"] == 3
+    assert _client(daemon)._get_cached("maison", "anglais") is not None
+    assert daemon._sessions[OLLAMA_MODEL].card_creator.submitted == ["maison"]
+
+
+def test_no_cache_neither_reads_nor_writes_the_cache(daemon):
+    _client(daemon).remember_word_info(
+        "maison", "anglais", "Définition : ancienne\nSynonymes : a\nExemple : a")
+
+    events = _request(daemon, "y", no_cache=True)
+
+    review = next(event for event in events if event["event"] == "review")
+    assert "ancienne" not in review["response"]
+    assert "ancienne" in _client(daemon)._get_cached("maison", "anglais")
@@ -0,0 +1,51 @@
+"""Tests des nouvelles tentatives du transport HTTP partagé."""
+
+import socket
+import threading
+
+import pytest
+import requests
+
+from services.http_transport import HttpTransport
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_refused_connection_is_retried():
+    transport = HttpTransport(max_retries=2, backoff=0)
+    attempts = []
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.post(f"http://127.0.0.1:{_free_port()}", "anki", json={},
+                       on_retry=attempts.append)
+    assert attempts == [1, 2]
+
+
+def test_connection_dropped_after_sending_is_not_retried():
+    # Le serveur lit la requête puis ferme la connexion sans répondre
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    received = []
+
+    def serve():
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            received.append(connection.recv(65536))
+            connection.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    transport = HttpTransport(max_retries=2, backoff=0)
+    try:
+        with pytest.raises(requests.exceptions.ConnectionError):
+            transport.post(f"http://127.0.0.1:{server.getsockname()[1]}", "anki",
+                           json={"action": "addNote"})
+    finally:
+        server.close()
+    assert len(received) == 1
@@ -0,0 +1,38 @@
+"""Tests du journal des étapes terminées (reprise avec --resume)."""
+
+import time
+
+from core.job_journal import JobJournal
+from core.models import WordInfo
+
+WORD_INFO = WordInfo(definition="définition", synonyms="synonymes", example="exemple")
+
+
+def _record(journal, word, note_id=None):
+    journal.record_responses([(word, "anglais", (), "réponse", WORD_INFO)])
+    if note_id is not None:
+        journal.record_notes([(word, "anglais", note_id)])
+
+
+def test_pending_entries_skip_finished_words(tmp_path):
+    journal = JobJournal(str(tmp_path / "jobs.sqlite3"))
+    _record(journal, "house", note_id=1)
+    _record(journal, "tree")
+    assert [entry.word for entry in journal.pending_entries()] == ["tree"]
+    journal.close()
+
+
+def test_unfinished_words_expire_after_ttl(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    journal = JobJournal(path, ttl=60)
+    _record(journal, "house", note_id=1)
+    _record(journal, "tree")
+    # Dernière étape il y a deux minutes
+    with journal._conn:
+        journal._conn.execute("UPDATE jobs SET updated_at = ?", (time.time() - 120,))
+    journal.close()
+
+    journal = JobJournal(path, ttl=60)
+    assert journal.pending_entries() == []
+    assert journal.get("anglais", "house") is None
+    journal.close()
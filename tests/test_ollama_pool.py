@@ -0,0 +1,154 @@
+"""Tests de la répartition des requêtes entre plusieurs serveurs Ollama (serveurs factices locaux)."""
+
+import time
+
+import pytest
+import requests
+
+from benchmarks.fakes import FakeOllama
+from services.llm.ollama_client import OllamaClient
+from services.llm.ollama_pool import OllamaPool
+
+MODEL = "gemma3:12b"
+
+
+class MalformedOllama(FakeOllama):
+    """Fake server answering /api/generate with a body lacking "response"."""
+
+    def _respond(self, handler, method, body):
+        if method == "POST" and body.get("prompt"):
+            self.count("generate")
+            self.send_json(handler, {"done": True})
+            return
+        super()._respond(handler, method, body)
+
+
+@pytest.fixture
+def servers():
+    started = []
+
+    def start(server_class=FakeOllama, **kwargs):
+        server = server_class(**kwargs).start()
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.stop()
+
+
+def test_least_outstanding_dispatch(servers):
+    first, second = servers(), servers()
+    pool = OllamaPool([first.url, second.url], MODEL)
+    pool.check_models()
+
+    busy = pool.acquire()
+    # Le serveur occupé n'est pas choisi tant que l'autre est libre
+    other = pool.acquire()
+    assert other is not busy
+    pool.release(other, 0.1, ok=True)
+    assert pool.acquire() is other
+
+    # À charge égale, le serveur qui a traité le moins de requêtes est choisi
+    pool.release(busy, 0.1, ok=True)
+    pool.release(other, 0.1, ok=True)
+    pool.release(pool.acquire(), 0.1, ok=True)
+    assert {endpoint.requests for endpoint in pool.endpoints} == {2}
+
+
+def test_server_without_model_gets_no_traffic(servers):
+    serving, other = servers(), servers(models=("llama3",))
+    client = OllamaClient(model=MODEL, endpoints=[serving.url, other.url])
+    for index in range(4):
+        client.generate_word_info(f"word{index}", "anglais")
+
+    assert [endpoint.base_url for endpoint in client.pool.available()] == [serving.url]
+    assert serving.calls["generate"] == 4
+    assert "generate" not in other.calls
+    assert client.pool.stats()[other.url]["has_model"] is False
+
+
+def test_ejection_and_readmission(servers):
+    healthy, failing = servers(), servers()
+    pool = OllamaPool([healthy.url, failing.url], MODEL, max_failures=2, eject_seconds=0.2)
+    pool.check_models()
+    endpoints = {endpoint.base_url: endpoint for endpoint in pool.endpoints}
+
+    for _ in range(2):
+        endpoint = pool.acquire(exclude=[endpoints[healthy.url]])
+        pool.release(endpoint, 0.01, ok=False)
+    assert pool.stats()[failing.url]["ejected"]
+    assert pool.available() == [endpoints[healthy.url]]
+
+    # Le serveur écarté est re-sondé (/api/tags) après eject_seconds
+    time.sleep(0.25)
+    pool.acquire()
+    assert not pool.stats()[failing.url]["ejected"]
+    assert failing.calls["tags"] == 2
+
+
+def test_failed_request_goes_to_another_server(servers):
+    healthy, failing = servers(), servers(failure_rate=1.0)
+    client = OllamaClient(model=MODEL, endpoints=[failing.url, healthy.url])
+    client.pool.max_failures = 100
+    # Le serveur en échec reste le moins sollicité : sans exclusion, il serait choisi à nouveau
+    client.pool.endpoints[1].requests = 50
+
+    for index in range(3):
+        client.generate_word_info(f"word{index}", "anglais")
+
+    # Une tentative par serveur et par requête
+    assert failing.calls["generate"] == 3
+    assert healthy.calls["generate"] == 3
+
+
+def test_malformed_response_releases_the_server(servers):
+    server = servers(MalformedOllama)
+    client = OllamaClient(model=MODEL, endpoints=[server.url])
+
+    with pytest.raises(KeyError):
+        client.generate_word_info("word", "anglais")
+
+    stats = client.pool.stats()[server.url]
+    assert stats["outstanding"] == 0
+    assert stats["failures"] == 1
+
+
+def test_last_request_error_is_raised_when_no_server_is_left(servers, monkeypatch):
+    failing, other = servers(failure_rate=1.0), servers()
+    client = OllamaClient(model=MODEL, endpoints=[failing.url, other.url])
+    client.pool.endpoints[1].requests = 50
+    release = client.pool.release
+
+    def release_and_lose_other(endpoint, seconds, ok):
+        # L'autre serveur tombe pendant la requête (écarté par un autre thread)
+        other.stop()
+        client.pool.endpoints[1].ejected_until = time.monotonic() + 60
+        release(endpoint, seconds, ok)
+
+    monkeypatch.setattr(client.pool, "release", release_and_lose_other)
+
+    # L'erreur de la requête, et non « No Ollama server available »
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.generate_word_info("word", "anglais")
+    assert failing.calls["generate"] == 1
+    assert client.pool.endpoints[0].outstanding == 0
+
+
+def test_stats(servers):
+    server = servers()
+    pool = OllamaPool([server.url], MODEL)
+    pool.check_models()
+
+    endpoint = pool.acquire()
+    assert pool.stats()[server.url]["outstanding"] == 1
+    pool.release(endpoint, 0.2, ok=True)
+    pool.release(pool.acquire(), 0.4, ok=False)
+
+    stats = pool.stats()[server.url]
+    assert stats["requests"] == 2
+    assert stats["failures"] == 1
+    assert stats["outstanding"] == 0
+    assert stats["ejected"] is False
+    assert stats["mean_seconds"] == pytest.approx(0.3)
+    assert stats["requests_per_minute"] > 0
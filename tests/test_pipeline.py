@@ -0,0 +1,104 @@
+"""Tests du pipeline concurrent du mode lot (services remplacés par des objets factices)."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from core.models import WordEntry
+from core.pipeline import CardPipeline
+
+
+class FakeLLM:
+    def __init__(self, failing_decks=()):
+        self.failing_decks = set(failing_decks)
+
+    def _response(self, word, language):
+        if language in self.failing_decks:
+            raise RuntimeError(f"LLM down for {language}")
+        return f"Définition : {word}\nSynonymes : {word}\nExemple : {word}"
+
+    def generate_word_info(self, word, language):
+        return self._response(word, language)
+
+    def generate_words_info(self, words, language):
+        return [self._response(word, language) for word in words]
+
+
+class FakeCardCreator:
+    def __init__(self):
+        self.submitted = []
+        self.decks = []
+
+    def __getattr__(self, name):
+        # Toute autre méthode de CardCreator (ex. création de deck) est inattendue
+        raise AssertionError(f"unexpected CardCreator.{name}")
+
+    def synthesize_cards_audio(self, cards):
+        return [(b"word" * 1000, b"example" * 1000) for _ in cards]
+
+    def submit_cards(self, cards):
+        self.submitted += [word for word, *_ in cards]
+        self.decks += [deck_name for _, _, deck_name, *_ in cards]
+        return [{"result": index, "error": None} for index, _ in enumerate(cards)]
+
+
+def _session(failing_decks=()):
+    return SimpleNamespace(llm_client=FakeLLM(failing_decks), card_creator=FakeCardCreator(),
+                           journal=None)
+
+
+def test_jobs_are_yielded_in_order_without_their_clips():
+    session = _session()
+    pipeline = CardPipeline(session, "anglais", llm_workers=2, tts_workers=2,
+                            anki_workers=2, queue_size=2)
+    entries = [WordEntry(f"word{index}", "anglais") for index in range(20)]
+
+    jobs = list(pipeline.run(entries))
+
+    assert [job.index for job in jobs] == list(range(20))
+    assert sorted(session.card_creator.submitted) == sorted(entry.word for entry in entries)
+    assert all(job.error is None and job.result is not None for job in jobs)
+    assert all(job.word_audio is None and job.example_audio is None for job in jobs)
+
+
+def test_workers_exit_after_stop():
+    release = threading.Event()
+
+    def entries():
+        yield WordEntry("word0", "anglais")
+        # Entrée lente : les workers attendent le mot suivant
+        release.wait()
+
+    pipeline = CardPipeline(_session(), "anglais")
+    jobs = pipeline.run(entries())
+    assert next(jobs).word == "word0"
+    jobs.close()
+
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline and any(
+            thread.name.startswith("pipeline-") for thread in threading.enumerate()):
+        time.sleep(0.05)
+    release.set()
+    assert not [thread.name for thread in threading.enumerate()
+                if thread.name.startswith("pipeline-")]
+
+
+def test_llm_error_only_fails_the_jobs_of_its_deck():
+    session = _session(failing_decks=["espagnol"])
+    pipeline = CardPipeline(session, "anglais", llm_batch_size=8, queue_size=8)
+    entries = [WordEntry(f"word{index}", "espagnol" if index % 2 else "anglais")
+               for index in range(8)]
+
+    jobs = list(pipeline.run(entries))
+
+    assert [job.error is not None for job in jobs] == [index % 2 == 1 for index in range(8)]
+    assert session.card_creator.submitted == [f"word{index}" for index in range(0, 8, 2)]
+
+
+def test_only_the_decks_of_the_entries_are_used():
+    session = _session()
+    pipeline = CardPipeline(session, "anglais")
+
+    list(pipeline.run([WordEntry("palabra", "espagnol")]))
+
+    assert session.card_creator.decks == ["espagnol"]
@@ -0,0 +1,130 @@
+"""Tests de la génération anticipée et de la mise en cache des réponses relues."""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+from tqdm import tqdm
+
+from app.main import _query_word_info
+from benchmarks.fakes import FakeOllama
+from core.prefetcher import ResponsePrefetcher
+from services.llm.ollama_client import OllamaClient, ResponseStream
+from services.llm.response_cache import ResponseCache
+
+
+class RecordingClient:
+    """OllamaClient wrapper logging the streamed requests and signalling their end."""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+        self.finished = threading.Semaphore(0)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def stream_word_info(self, word, language, refresh=False):
+        self.calls.append((word, language, refresh))
+        return ResponseStream(self._signal(self.client.stream_word_info(word, language, refresh)))
+
+    def _signal(self, stream):
+        try:
+            yield from stream
+        finally:
+            self.finished.release()
+
+
+@pytest.fixture
+def client(tmp_path):
+    server = FakeOllama().start()
+    cache = ResponseCache(str(tmp_path / "llm_cache.sqlite3"))
+    yield RecordingClient(OllamaClient(cache=cache, endpoints=[server.url]))
+    server.stop()
+
+
+class ReviewUI:
+    """Console stand-in answering the review prompt with fixed choices."""
+
+    def __init__(self, *choices):
+        self.choices = list(choices)
+
+    def validate_streamed_llm_response(self, chunks, word):
+        for _ in chunks:
+            pass
+        return self.choices.pop(0)
+
+    def show_response_timing(self, time_to_first_token, seconds):
+        pass
+
+
+def _prefetch(client, prefetcher, word, deck_name):
+    """Schedule a word and wait until its response has been generated.
+
+    Une fois le flux terminé, take() attend au besoin que le préchargement
+    range la réponse : elle est servie sans nouvelle requête.
+    """
+    prefetcher.schedule(word, deck_name)
+    assert client.finished.acquire(timeout=5)
+
+
+def _review(client, prefetcher, *choices):
+    session = SimpleNamespace(llm_client=client)
+    args = SimpleNamespace(yes=False)
+    with tqdm(total=2, disable=True) as progress:
+        return _query_word_info(session, ReviewUI(*choices), args,
+                                "maison", "anglais", progress, prefetcher)
+
+
+def test_prefetched_response_is_not_cached_before_review(client):
+    prefetcher = ResponsePrefetcher(client)
+    try:
+        _prefetch(client, prefetcher, "maison", "anglais")
+        stream = prefetcher.take("maison", "anglais")
+    finally:
+        prefetcher.close()
+    assert "définition de maison" in "".join(stream)
+    assert client.calls == [("maison", "anglais", False)]
+    assert client._get_cached("maison", "anglais") is None
+
+
+def test_rejected_response_is_not_cached(client):
+    prefetcher = ResponsePrefetcher(client)
+    try:
+        _prefetch(client, prefetcher, "maison", "anglais")
+        assert _review(client, prefetcher, "n") is None
+    finally:
+        prefetcher.close()
+    assert prefetcher.stats()["hits"] == 1
+    assert client.calls == [("maison", "anglais", False)]
+    assert client._get_cached("maison", "anglais") is None
+
+
+def test_accepted_response_is_cached(client):
+    prefetcher = ResponsePrefetcher(client)
+    try:
+        _prefetch(client, prefetcher, "maison", "anglais")
+        response, word_info = _review(client, prefetcher, "r", "y")
+    finally:
+        prefetcher.close()
+    assert word_info.definition == "Définition : définition de maison"
+    # Réponse préchargée servie telle quelle, puis régénérée au premier plan
+    assert client.calls == [("maison", "anglais", False), ("maison", "anglais", True)]
+    assert client._get_cached("maison", "anglais") == response
+
+
+def test_word_taken_before_its_generation_is_a_miss(client):
+    prefetcher = ResponsePrefetcher(client)
+    try:
+        with prefetcher.foreground():
+            prefetcher.schedule("maison", "anglais")
+            assert prefetcher.take("maison", "anglais") is None
+    finally:
+        prefetcher.close()
+    assert prefetcher.stats()["misses"] == 1
+    assert client.calls == []
+
+
+def test_incomplete_response_is_not_cached(client):
+    client.remember_word_info("maison", "anglais", "Définition : définition de maison")
+    assert client._get_cached("maison", "anglais") is None
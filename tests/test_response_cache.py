@@ -0,0 +1,49 @@
+"""Tests du cache des réponses LLM et du découpage des réponses."""
+
+import subprocess
+import sys
+
+from services.llm import ollama_client, response_cache
+from services.llm.ollama_client import BATCH_PROMPT_VERSION, PROMPT_VERSION, BaseOllamaClient
+from services.llm.response_cache import ResponseCache
+from services.llm.response_parser import ResponseParser
+
+
+def test_newest_response_wins_whatever_the_prompt(tmp_path, monkeypatch):
+    client = BaseOllamaClient(cache=ResponseCache(str(tmp_path / "llm_cache.sqlite3")))
+
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    client._put_cached("maison", "anglais", PROMPT_VERSION, "ancienne")
+    now[0] += 1
+    client._put_cached("maison", "anglais", BATCH_PROMPT_VERSION, "groupée")
+    assert client._get_cached("maison", "anglais") == "groupée"
+
+    now[0] += 1
+    client._put_cached("maison", "anglais", PROMPT_VERSION, "régénérée")
+    assert client._get_cached("maison", "anglais") == "régénérée"
+
+
+def test_split_batch_response_keeps_complete_blocks():
+    response = ("### 1\nDéfinition : a\nSynonymes : a\nExemple : a\n"
+                "### 2. deux\nDéfinition : b\n"
+                "### 3\nDéfinition : c\nSynonymes : c\nExemple : c")
+    blocks = ResponseParser.split_batch_response(response, 3)
+    assert sorted(blocks) == [0, 2]
+    assert blocks[2] == "Définition : c\nSynonymes : c\nExemple : c"
+
+
+def test_llm_services_do_not_import_core():
+    code = ("import sys, services.llm.ollama_client, services.llm.async_ollama_client; "
+            "print(sorted(name for name in sys.modules if name.split('.')[0] == 'core'))")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                            text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_prompt_version_depends_on_profile_options(monkeypatch):
+    profiles = dict(ollama_client.OLLAMA_PROFILES)
+    version = ollama_client._prompt_version(ollama_client.WORD_INFO_PROMPT, "word")
+    monkeypatch.setattr(ollama_client, "OLLAMA_PROFILES",
+                        dict(profiles, word=dict(profiles["word"], temperature=0.9)))
+    assert ollama_client._prompt_version(ollama_client.WORD_INFO_PROMPT, "word") != version
@@ -0,0 +1,19 @@
+"""Tests du benchmark de démarrage à froid."""
+
+import pytest
+
+from benchmarks import startup
+
+
+def test_time_command_accepts_the_expected_exit_code():
+    assert len(startup.time_command(["--help"], runs=1, expected_code=0)) == 1
+
+
+@pytest.mark.parametrize("expected_code", [0, 1])
+def test_time_command_fails_on_a_crashing_cli(tmp_path, monkeypatch, expected_code):
+    entry_point = tmp_path / "anki-create.py"
+    entry_point.write_text("import module_qui_n_existe_pas\n")
+    monkeypatch.setattr(startup, "ENTRY_POINT", str(entry_point))
+
+    with pytest.raises(RuntimeError, match="ModuleNotFoundError"):
+        startup.time_command([], runs=1, expected_code=expected_code)
@@ -0,0 +1,23 @@
+"""Tests de l'encodage WAV des clips synthétisés."""
+
+import io
+import wave
+
+import numpy as np
+
+from services.audio.tts_generator import TTSGenerator
+
+
+def _samples(clip: bytes):
+    with wave.open(io.BytesIO(clip)) as wav_file:
+        return np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype="<i2")
+
+
+def test_encode_wav_normalises_on_the_peak():
+    samples = _samples(TTSGenerator._encode_wav([0.0, 0.25, -0.5], 22050))
+    assert samples.tolist() == [0, 16383, -32767]
+
+
+def test_encode_wav_does_not_amplify_silence():
+    samples = _samples(TTSGenerator._encode_wav([0.0, 0.001], 22050))
+    assert samples.tolist() == [0, 3276]
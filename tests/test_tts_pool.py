@@ -0,0 +1,60 @@
+"""Tests du pool de processus de synthèse vocale (sans modèle chargé)."""
+
+import importlib.util
+import os
+import threading
+
+import pytest
+
+from services.audio import tts_pool
+from services.audio.tts_pool import TTSProcessPool
+
+
+def test_workers_are_not_forked_from_the_parent():
+    stop = threading.Event()
+    # Un thread actif au moment de la création du pool (ex. préchargement)
+    busy = threading.Thread(target=stop.wait, daemon=True)
+    busy.start()
+    pool = TTSProcessPool(processes=2)
+    try:
+        assert pool._pool._ctx.get_start_method() in ("forkserver", "spawn")
+        assert pool._pool.apply(os.getpid) != os.getpid()
+    finally:
+        pool.unload()
+        stop.set()
+
+
+def test_model_load_error_in_initializer_is_raised_by_jobs(monkeypatch):
+    def fail(self, language_code):
+        raise RuntimeError(f"no model for {language_code}")
+
+    monkeypatch.setattr(tts_pool, "_worker_generator", None)
+    monkeypatch.setattr(tts_pool, "_worker_error", None)
+    monkeypatch.setattr(tts_pool.TTSGenerator, "preload", fail)
+
+    tts_pool._init_worker(1, ("en",))
+    with pytest.raises(RuntimeError, match="no model for en"):
+        tts_pool._synthesize_job(("hello", "en"))
+
+
+@pytest.mark.skipif(importlib.util.find_spec("TTS") is not None,
+                    reason="Coqui TTS installé : le modèle se chargerait")
+def test_pool_reports_model_load_error_instead_of_hanging():
+    pool = TTSProcessPool(processes=2, languages=("en",))
+    outcome = []
+
+    def synthesize():
+        try:
+            pool.synthesize_batch(["hello"], "en")
+        except Exception as e:
+            outcome.append(e)
+
+    # Thread démon : un pool qui relance ses workers sans fin ne bloque pas pytest
+    thread = threading.Thread(target=synthesize, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+    try:
+        assert not thread.is_alive(), "synthesize_batch never returned"
+        assert isinstance(outcome[0], ImportError)
+    finally:
+        pool.unload()
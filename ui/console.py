@@ -12,6 +12,21 @@ class ConsoleUI:
         """Display LLM response and get user confirmation."""
         print(f"\n=== LLM Response for word '{word}' ===")
         print(response)
+        return ConsoleUI.ask_response_choice()
+
+    @staticmethod
+    def validate_streamed_llm_response(stream, word: str) -> Literal['y', 'n', 'r']:
+        """Display an LLM response as it is generated and get user confirmation."""
+        print(f"\n=== LLM Response for word '{word}' ===")
+        for chunk in stream:
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+        print()
+        return ConsoleUI.ask_response_choice()
+
+    @staticmethod
+    def ask_response_choice() -> Literal['y', 'n', 'r']:
+        """Ask whether to accept, cancel or regenerate the LLM response."""
         print("\n=== Options ===")
         print("y - Accept and create Anki card")
         print("n - Cancel operation")
@@ -23,6 +38,12 @@ class ConsoleUI:
                 return choice
             print("Invalid option. Please choose y, n, or r.")
 
+    @staticmethod
+    def show_response_timing(time_to_first_token, time_to_decision: float):
+        """Show how long the first token and the user decision took."""
+        first_token = "n/a" if time_to_first_token is None else f"{time_to_first_token:.2f}s"
+        print(f"⏱️  Premier token: {first_token} | Décision: {time_to_decision:.2f}s")
+
     @staticmethod
     def show_available_languages(languages: dict):
         """Display available languages."""
@@ -32,22 +53,25 @@ class ConsoleUI:
             print(f"  - {name} ({code})")
 
     @staticmethod
-    def show_processing_start(total_words: int):
-        """Show start of processing multiple words."""
-        if total_words > 1:
+    def show_processing_start(total_words: int, source: str = None):
+        """Show start of processing multiple words (total_words is None for a streamed input)."""
+        if total_words is None:
+            origin = "l'entrée standard" if source == "-" else source
+            print(f"\n🚀 Traitement des mots de {origin}...")
+        elif total_words > 1:
             print(f"\n🚀 Traitement de {total_words} mots/expressions...")
 
     @staticmethod
     def show_word_progress(word: str, current: int, total: int):
-        """Show progress for current word."""
-        if total > 1:
-            print(f"\n[{current}/{total}] Traitement de: '{word}'")
+        """Show progress for current word (total is None while still unknown)."""
+        if total is None or total > 1:
+            print(f"\n[{current}/{total or '?'}] Traitement de: '{word}'")
 
     @staticmethod
     def show_word_success(word: str, current: int, total: int):
-        """Show success for a single word."""
-        if total > 1:
-            print(f"✅ [{current}/{total}] Carte créée pour '{word}'")
+        """Show success for a single word (total is None while still unknown)."""
+        if total is None or total > 1:
+            print(f"✅ [{current}/{total or '?'}] Carte créée pour '{word}'")
         else:
             print(f"✅ Carte ajoutée pour le mot '{word}'")
 
@@ -62,11 +86,102 @@ class ConsoleUI:
         print(f"❌ Erreur pour le mot '{word}': {error}")
 
     @staticmethod
-    def show_processing_complete(total_words: int):
+    def show_session_error(error: str):
+        """Show an error raised while starting the session."""
+        print(f"❌ Impossible de démarrer la session: {error}")
+
+    @staticmethod
+    def show_nothing_to_resume():
+        """Show that the job journal has no unfinished word."""
+        print("✅ Aucun mot inachevé à reprendre")
+
+    @staticmethod
+    def show_duplicates_skipped(duplicates: list):
+        """Show the words skipped because they already exist in the deck."""
+        if duplicates:
+            print(f"⏭️  {len(duplicates)} mot(s) déjà présent(s) dans le deck, ignoré(s): "
+                  + ", ".join(f"'{word}'" for word in duplicates))
+
+    @staticmethod
+    def show_processing_complete(total_words: int, skipped_duplicates: int = 0):
         """Show completion message."""
         if total_words > 1:
             print(
                 f"\n🎉 Traitement terminé pour {total_words} mots/expressions!")
+        if skipped_duplicates:
+            print(f"⏭️  {skipped_duplicates} doublon(s) ignoré(s)")
+
+    @staticmethod
+    def show_startup_times(times: dict):
+        """Show how long each external service took to become ready."""
+        print("⏱️ Services prêts: " + ", ".join(
+            f"{name} en {seconds:.2f}s" for name, seconds in times.items()))
+
+    @staticmethod
+    def show_llm_latency(stats: dict):
+        """Show the first LLM request latency apart from the steady state."""
+        line = f"🧠 LLM: premier mot en {stats['first']:.2f}s"
+        if stats["steady_mean"] is not None:
+            line += (f", ensuite {stats['steady_mean']:.2f}s en moyenne "
+                     f"(max {stats['steady_max']:.2f}s, {stats['requests'] - 1} requêtes)")
+        print(line)
+
+    @staticmethod
+    def show_ollama_stats(stats: dict):
+        """Show the requests and throughput of each Ollama server."""
+        print("🖥️  Serveurs Ollama:")
+        for url, entry in stats.items():
+            if not entry["has_model"]:
+                print(f"  - {url}: {'injoignable' if entry['ejected'] else 'modèle absent'}")
+                continue
+            line = f"  - {url}: {entry['requests']} requêtes"
+            if entry["requests_per_minute"] is not None:
+                line += f", {entry['requests_per_minute']:.1f}/min"
+            if entry["mean_seconds"] is not None:
+                line += f", {entry['mean_seconds']:.2f}s en moyenne"
+            if entry["failures"]:
+                line += f", {entry['failures']} échecs"
+            if entry["ejected"]:
+                line += " (écarté)"
+            print(line)
+
+    @staticmethod
+    def show_prefetch_stats(stats: dict):
+        """Show how many reviewed responses were generated in advance."""
+        reviewed = stats["hits"] + stats["misses"]
+        line = f"⚡ Réponses préchargées: {stats['hits']}/{reviewed} prêtes à la relecture"
+        if stats["interrupted"]:
+            line += f", {stats['interrupted']} reprise(s) après une régénération"
+        print(line)
+
+    @staticmethod
+    def show_metrics_written(path: str):
+        """Show where the stage timings were written."""
+        print(f"📊 Métriques des étapes écrites dans {path}")
+
+    @staticmethod
+    def show_connection_stats(stats: dict):
+        """Show HTTP connection reuse per host."""
+        for host, entry in stats["hosts"].items():
+            print(f"🔌 {host}: {entry['requests']} requêtes, "
+                  f"{entry['connections']} connexions ouvertes, {entry['reused']} réutilisées")
+        if stats["retries"]:
+            print(f"🔁 {stats['retries']} nouvelles tentatives après erreur de connexion")
+
+    @staticmethod
+    def show_audio_cache_stats(stats: dict):
+        """Show audio cache hits, misses and evictions."""
+        print(f"🔊 Cache audio: {stats['hits']} succès, {stats['misses']} échecs, "
+              f"{stats['evictions']} évictions, {stats['bytes'] / 1024 / 1024:.1f} Mo")
+
+    @staticmethod
+    def show_import_profile(entries: list, limit: int = 25):
+        """Show the slowest module imports (cumulative time)."""
+        total = max((entry["cumulative_us"] for entry in entries), default=0)
+        print(f"Temps d'import total: {total / 1000:.0f} ms")
+        print(f"{'cumul (ms)':>11} {'propre (ms)':>12}  module")
+        for entry in sorted(entries, key=lambda e: e["cumulative_us"], reverse=True)[:limit]:
+            print(f"{entry['cumulative_us'] / 1000:11.1f} {entry['self_us'] / 1000:12.1f}  {entry['module']}")
 
     @staticmethod
     def ask_continue_on_error() -> bool:
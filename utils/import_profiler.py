@@ -0,0 +1,45 @@
+"""Mesure du coût d'import des modules au démarrage à froid."""
+
+import subprocess
+import sys
+
+# Modules importés par un traitement complet (y compris les imports différés)
+DEFAULT_MODULES = (
+    "app.main",
+    "core.session",
+    "app.daemon",
+    "TTS.api",
+)
+
+
+def profile_imports(modules=DEFAULT_MODULES) -> list:
+    """Import the modules in a fresh interpreter with ``-X importtime``.
+
+    Retourne une entrée par module importé : {"module", "self_us",
+    "cumulative_us"}. Un module introuvable (ex. TTS non installé) est ignoré.
+    """
+    statements = "\n".join(
+        f"try:\n    import {module}\nexcept ImportError:\n    pass" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statements],
+        capture_output=True, text=True, cwd=_project_root())
+
+    entries = []
+    for line in result.stderr.splitlines():
+        # Format : "import time:   self [us] |  cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        entries.append({
+            "module": parts[2].strip(),
+            "self_us": int(parts[0]),
+            "cumulative_us": int(parts[1]),
+        })
+    return entries
+
+
+def _project_root() -> str:
+    import os
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,123 @@
+"""Mesure de la durée des étapes (spans) et export des métriques d'une exécution."""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Enregistreur actif ; None tant que --metrics n'est pas demandé
+_recorder = None
+# Contexte vide partagé : un span désactivé ne coûte qu'un test
+_NULL_SPAN = nullcontext()
+
+
+class MetricsRecorder:
+    """Collects span durations per stage name (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations = {}
+
+    def record(self, name: str, seconds: float):
+        """Add one measured duration to a stage."""
+        with self._lock:
+            self._durations.setdefault(name, []).append(seconds)
+
+    def summary(self) -> dict:
+        """Return count, total, p50, p95 and max (seconds) for each stage."""
+        with self._lock:
+            durations = {name: sorted(values) for name, values in self._durations.items()}
+        return {name: {
+            "count": len(values),
+            "total": sum(values),
+            "p50": _percentile(values, 50),
+            "p95": _percentile(values, 95),
+            "max": values[-1],
+        } for name, values in sorted(durations.items())}
+
+
+class _Span:
+    """Context manager measuring one occurrence of a stage."""
+
+    __slots__ = ("recorder", "name", "start")
+
+    def __init__(self, recorder: MetricsRecorder, name: str):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.recorder.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def enable() -> MetricsRecorder:
+    """Start collecting spans for this run."""
+    global _recorder
+    _recorder = MetricsRecorder()
+    return _recorder
+
+
+def disable():
+    """Stop collecting spans."""
+    global _recorder
+    _recorder = None
+
+
+def get_summary() -> dict:
+    """Return the per-stage summary of the active recorder (empty if disabled)."""
+    return _recorder.summary() if _recorder is not None else {}
+
+
+def span(name: str):
+    """Time the enclosed block under ``name`` (no-op while disabled).
+
+    Usage : ``with span("anki.multi"): ...``
+    """
+    if _recorder is None:
+        return _NULL_SPAN
+    return _Span(_recorder, name)
+
+
+def write_metrics(path: str, summary: dict):
+    """Write the stage summary as Prometheus text (.prom, .txt) or JSON."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if os.path.splitext(path)[1].lower() in (".prom", ".txt"):
+        content = _to_prometheus(summary)
+    else:
+        content = json.dumps({"stages": summary}, indent=2) + "\n"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def _percentile(values: list, percent: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    rank = max(1, math.ceil(percent / 100 * len(values)))
+    return values[rank - 1]
+
+
+def _to_prometheus(summary: dict) -> str:
+    lines = [
+        "# HELP anki_create_stage_seconds Durée des étapes d'une exécution.",
+        "# TYPE anki_create_stage_seconds summary",
+    ]
+    for name, stats in summary.items():
+        label = f'stage="{name}"'
+        lines.append(f'anki_create_stage_seconds{{{label},quantile="0.5"}} {stats["p50"]:.6f}')
+        lines.append(f'anki_create_stage_seconds{{{label},quantile="0.95"}} {stats["p95"]:.6f}')
+        lines.append(f'anki_create_stage_seconds_sum{{{label}}} {stats["total"]:.6f}')
+        lines.append(f'anki_create_stage_seconds_count{{{label}}} {stats["count"]}')
+    lines += [
+        "# HELP anki_create_stage_max_seconds Durée maximale de chaque étape.",
+        "# TYPE anki_create_stage_max_seconds gauge",
+    ]
+    for name, stats in summary.items():
+        lines.append(f'anki_create_stage_max_seconds{{stage="{name}"}} {stats["max"]:.6f}')
+    return "\n".join(lines) + "\n"
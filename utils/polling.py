@@ -0,0 +1,59 @@
+"""Attente de disponibilité d'un service avec sondage adaptatif."""
+
+import asyncio
+import time
+
+from config.settings import (STARTUP_POLL_FACTOR, STARTUP_POLL_INITIAL,
+                             STARTUP_POLL_MAX, STARTUP_TIMEOUT)
+
+
+def wait_until_ready(probe, timeout: float = STARTUP_TIMEOUT, on_wait=None) -> bool:
+    """Call ``probe`` until it returns True or ``timeout`` seconds have passed.
+
+    Les premiers sondages sont rapprochés (un service déjà presque prêt est
+    détecté en quelques dixièmes de seconde), puis l'intervalle grandit
+    jusqu'à STARTUP_POLL_MAX. ``on_wait(attempt, delay)`` est appelé avant
+    chaque attente. Retourne False en cas de dépassement du délai.
+    """
+    deadline = time.monotonic() + timeout
+    delays = _poll_delays()
+    attempt = 0
+    while not probe():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        attempt += 1
+        delay = next(delays)
+        if on_wait:
+            on_wait(attempt, delay)
+        time.sleep(min(delay, remaining))
+    return True
+
+
+async def wait_until_ready_async(probe, timeout: float = STARTUP_TIMEOUT, on_wait=None) -> bool:
+    """Asyncio version of wait_until_ready(): ``probe`` is a coroutine function.
+
+    Les attentes utilisent asyncio.sleep et ne bloquent pas la boucle ;
+    annuler la tâche interrompt l'attente.
+    """
+    deadline = time.monotonic() + timeout
+    delays = _poll_delays()
+    attempt = 0
+    while not await probe():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        attempt += 1
+        delay = next(delays)
+        if on_wait:
+            on_wait(attempt, delay)
+        await asyncio.sleep(min(delay, remaining))
+    return True
+
+
+def _poll_delays():
+    """Yield the successive intervals between two probes."""
+    delay = STARTUP_POLL_INITIAL
+    while True:
+        yield delay
+        delay = min(delay * STARTUP_POLL_FACTOR, STARTUP_POLL_MAX)
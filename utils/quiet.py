@@ -0,0 +1,59 @@
+"""Mise en sourdine de la sortie console d'un seul thread."""
+
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+_state = threading.local()
+_install_lock = threading.Lock()
+
+
+class _ThreadFilteredStream:
+    """Stream proxy that drops writes coming from silenced threads."""
+
+    def __init__(self, stream, name: str):
+        self._stream = stream
+        self._name = name
+        self._devnull = open(os.devnull, 'w')
+
+    def _target(self):
+        if getattr(_state, self._name, 0):
+            return self._devnull
+        return self._stream
+
+    def write(self, data):
+        return self._target().write(data)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _install():
+    with _install_lock:
+        if not isinstance(sys.stdout, _ThreadFilteredStream):
+            sys.stdout = _ThreadFilteredStream(sys.stdout, "stdout")
+        if not isinstance(sys.stderr, _ThreadFilteredStream):
+            sys.stderr = _ThreadFilteredStream(sys.stderr, "stderr")
+
+
+@contextmanager
+def silence_current_thread(stdout: bool = True, stderr: bool = True):
+    """Silence stdout and/or stderr for the calling thread only.
+
+    Contrairement à ``redirect_stdout``, les autres threads (UI, barres de
+    progression) continuent d'écrire normalement.
+    """
+    _install()
+    streams = [name for name, enabled in (
+        ("stdout", stdout), ("stderr", stderr)) if enabled]
+    for name in streams:
+        setattr(_state, name, getattr(_state, name, 0) + 1)
+    try:
+        yield
+    finally:
+        for name in streams:
+            setattr(_state, name, getattr(_state, name) - 1)